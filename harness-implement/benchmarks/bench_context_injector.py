@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite para ContextInjector
+
+Genera documentos de arquitectura realistas (api-contracts con N endpoints,
+database-schema con M tablas, estándares y features) y mide:
+
+- Parseo de cada documento con SafeLoader (Python puro) frente a CSafeLoader (libyaml)
+- Carga de la arquitectura global en frío (sin caché en disco) y en caliente
+- Prefetch de toda la arquitectura secuencial frente al pool de threads
+- La inyección completa de contexto por agente y la de un grupo de 8 en lote
+
+Uso:
+    python bench_context_injector.py --endpoints 50,500 --tables 20,200
+    python bench_context_injector.py --repeat 10 --output bench.json
+
+Los resultados se emiten como JSON para comparar regresiones entre ejecuciones.
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Callable
+
+import yaml
+
+# Add the skill utils to path
+utils_path = Path(__file__).parent.parent / "utils"
+sys.path.insert(0, str(utils_path))
+
+from context_injector import ContextInjector, DEFAULT_MAX_WORKERS
+from yaml_cache import parse_yaml, YAML_LOADER_NAME
+
+AGENTS = ['frontend', 'backend', 'data', 'devops']
+HTTP_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+COLUMN_TYPES = ['uuid', 'varchar(255)', 'text', 'integer', 'bigint', 'boolean', 'timestamp', 'jsonb']
+RESOURCES = ['users', 'orders', 'products', 'invoices', 'payments', 'sessions', 'reports', 'teams']
+
+
+def _time_operation(operation: Callable[[], object], repeat: int) -> Dict:
+    """Ejecuta una operación `repeat` veces y resume los tiempos en milisegundos."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'runs': repeat,
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'max_ms': round(max(samples), 3)
+    }
+
+
+def _schema(rng: random.Random, fields: int) -> Dict:
+    return {
+        'type': 'object',
+        'required': [f"field_{i}" for i in range(0, fields, 2)],
+        'properties': {
+            f"field_{i}": {'type': rng.choice(['string', 'integer', 'boolean']),
+                           'description': f"Field {i} of the payload"}
+            for i in range(fields)
+        }
+    }
+
+
+def generate_api_contracts(endpoints: int, rng: random.Random) -> Dict:
+    """api-contracts.yaml con la forma que genera /harness-plan."""
+    return {
+        'conventions': {'base_path': '/api/v1', 'naming': 'kebab-case', 'versioning': 'url'},
+        'endpoints': [
+            {
+                'path': f"/api/v1/{rng.choice(RESOURCES)}/{i}",
+                'method': rng.choice(HTTP_METHODS),
+                'summary': f"Endpoint {i}",
+                'auth': rng.choice(['jwt', 'none', 'api_key']),
+                'request': _schema(rng, rng.randint(2, 8)),
+                'responses': {
+                    '200': _schema(rng, rng.randint(3, 10)),
+                    '400': {'$ref': '#/errors/ValidationError'},
+                    '404': {'$ref': '#/errors/NotFound'}
+                }
+            }
+            for i in range(endpoints)
+        ]
+    }
+
+
+def generate_database_schema(tables: int, rng: random.Random) -> Dict:
+    """database-schema.yaml con tablas, columnas, índices y relaciones."""
+    names = [f"{rng.choice(RESOURCES)}_{i}" for i in range(tables)]
+    return {
+        'engine': 'postgresql',
+        'naming': {'tables': 'snake_case_plural', 'columns': 'snake_case'},
+        'tables': [
+            {
+                'name': name,
+                'columns': [
+                    {'name': f"col_{c}", 'type': rng.choice(COLUMN_TYPES),
+                     'nullable': rng.random() < 0.3, 'default': None}
+                    for c in range(rng.randint(4, 15))
+                ],
+                'indexes': [{'columns': [f"col_{rng.randint(0, 3)}"], 'unique': rng.random() < 0.2}],
+                'relations': [{'references': rng.choice(names), 'on_delete': 'cascade'}] if i else []
+            }
+            for i, name in enumerate(names)
+        ]
+    }
+
+
+def write_architecture(project_root: Path, endpoints: int, tables: int, features: int,
+                       rng: random.Random) -> Dict[Path, Dict]:
+    """Escribe un árbol .harness/arquitectura completo y devuelve los documentos generados."""
+    arch = project_root / ".harness" / "arquitectura"
+    documents = {
+        arch / "global" / "stack-decisions.yaml": {
+            'frontend': {'framework': 'react', 'language': 'typescript'},
+            'backend': {'framework': 'fastapi', 'language': 'python'},
+            'infrastructure': {'container': 'docker', 'orchestrator': 'kubernetes'}
+        },
+        arch / "global" / "coding-standards.yaml": {
+            'python': {'naming': 'snake_case', 'max_line_length': 100, 'rules': [f"rule {i}" for i in range(40)]},
+            'typescript': {'naming': 'camelCase', 'rules': [f"rule {i}" for i in range(40)]}
+        },
+        arch / "global" / "api-contracts.yaml": generate_api_contracts(endpoints, rng),
+        arch / "global" / "database-schema.yaml": generate_database_schema(tables, rng),
+        arch / "cross-cutting" / "error-handling.yaml": {
+            'errors': {f"E{i:03d}": {'status': 400 + i % 100, 'message': f"Error {i}"} for i in range(60)}
+        },
+        arch / "cross-cutting" / "logging.yaml": {'format': 'json', 'levels': ['debug', 'info', 'warn', 'error']},
+    }
+    for f in range(features):
+        documents[arch / "features" / f"feature-{f}" / "architecture.yaml"] = {
+            'components': [{'name': f"Component{c}", 'props': [f"prop{p}" for p in range(5)]} for c in range(10)]
+        }
+        documents[arch / "features" / f"feature-{f}" / "api-spec.yaml"] = generate_api_contracts(10, rng)
+
+    for path, document in documents.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(yaml.safe_dump(document, sort_keys=False), encoding='utf-8')
+
+    claude_dir = project_root / ".claude"
+    claude_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [{'id': f"T-{i:03d}", 'description': f"Task {i}", 'feature': f"feature-{i % max(features, 1)}",
+              'agent_assigned': AGENTS[i % len(AGENTS)], 'dependencies': []} for i in range(20)]
+    (claude_dir / "feature_list.json").write_text(json.dumps({'features': tasks}), encoding='utf-8')
+    return documents
+
+
+def bench_loaders(documents: Dict[Path, Dict], repeat: int) -> Dict:
+    """Compara SafeLoader y CSafeLoader sobre los documentos globales más grandes."""
+    loaders = {'SafeLoader': yaml.SafeLoader}
+    if hasattr(yaml, 'CSafeLoader'):
+        loaders['CSafeLoader'] = yaml.CSafeLoader
+
+    results = {}
+    for path in documents:
+        if path.parent.name != 'global':
+            continue
+        raw = path.read_bytes()
+        timings = {name: _time_operation(lambda loader=loader: parse_yaml(raw, loader), repeat)
+                   for name, loader in loaders.items()}
+        if 'CSafeLoader' in timings:
+            timings['speedup'] = round(timings['SafeLoader']['median_ms'] /
+                                       max(timings['CSafeLoader']['median_ms'], 1e-6), 2)
+        results[path.name] = dict(timings, bytes=len(raw))
+    return results
+
+
+def bench_injector(project_root: Path, repeat: int) -> Dict:
+    """Mide la carga de arquitectura en frío/caliente y la inyección por agente."""
+    cache_dir = project_root / ".harness" / ".cache"
+
+    def cold_load():
+        ContextInjector(str(project_root), use_disk_cache=False).load_global_architecture()
+
+    def warm_load():
+        ContextInjector(str(project_root)).load_global_architecture()
+
+    def prefetch(max_workers: int):
+        injector = ContextInjector(str(project_root), use_disk_cache=False, max_workers=max_workers)
+        injector.prefetch_architecture()
+        injector.close()
+
+    # Poblar la caché en disco antes de medir en caliente
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    warm_load()
+
+    injector = ContextInjector(str(project_root))
+    injector.load_global_architecture()
+    with contextlib.redirect_stdout(io.StringIO()):
+        inject = {
+            agent: _time_operation(
+                lambda agent=agent: ContextInjector(str(project_root)).inject_context_for_agent(
+                    agent, "T-000", "feature-0"), repeat)
+            for agent in AGENTS
+        }
+
+    # Un grupo paralelo de 8 agentes: 8 inyecciones sueltas frente a un lote
+    group = [(AGENTS[i % len(AGENTS)], f"T-{i:03d}", f"feature-{i % 5}") for i in range(8)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        group_single = _time_operation(
+            lambda: [ContextInjector(str(project_root)).inject_context_for_agent(*request) for request in group],
+            repeat)
+        group_batch = _time_operation(
+            lambda: ContextInjector(str(project_root)).inject_context_batch(group), repeat)
+
+    return {
+        'group_of_8_single': group_single,
+        'group_of_8_batch': group_batch,
+        'cold_global_load': _time_operation(cold_load, repeat),
+        'warm_global_load': _time_operation(warm_load, repeat),
+        'cold_prefetch_sequential': _time_operation(lambda: prefetch(1), repeat),
+        'cold_prefetch_parallel': _time_operation(lambda: prefetch(DEFAULT_MAX_WORKERS), repeat),
+        'inject_context_for_agent': inject,
+        'telemetry': injector.get_telemetry()
+    }
+
+
+def run_benchmarks(endpoint_sizes: List[int], table_sizes: List[int], features: int,
+                   repeat: int, seed: int) -> Dict:
+    """Ejecuta la matriz completa de benchmarks y devuelve el informe JSON."""
+    report = {
+        'benchmark': 'context_injector',
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pyyaml': yaml.__version__,
+        'libyaml': getattr(yaml, '__with_libyaml__', False),
+        'default_loader': YAML_LOADER_NAME,
+        'seed': seed,
+        'results': []
+    }
+
+    for endpoints in endpoint_sizes:
+        for tables in table_sizes:
+            print(f"⏱️  {endpoints} endpoints x {tables} tables...", file=sys.stderr)
+            rng = random.Random(seed)
+            work_dir = Path(tempfile.mkdtemp(prefix="harness_bench_ctx_"))
+            try:
+                documents = write_architecture(work_dir, endpoints, tables, features, rng)
+                report['results'].append({
+                    'endpoints': endpoints,
+                    'tables': tables,
+                    'features': features,
+                    'loaders': bench_loaders(documents, repeat),
+                    'injector': bench_injector(work_dir, repeat)
+                })
+            finally:
+                shutil.rmtree(work_dir)
+
+    return report
+
+
+def main():
+    """Punto de entrada CLI del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark del ContextInjector con arquitecturas sintéticas")
+    parser.add_argument('--endpoints', default='50,500',
+                        help="Número de endpoints en api-contracts.yaml, separados por comas")
+    parser.add_argument('--tables', default='20,200',
+                        help="Número de tablas en database-schema.yaml, separados por comas")
+    parser.add_argument('--features', type=int, default=5, help="Features con arquitectura propia")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por operación")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla de los generadores")
+    parser.add_argument('--output', help="Fichero JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        endpoint_sizes=[int(size) for size in args.endpoints.split(',')],
+        table_sizes=[int(size) for size in args.tables.split(',')],
+        features=args.features,
+        repeat=args.repeat,
+        seed=args.seed
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
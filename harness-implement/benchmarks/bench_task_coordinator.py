@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite para TaskCoordinator
+
+Genera planes sintéticos de feature_list.json (cadenas, fan-out amplio,
+DAGs aleatorios y tasks independientes) y mide las operaciones principales
+del coordinador, además del throughput de claims concurrentes con N procesos.
+
+Para los claims el plan se siembra con la raíz (T-000000) completada, así
+que fan-out e independientes tienen cientos de tasks listos y miden
+contención real; en la cadena solo hay uno listo cada vez. El cronómetro
+arranca cuando todos los workers han cargado el coordinador, no mide el
+arranque de los procesos.
+
+Uso:
+    python bench_task_coordinator.py --sizes 100,1000,10000 --shapes chain,fanout,random,independent
+    python bench_task_coordinator.py --sizes 100000 --repeat 3 --output bench.json
+    python bench_task_coordinator.py --layout sharded --processes 8
+
+Los resultados se emiten como JSON para comparar regresiones entre ejecuciones.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Callable
+
+# Add the skill utils to path
+utils_path = Path(__file__).parent.parent / "utils"
+sys.path.insert(0, str(utils_path))
+
+from task_coordinator import TaskCoordinator
+from feature_store import write_sharded
+
+AGENTS = ['frontend', 'backend', 'data', 'devops']
+CATEGORIES = ['setup', 'foundation', 'feature', 'polish']
+
+
+def _make_task(index: int, dependencies: List[str], rng: random.Random) -> Dict:
+    """Crea un task sintético con la forma que genera /harness-plan."""
+    return {
+        'id': f"T-{index:06d}",
+        'description': f"Synthetic task {index}",
+        'category': rng.choice(CATEGORIES),
+        'agent_assigned': rng.choice(AGENTS),
+        'priority': rng.randint(1, 5),
+        'estimated_complexity': rng.choice(['low', 'medium', 'high']),
+        'dependencies': dependencies,
+        'passes': False
+    }
+
+
+def generate_chain(size: int, rng: random.Random) -> List[Dict]:
+    """Cada task depende del anterior: paralelismo mínimo."""
+    return [_make_task(i, [f"T-{i - 1:06d}"] if i else [], rng) for i in range(size)]
+
+
+def generate_fanout(size: int, rng: random.Random) -> List[Dict]:
+    """Un task raíz del que dependen todos los demás: paralelismo máximo tras la raíz."""
+    return [_make_task(i, ["T-000000"] if i else [], rng) for i in range(size)]
+
+
+def generate_random_dag(size: int, rng: random.Random, max_dependencies: int = 3) -> List[Dict]:
+    """DAG aleatorio: cada task depende de hasta N tasks anteriores."""
+    tasks = []
+    for i in range(size):
+        count = rng.randint(0, min(i, max_dependencies))
+        dependencies = sorted({f"T-{rng.randrange(i):06d}" for _ in range(count)})
+        tasks.append(_make_task(i, dependencies, rng))
+    return tasks
+
+
+def generate_independent(size: int, rng: random.Random) -> List[Dict]:
+    """Tasks sin dependencias: todo el plan está listo desde el principio."""
+    return [_make_task(i, [], rng) for i in range(size)]
+
+
+GENERATORS: Dict[str, Callable[[int, random.Random], List[Dict]]] = {
+    'chain': generate_chain,
+    'fanout': generate_fanout,
+    'random': generate_random_dag,
+    'independent': generate_independent
+}
+
+
+def seed_claim_plan(tasks: List[Dict]) -> List[Dict]:
+    """Copia del plan con la raíz completada, para que haya tasks listos que disputarse."""
+    return [dict(task, passes=True, status='completed') if task['id'] == "T-000000" else task
+            for task in tasks]
+
+
+def write_plan(project_root: Path, tasks: List[Dict], layout: str = 'single') -> None:
+    """Escribe el plan sintético en .claude/feature_list.json (o en shards por categoría)."""
+    claude_dir = project_root / ".claude"
+    claude_dir.mkdir(parents=True, exist_ok=True)
+    with open(claude_dir / "feature_list.json", 'w', encoding='utf-8') as f:
+        json.dump({'features': tasks}, f)
+    if layout == 'sharded':
+        write_sharded(str(claude_dir / "features"), {'features': tasks}, 'category')
+
+
+def _time_operation(operation: Callable[[], object], repeat: int) -> Dict:
+    """Ejecuta una operación `repeat` veces y resume los tiempos en milisegundos."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'runs': repeat,
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'max_ms': round(max(samples), 3)
+    }
+
+
+def bench_operations(project_root: Path, repeat: int) -> Dict:
+    """Mide las operaciones de lectura y escritura del coordinador."""
+    coordinator = TaskCoordinator(str(project_root))
+    results = {
+        'get_available_tasks': _time_operation(coordinator.get_available_tasks, repeat),
+        'get_next_task_for_agent': _time_operation(
+            lambda: coordinator.get_next_task_for_agent('backend'), repeat),
+        'get_project_progress': _time_operation(coordinator.get_project_progress, repeat),
+        'suggest_next_actions': _time_operation(coordinator.suggest_next_actions, repeat)
+    }
+
+    # Cada repetición completa un task distinto que esté disponible
+    ready_ids = [task['id'] for task in coordinator.get_available_tasks()]
+    completions = iter(ready_ids * repeat)
+    results['mark_task_completed'] = _time_operation(
+        lambda: coordinator.mark_task_completed(next(completions)), min(repeat, len(ready_ids)) or 1)
+
+    return results
+
+
+def _claim_worker(project_root: str, claims: int, queue, ready) -> None:
+    """Proceso que reclama tasks (next + in_progress) tan rápido como puede."""
+    coordinator = TaskCoordinator(project_root)
+    claimed, errors = [], 0
+    # Todos los workers (y el cronómetro) arrancan a la vez
+    ready.wait()
+
+    for _ in range(claims):
+        try:
+            task = coordinator.get_next_available_task()
+            if task is None:
+                break
+            if coordinator.mark_task_in_progress(task['id']):
+                claimed.append(task['id'])
+        except (json.JSONDecodeError, OSError):
+            # Lecturas de un fichero a medio escribir por otro proceso
+            errors += 1
+
+    queue.put({'claimed': claimed, 'errors': errors})
+
+
+def bench_concurrent_claims(project_root: Path, processes: int, claims_per_process: int) -> Dict:
+    """Mide el throughput de claims con N procesos compitiendo por el mismo plan."""
+    queue = multiprocessing.Queue()
+    # Una parte por worker más la del proceso principal, que arranca el cronómetro
+    ready = multiprocessing.Barrier(processes + 1)
+    workers = [
+        multiprocessing.Process(target=_claim_worker, args=(str(project_root), claims_per_process, queue, ready))
+        for _ in range(processes)
+    ]
+
+    for worker in workers:
+        worker.start()
+    ready_at_start = len(TaskCoordinator(str(project_root)).get_available_tasks())
+    ready.wait()
+    start = time.perf_counter()
+    reports = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    claimed = [task_id for report in reports for task_id in report['claimed']]
+    # El throughput cuenta tasks distintos: un task reclamado por dos workers es un fallo, no trabajo
+    unique_claims = len(set(claimed))
+    try:
+        tasks = TaskCoordinator(str(project_root)).load_feature_list().get('features', [])
+        persisted = sum(1 for task in tasks if task.get('status') == 'in_progress')
+    except json.JSONDecodeError:
+        persisted = 0
+
+    return {
+        'processes': processes,
+        'claims_per_process': claims_per_process,
+        'ready_at_start': ready_at_start,
+        'elapsed_s': round(elapsed, 3),
+        'claims': len(claimed),
+        'unique_claims': unique_claims,
+        'claims_per_second': round(unique_claims / elapsed, 1) if elapsed > 0 else 0,
+        'duplicate_claims': len(claimed) - unique_claims,
+        'lost_updates': max(unique_claims - persisted, 0),
+        'read_errors': sum(report['errors'] for report in reports)
+    }
+
+
+def run_benchmarks(sizes: List[int], shapes: List[str], repeat: int,
+                   processes: int, claims_per_process: int, seed: int, layout: str = 'single') -> Dict:
+    """Ejecuta la matriz completa de benchmarks y devuelve el informe JSON."""
+    report = {
+        'benchmark': 'task_coordinator',
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'layout': layout,
+        'results': []
+    }
+
+    for shape in shapes:
+        for size in sizes:
+            print(f"⏱️  {shape} x {size}...", file=sys.stderr)
+            rng = random.Random(seed)
+            tasks = GENERATORS[shape](size, rng)
+
+            work_dir = Path(tempfile.mkdtemp(prefix="harness_bench_"))
+            try:
+                write_plan(work_dir, tasks, layout)
+                start = time.perf_counter()
+                operations = bench_operations(work_dir, repeat)
+                operations_elapsed = time.perf_counter() - start
+
+                result = {
+                    'shape': shape,
+                    'tasks': size,
+                    'plan_bytes': os.path.getsize(work_dir / ".claude" / "feature_list.json"),
+                    'operations': operations,
+                    'operations_elapsed_s': round(operations_elapsed, 3)
+                }
+
+                if processes > 0:
+                    write_plan(work_dir, seed_claim_plan(tasks), layout)
+                    result['concurrent_claims'] = bench_concurrent_claims(
+                        work_dir, processes, claims_per_process)
+
+                report['results'].append(result)
+            finally:
+                shutil.rmtree(work_dir)
+
+    return report
+
+
+def main():
+    """Punto de entrada CLI del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark del TaskCoordinator con planes sintéticos")
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help="Tamaños de plan separados por comas (p.ej. 100,1000,10000,100000)")
+    parser.add_argument('--shapes', default=','.join(GENERATORS),
+                        help=f"Formas de DAG: {', '.join(GENERATORS)}")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por operación")
+    parser.add_argument('--processes', type=int, default=4,
+                        help="Procesos para el benchmark de claims concurrentes (0 = omitir)")
+    parser.add_argument('--claims', type=int, default=25, help="Claims por proceso")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla de los generadores")
+    parser.add_argument('--layout', choices=['single', 'sharded'], default='single',
+                        help="Layout del plan: fichero único o shards por categoría")
+    parser.add_argument('--output', help="Fichero JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    shapes = [shape.strip() for shape in args.shapes.split(',') if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in GENERATORS]
+    if unknown:
+        parser.error(f"Unknown shapes: {', '.join(unknown)}")
+
+    report = run_benchmarks(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        shapes=shapes,
+        repeat=args.repeat,
+        processes=args.processes,
+        claims_per_process=args.claims,
+        seed=args.seed,
+        layout=args.layout
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
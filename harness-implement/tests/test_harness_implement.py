@@ -0,0 +1,1530 @@
+#!/usr/bin/env python3
+"""
+Test Suite para harness-implement skill
+
+Valida:
+- Scheduling de tasks con dependencias y restricciones
+- Export de métricas del coordinador (Prometheus textfile)
+- Progreso incremental del modo watch
+- Layout sharded del feature list
+- Caché persistente de YAML del context injector
+- Loader YAML (libyaml con fallback) y su telemetría
+- Invalidación por fichero de la caché en memoria del context injector
+- Carga paralela de YAML y prefetch de arquitectura
+- Inyección de contexto en lote para un grupo paralelo
+- Caché del análisis del proyecto invalidada por huella de manifests
+- Ensamblado del contexto dentro de un presupuesto de tokens
+- Proyecciones de contexto por agente declaradas en YAML
+- Bundles de contexto por agente reconstruidos solo cuando cambian sus entradas
+- Contextos por referencia a blobs direccionados por contenido
+- Inyección incremental (delta) por agente con manifests de secciones
+- Índice de una pasada de claude.md (secciones, bullets, labels y código)
+- Caché del claude.md parseado por hash de contenido
+- Contextos perezosos con secciones resueltas al primer acceso
+- Tablas de Clean Architecture congeladas, memoizadas y extensibles por proyecto
+- Emisión en streaming del contexto como JSON (CLI --output/--compact)
+- Selección de endpoints, tablas y standards por relevancia BM25 al task
+- Índices de endpoints, tablas y entidades y extracción de lo que referencia un task
+- Prefetch en segundo plano de las features de los tasks listos en una LRU acotada
+- Caché de arquitectura LRU acotada en entradas y memoria con telemetría de expulsiones
+"""
+
+import io
+import os
+import sys
+import json
+import datetime
+import subprocess
+import contextlib
+import tempfile
+import shutil
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+# Add the skill utils to path
+skill_path = Path(__file__).parent.parent
+utils_path = skill_path / "utils"
+sys.path.insert(0, str(utils_path))
+
+try:
+    from task_coordinator import TaskCoordinator, paths_overlap
+    from coordinator_metrics import CoordinatorMetrics
+    from progress_watch import ProgressWatch, FileChangeWatcher
+    import context_injector
+    from context_injector import ContextInjector
+    import yaml_cache
+    from context_budget import estimate_tokens, fit_context_to_budget
+    from claude_md_index import ClaudeMdIndex
+    from context_stream import stream_context
+except ImportError as e:
+    print(f"❌ Error importing modules: {e}")
+    sys.exit(1)
+
+
+class HarnessImplementTester:
+    """
+    Test suite para harness-implement skill functionality.
+    """
+
+    def __init__(self):
+        self.test_results = []
+        self.temp_dir = None
+
+    def run_all_tests(self) -> bool:
+        """
+        Ejecuta todos los tests del skill harness-implement.
+
+        Returns:
+            True si todos los tests pasan, False si alguno falla
+        """
+        print("🧪 Starting Harness-Implement Test Suite...")
+        print("=" * 50)
+
+        # Crear directorio temporal para tests
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="harness_implement_test_"))
+        print(f"📁 Test directory: {self.temp_dir}")
+
+        try:
+            # Test 1: Scheduling Constraints
+            self._test_scheduling_constraints()
+
+            # Test 2: Coordinator Metrics
+            self._test_coordinator_metrics()
+
+            # Test 3: Incremental Progress Watch
+            self._test_progress_watch()
+
+            # Test 4: Sharded Feature List
+            self._test_sharded_feature_list()
+
+            # Test 5: Persistent YAML Cache
+            self._test_yaml_disk_cache()
+
+            # Test 6: YAML Loader Selection
+            self._test_yaml_loader()
+
+            # Test 7: In-Process Cache Invalidation
+            self._test_architecture_cache_invalidation()
+
+            # Test 8: Parallel Architecture Prefetch
+            self._test_parallel_prefetch()
+
+            # Test 9: Batch Context Injection
+            self._test_batch_injection()
+
+            # Test 10: Project Analysis Cache
+            self._test_project_analysis_cache()
+
+            # Test 11: Token-Budgeted Context
+            self._test_token_budget()
+
+            # Test 12: Declarative Context Projections
+            self._test_context_projections()
+
+            # Test 13: Per-Agent Context Bundles
+            self._test_context_bundles()
+
+            # Test 14: Content-Addressed Context Blobs
+            self._test_context_blobs()
+
+            # Test 15: Delta Context Injection
+            self._test_delta_injection()
+
+            # Test 16: Indexed claude.md Parser
+            self._test_claude_md_index()
+
+            # Test 17: Parsed claude.md Cache
+            self._test_claude_md_cache()
+
+            # Test 18: Lazy Context Sections
+            self._test_lazy_context()
+
+            # Test 19: Clean Architecture Tables
+            self._test_clean_architecture_tables()
+
+            # Test 20: Streaming Context Emission
+            self._test_context_streaming()
+
+            # Test 21: Task Relevance Selection
+            self._test_relevance_selection()
+
+            # Test 22: Architecture Indexes
+            self._test_architecture_index()
+
+            # Test 23: Upcoming Task Prefetch
+            self._test_upcoming_task_prefetch()
+
+            # Test 24: Bounded Architecture Cache
+            self._test_bounded_architecture_cache()
+
+            # Reporte final
+            self._print_test_results()
+
+            return all(test["passed"] for test in self.test_results)
+
+        finally:
+            # Limpiar directorio temporal
+            if self.temp_dir and self.temp_dir.exists():
+                shutil.rmtree(self.temp_dir)
+                print(f"🧹 Cleaned up test directory")
+
+    def _log_test(self, test_name: str, passed: bool, details: str = ""):
+        """Registra el resultado de un test."""
+        self.test_results.append({
+            "name": test_name,
+            "passed": passed,
+            "details": details
+        })
+
+        status = "✅" if passed else "❌"
+        print(f"{status} {test_name}: {'PASS' if passed else 'FAIL'}")
+        if details:
+            print(f"   {details}")
+
+    def _create_project(self, name: str, feature_list: Dict[str, Any]) -> Path:
+        """Crea un proyecto de test con su .claude/feature_list.json."""
+        project_dir = self.temp_dir / name
+        (project_dir / ".claude").mkdir(parents=True)
+        (project_dir / ".claude" / "feature_list.json").write_text(json.dumps(feature_list))
+        return project_dir
+
+    def _create_architecture(self, project_dir: Path) -> Path:
+        """Crea una arquitectura .harness/arquitectura mínima pero completa."""
+        architecture = {
+            "global/stack-decisions.yaml": (
+                "project_type: web\n"
+                "frontend:\n  framework: remix\n"
+                "backend:\n  framework: fastapi\n"
+                "infrastructure:\n  cloud: aws\n"
+            ),
+            "global/coding-standards.yaml": (
+                "naming_conventions:\n  files: kebab-case\n"
+                "project_structure:\n  frontend: {routes: app/routes}\n  backend: {api: app/api}\n"
+                "git_workflow:\n  branches: trunk\n"
+            ),
+            "global/api-contracts.yaml": (
+                "endpoints:\n"
+                "  - {path: /users, method: GET, description: List users, entity: user}\n"
+                "  - {path: /users, method: POST, description: Create user, entity: user}\n"
+                "  - {path: /orders, method: GET, description: List orders, entity: order}\n"
+            ),
+            "global/database-schema.yaml": (
+                "tables:\n"
+                "  users: {columns: {id: uuid, email: text}}\n"
+                "  orders: {columns: {id: uuid, user_id: uuid}, relations: [users]}\n"
+            ),
+            "cross-cutting/error-handling.yaml": "strategy: rfc7807\n",
+            "cross-cutting/logging.yaml": "format: json\n",
+            "features/auth/architecture.yaml": "pattern: jwt\n",
+            "features/auth/api-spec.yaml": "endpoints: [/login]\n"
+        }
+        architecture_root = project_dir / ".harness" / "arquitectura"
+        for relative_path, content in architecture.items():
+            file_path = architecture_root / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content)
+        return architecture_root
+
+    def _test_scheduling_constraints(self):
+        """Test 1: Verificar capacidad por agente, recursos exclusivos y footprints."""
+        print("\n🔍 Testing Scheduling Constraints...")
+
+        feature_list = {
+            "scheduling": {"agent_concurrency": {"backend": 2, "data": 1}},
+            "features": [
+                {"id": "BE-1", "agent_assigned": "backend", "status": "in_progress"},
+                {"id": "BE-2", "agent_assigned": "backend", "priority": 1},
+                {"id": "BE-3", "agent_assigned": "backend", "priority": 2},
+                {"id": "DA-1", "agent_assigned": "data", "priority": 1,
+                 "exclusive_resources": ["migrations"]},
+                {"id": "DA-2", "agent_assigned": "data", "priority": 2,
+                 "exclusive_resources": ["migrations"]},
+                {"id": "FE-1", "agent_assigned": "frontend", "priority": 1,
+                 "file_footprint": ["app/routes/**"]},
+                {"id": "FE-2", "agent_assigned": "frontend", "priority": 2,
+                 "file_footprint": ["app/routes/login.tsx"]},
+                {"id": "FE-3", "agent_assigned": "frontend", "priority": 3,
+                 "file_footprint": ["app/components/Button.tsx"]}
+            ]
+        }
+
+        try:
+            coordinator = TaskCoordinator(str(self._create_project("scheduling", feature_list)))
+
+            available = [task["id"] for task in coordinator.get_available_tasks()]
+            expected = ["BE-2", "DA-1", "FE-1", "FE-3"]
+            if available == expected:
+                self._log_test("Scheduling - Admitted Set", True)
+            else:
+                self._log_test("Scheduling - Admitted Set", False, f"Expected {expected}, got {available}")
+
+            deferred = {entry["task"]["id"] for entry in coordinator.get_deferred_tasks()}
+            if deferred == {"BE-3", "DA-2", "FE-2"}:
+                self._log_test("Scheduling - Deferred Tasks", True)
+            else:
+                self._log_test("Scheduling - Deferred Tasks", False, f"Got {deferred}")
+
+            overlaps = [
+                paths_overlap("src/db/**", "src/db/migrations/001.sql"),
+                not paths_overlap("src/a.py", "src/b.py"),
+                paths_overlap("src/*.py", "src/a.py")
+            ]
+            self._log_test("Scheduling - Footprint Overlap", all(overlaps), "" if all(overlaps) else str(overlaps))
+
+            # La capacidad por defecto cuenta igual que en el scheduling (null = ilimitada)
+            parallel = {}
+            for default_limit in (None, 3, 1):
+                single_agent = {"scheduling": {"default_agent_concurrency": default_limit, "agent_concurrency": {}},
+                                "features": [{"id": f"BE-{n}", "agent_assigned": "backend"} for n in range(2)]}
+                parallel[default_limit] = TaskCoordinator(str(self._create_project(
+                    f"scheduling_default_{default_limit}", single_agent))).can_execute_parallel_tasks()
+            if parallel == {None: True, 3: True, 1: False}:
+                self._log_test("Scheduling - Default Capacity Parallelism", True)
+            else:
+                self._log_test("Scheduling - Default Capacity Parallelism", False, f"Got {parallel}")
+
+        except Exception as e:
+            self._log_test("Scheduling Constraints", False, f"Exception: {str(e)}")
+
+    def _test_coordinator_metrics(self):
+        """Test 2: Verificar que las métricas se acumulan entre procesos y se exportan."""
+        print("\n🔍 Testing Coordinator Metrics...")
+
+        feature_list = {"features": [
+            {"id": "BE-1", "agent_assigned": "backend"},
+            {"id": "FE-1", "agent_assigned": "frontend", "dependencies": ["BE-1"]}
+        ]}
+
+        try:
+            project_dir = self._create_project("metrics", feature_list)
+            metrics_path = project_dir / "metrics" / "coordinator.prom"
+
+            # Dos coordinadores simulan dos invocaciones independientes del CLI
+            TaskCoordinator(str(project_dir), str(metrics_path)).mark_task_in_progress("BE-1")
+            TaskCoordinator(str(project_dir), str(metrics_path)).mark_task_completed("BE-1")
+
+            content = metrics_path.read_text()
+            expected_lines = [
+                'harness_coordinator_tasks_claimed_total{agent="backend"} 1',
+                'harness_coordinator_tasks_completed_total{agent="backend"} 1',
+                'harness_coordinator_operations_total{operation="mark_task_completed"} 1',
+                '# TYPE harness_coordinator_operation_duration_seconds histogram'
+            ]
+            missing = [line for line in expected_lines if line not in content]
+            if missing:
+                self._log_test("Metrics - Textfile Export", False, f"Missing lines: {missing}")
+            else:
+                self._log_test("Metrics - Textfile Export", True)
+
+            coordinator = TaskCoordinator(str(project_dir), str(metrics_path))
+            coordinator.get_available_tasks()
+            rendered = coordinator.metrics.render()
+            if 'harness_coordinator_queue_depth{agent="frontend"} 1' in rendered:
+                self._log_test("Metrics - Queue Depth Gauge", True)
+            else:
+                self._log_test("Metrics - Queue Depth Gauge", False, "frontend queue depth not reported")
+
+            if not CoordinatorMetrics().flush():
+                self._log_test("Metrics - Disabled Without Path", True)
+            else:
+                self._log_test("Metrics - Disabled Without Path", False, "flush wrote without a path")
+
+        except Exception as e:
+            self._log_test("Coordinator Metrics", False, f"Exception: {str(e)}")
+
+    def _test_progress_watch(self):
+        """Test 3: Verificar que el estado incremental coincide con un recálculo completo."""
+        print("\n🔍 Testing Incremental Progress Watch...")
+
+        feature_list = {"features": [
+            {"id": "A", "agent_assigned": "backend", "category": "setup"},
+            {"id": "B", "agent_assigned": "frontend", "category": "feature", "dependencies": ["A"]},
+            {"id": "C", "agent_assigned": "frontend", "category": "feature", "dependencies": ["A", "B"]}
+        ]}
+
+        try:
+            coordinator = TaskCoordinator(str(self._create_project("watch", feature_list)))
+            state = ProgressWatch()
+            state.apply(coordinator.load_feature_list())
+
+            coordinator.mark_task_completed("A")
+            coordinator.mark_task_in_progress("B")
+            changed = state.apply(coordinator.load_feature_list())
+
+            progress = coordinator.get_project_progress()
+            ready = {task["id"] for task in coordinator.get_available_tasks()}
+            matches = (
+                changed == 2
+                and state.totals["completed"] == progress["completed_tasks"]
+                and state.totals["in_progress"] == progress["in_progress_tasks"]
+                and set(state.ready) == ready
+                and state.agents["backend"]["completed"] == progress["agents"]["backend"]["completed"]
+                and set(state.in_flight) == {"B"}
+            )
+            self._log_test("Watch - Incremental State", matches,
+                           "" if matches else f"changed={changed}, totals={state.totals}, ready={state.ready}")
+
+        except Exception as e:
+            self._log_test("Progress Watch", False, f"Exception: {str(e)}")
+
+    def _test_sharded_feature_list(self):
+        """Test 4: Verificar el layout sharded y que los writers solo tocan su shard."""
+        print("\n🔍 Testing Sharded Feature List...")
+
+        feature_list = {
+            "parallel_execution": {"groups": [{"name": "setup"}]},
+            "features": [
+                {"id": "DB-1", "agent_assigned": "data", "category": "setup"},
+                {"id": "BE-1", "agent_assigned": "backend", "category": "backend", "dependencies": ["DB-1"]},
+                {"id": "BE-2", "agent_assigned": "backend", "category": "backend", "dependencies": ["BE-1"]},
+                {"id": "FE-1", "agent_assigned": "frontend", "category": "frontend", "dependencies": ["BE-1"]}
+            ]
+        }
+
+        try:
+            project_dir = self._create_project("sharded", feature_list)
+            coordinator = TaskCoordinator(str(project_dir))
+            manifest = coordinator.shard_feature_list("category")
+
+            features_dir = project_dir / ".claude" / "features"
+            if coordinator.store.layout == "sharded" and set(manifest["shards"]) == {"setup", "backend", "frontend"} \
+                    and manifest["cross_shard_dependencies"] == {"BE-1": ["DB-1"], "FE-1": ["BE-1"]}:
+                self._log_test("Sharding - Manifest", True)
+            else:
+                self._log_test("Sharding - Manifest", False, f"Got {manifest}")
+
+            merged = coordinator.load_feature_list()
+            dependencies = {task["id"]: set(task.get("dependencies", [])) for task in merged["features"]}
+            original = {task["id"]: set(task.get("dependencies", [])) for task in feature_list["features"]}
+            if dependencies == original and merged.get("parallel_execution") == feature_list["parallel_execution"]:
+                self._log_test("Sharding - Merged View", True)
+            else:
+                self._log_test("Sharding - Merged View", False, f"Got {dependencies}")
+
+            frontend_mtime = (features_dir / "frontend.json").stat().st_mtime_ns
+            coordinator.mark_task_completed("DB-1")
+            available = [task["id"] for task in TaskCoordinator(str(project_dir)).get_available_tasks()]
+            untouched = (features_dir / "frontend.json").stat().st_mtime_ns == frontend_mtime
+            if available == ["BE-1"] and untouched:
+                self._log_test("Sharding - Shard-Local Writes", True)
+            else:
+                self._log_test("Sharding - Shard-Local Writes", False,
+                               f"available={available}, frontend shard untouched={untouched}")
+
+            # Otro proceso re-shardea y BE-2 cambia de shard: el índice en memoria queda obsoleto
+            coordinator.load_feature_list()
+            resharded = coordinator.load_feature_list()
+            for task in resharded["features"]:
+                if task["id"] == "BE-2":
+                    task["category"] = "api"
+            watcher = FileChangeWatcher(coordinator.store.watched_paths(), poll_interval=0.05)
+            TaskCoordinator(str(project_dir)).save_feature_list(resharded)
+            watcher.set_paths(coordinator.store.watched_paths())
+            new_shard_watched = str(features_dir / "api.json") in watcher.paths and watcher.wait_for_change(timeout=1)
+            watcher.close()
+            if coordinator.mark_task_in_progress("BE-2") and new_shard_watched:
+                self._log_test("Sharding - Stale Shard Index", True)
+            else:
+                self._log_test("Sharding - Stale Shard Index", False, f"new shard watched={new_shard_watched}")
+
+        except Exception as e:
+            self._log_test("Sharded Feature List", False, f"Exception: {str(e)}")
+
+    def _test_yaml_disk_cache(self):
+        """Test 5: Verificar que los YAML parseados se reutilizan entre procesos."""
+        print("\n🔍 Testing Persistent YAML Cache...")
+
+        try:
+            project_dir = self._create_project("yaml_cache", {"features": []})
+            architecture_root = self._create_architecture(project_dir)
+
+            cold = ContextInjector(str(project_dir))
+            cold_arch = cold.load_global_architecture()
+
+            # Un injector nuevo simula un proceso nuevo
+            warm = ContextInjector(str(project_dir))
+            warm_arch = warm.load_global_architecture()
+            if warm_arch == cold_arch and warm._yaml_cache.stats["hits"] == 4 and warm._yaml_cache.stats["misses"] == 0:
+                self._log_test("YAML Cache - Warm Start", True)
+            else:
+                self._log_test("YAML Cache - Warm Start", False, f"stats={warm._yaml_cache.stats}")
+
+            # Mismo contenido con otro mtime: se valida por hash sin reparsear
+            logging_yaml = architecture_root / "cross-cutting" / "logging.yaml"
+            ContextInjector(str(project_dir)).load_cross_cutting_concerns()
+            os.utime(logging_yaml, ns=(0, 1))
+            touched = ContextInjector(str(project_dir))
+            touched.load_cross_cutting_concerns()
+
+            logging_yaml.write_text("format: logfmt\n")
+            edited = ContextInjector(str(project_dir))
+            concerns = edited.load_cross_cutting_concerns()
+
+            if touched._yaml_cache.stats["rehashed_hits"] == 1 and concerns["logging"] == {"format": "logfmt"}:
+                self._log_test("YAML Cache - Content Validation", True)
+            else:
+                self._log_test("YAML Cache - Content Validation", False,
+                               f"touched={touched._yaml_cache.stats}, logging={concerns.get('logging')}")
+
+            # Las entradas son marshal de contenedores planos (nunca pickle) y conservan fechas y claves int
+            dated_yaml = project_dir / "dated.yaml"
+            dated_yaml.write_text("released: 2024-05-01\nresponses:\n  404: missing\n")
+            cache_dir = project_dir / ".harness" / ".cache" / "dated"
+            yaml_cache.YamlDocumentCache(cache_dir).load(dated_yaml, yaml_cache.parse_yaml)
+            warm_cache = yaml_cache.YamlDocumentCache(cache_dir)
+            dated = warm_cache.load(dated_yaml, yaml_cache.parse_yaml)
+            entries = list(cache_dir.glob("*"))
+            if (warm_cache.stats["hits"] == 1 and dated == {"released": datetime.date(2024, 5, 1), "responses": {404: "missing"}}
+                    and entries and all(entry.suffix == ".marshal" for entry in entries)):
+                self._log_test("YAML Cache - Safe Format", True)
+            else:
+                self._log_test("YAML Cache - Safe Format", False,
+                               f"stats={warm_cache.stats}, dated={dated}, entries={entries}")
+
+        except Exception as e:
+            self._log_test("Persistent YAML Cache", False, f"Exception: {str(e)}")
+
+    def _test_yaml_loader(self):
+        """Test 6: Verificar el loader libyaml, su fallback y la telemetría."""
+        print("\n🔍 Testing YAML Loader Selection...")
+
+        try:
+            import yaml
+
+            expected = 'CSafeLoader' if hasattr(yaml, 'CSafeLoader') else 'SafeLoader'
+            project_dir = self._create_project("yaml_loader", {"features": []})
+            self._create_architecture(project_dir)
+
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            fast = injector.load_global_architecture()
+            telemetry = injector.get_telemetry()
+
+            # Ambos loaders deben producir exactamente la misma estructura
+            raw = (project_dir / ".harness/arquitectura/global/database-schema.yaml").read_bytes()
+            same_result = yaml_cache.parse_yaml(raw) == yaml_cache.parse_yaml(raw, yaml.SafeLoader)
+
+            if telemetry["yaml_loader"] == expected and same_result and fast["database_schema"]["tables"]:
+                self._log_test("YAML Loader - Selection", True, f"loader={expected}")
+            else:
+                self._log_test("YAML Loader - Selection", False,
+                               f"telemetry={telemetry}, same_result={same_result}")
+
+            # Telemetría como copia: mutarla no altera los contadores internos
+            telemetry["yaml_cache"]["misses"] = -1
+            if injector.telemetry["yaml_cache"]["misses"] != -1:
+                self._log_test("YAML Loader - Telemetry Snapshot", True)
+            else:
+                self._log_test("YAML Loader - Telemetry Snapshot", False, "telemetry shares state")
+
+        except Exception as e:
+            self._log_test("YAML Loader Selection", False, f"Exception: {str(e)}")
+
+    def _test_architecture_cache_invalidation(self):
+        """Test 7: Verificar que un injector longevo ve las ediciones de la arquitectura."""
+        print("\n🔍 Testing In-Process Cache Invalidation...")
+
+        try:
+            project_dir = self._create_project("cache_invalidation", {"features": []})
+            architecture_root = self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+
+            first = injector.load_global_architecture()
+            unchanged = injector.load_global_architecture()
+            reloads_before = injector.telemetry["architecture_cache"]["reloads"]
+
+            # Edición tipo harness-extend: solo ese documento se recarga
+            (architecture_root / "global" / "api-contracts.yaml").write_text(
+                "endpoints:\n  - {path: /teams, method: GET, description: List teams, entity: team}\n")
+            edited = injector.load_global_architecture()
+            reloaded = injector.telemetry["architecture_cache"]["reloads"] - reloads_before
+
+            if (unchanged is first and reloaded == 1
+                    and edited["api_contracts"]["endpoints"][0]["path"] == "/teams"
+                    and edited["database_schema"] is first["database_schema"]):
+                self._log_test("Architecture Cache - Per-File Reload", True)
+            else:
+                self._log_test("Architecture Cache - Per-File Reload", False,
+                               f"reloaded={reloaded}, telemetry={injector.get_telemetry()}")
+
+            # Un fichero borrado desaparece del contexto y se avisa una sola vez
+            (architecture_root / "global" / "coding-standards.yaml").unlink()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                removed = injector.load_global_architecture()
+                injector.load_global_architecture()
+
+            if "coding_standards" not in removed and output.getvalue().count("coding-standards.yaml") == 1:
+                self._log_test("Architecture Cache - Removed File", True)
+            else:
+                self._log_test("Architecture Cache - Removed File", False, f"output={output.getvalue()!r}")
+
+        except Exception as e:
+            self._log_test("In-Process Cache Invalidation", False, f"Exception: {str(e)}")
+
+    def _test_parallel_prefetch(self):
+        """Test 8: Verificar que la carga paralela equivale a la secuencial."""
+        print("\n🔍 Testing Parallel Architecture Prefetch...")
+
+        try:
+            project_dir = self._create_project("parallel_prefetch", {"features": []})
+            architecture_root = self._create_architecture(project_dir)
+            for name in ("billing", "search"):
+                feature_dir = architecture_root / "features" / name
+                feature_dir.mkdir(parents=True)
+                (feature_dir / "architecture.yaml").write_text(f"pattern: {name}\n")
+                (feature_dir / "components.yaml").write_text(f"components: [{name.title()}Page]\n")
+
+            sequential = ContextInjector(str(project_dir), use_disk_cache=False, max_workers=1)
+            parallel = ContextInjector(str(project_dir), use_disk_cache=False, max_workers=4)
+            expected = sequential.prefetch_architecture()
+            prefetched = parallel.prefetch_architecture()
+
+            same_order = all(list(prefetched["features"][name]) == list(expected["features"][name])
+                             for name in expected["features"])
+            if (prefetched == expected and same_order
+                    and sorted(prefetched["features"]) == ["auth", "billing", "search"]):
+                self._log_test("Parallel Prefetch - Deterministic Merge", True)
+            else:
+                self._log_test("Parallel Prefetch - Deterministic Merge", False,
+                               f"features={list(prefetched['features'])}")
+
+            # Lo precargado se sirve después desde la caché en memoria
+            reloads = parallel.telemetry["architecture_cache"]["reloads"]
+            billing = parallel.load_feature_architecture("billing")
+            parallel.load_global_architecture()
+            parallel.close()
+            if billing is prefetched["features"]["billing"] and parallel.telemetry["architecture_cache"]["reloads"] == reloads:
+                self._log_test("Parallel Prefetch - Warm Loaders", True)
+            else:
+                self._log_test("Parallel Prefetch - Warm Loaders", False, f"telemetry={parallel.get_telemetry()}")
+
+        except Exception as e:
+            self._log_test("Parallel Architecture Prefetch", False, f"Exception: {str(e)}")
+
+    def _test_batch_injection(self):
+        """Test 9: Verificar que el lote comparte entradas y equivale a inyecciones sueltas."""
+        print("\n🔍 Testing Batch Context Injection...")
+
+        original_detect = context_injector.detect_project
+        try:
+            project_dir = self._create_project("batch_injection", {"features": [
+                {"id": "FE-001", "description": "Login page", "agent_assigned": "frontend", "dependencies": []},
+                {"id": "BE-001", "description": "Login API", "agent_assigned": "backend", "dependencies": []},
+                {"id": "DATA-001", "description": "Users table", "agent_assigned": "data", "dependencies": []}
+            ]})
+            self._create_architecture(project_dir)
+
+            detections = []
+            context_injector.detect_project = lambda path=".": detections.append(path) or {
+                "languages": {"python": {}}, "frameworks": {}, "architecture": {}}
+
+            requests = [("frontend", "FE-001", "auth"), ("backend", "BE-001", "auth"), ("data", "DATA-001")]
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                batch = injector.inject_context_batch(requests)
+                detections_in_batch = len(detections)
+                single = [ContextInjector(str(project_dir), use_disk_cache=False).inject_context_for_agent(*request)
+                          for request in requests]
+
+            if batch == single and detections_in_batch == 1:
+                self._log_test("Batch Injection - Shared Inputs", True)
+            else:
+                self._log_test("Batch Injection - Shared Inputs", False,
+                               f"equal={batch == single}, detections={detections_in_batch}")
+
+            # Un task inexistente falla igual que en la inyección individual
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    injector.inject_context_batch([("backend", "MISSING-001")])
+                self._log_test("Batch Injection - Unknown Task", False, "no error raised")
+            except ValueError:
+                self._log_test("Batch Injection - Unknown Task", True)
+
+        except Exception as e:
+            self._log_test("Batch Context Injection", False, f"Exception: {str(e)}")
+        finally:
+            context_injector.detect_project = original_detect
+
+    def _test_project_analysis_cache(self):
+        """Test 10: Verificar que la auto-detección se reutiliza hasta que cambian los manifests."""
+        print("\n🔍 Testing Project Analysis Cache...")
+
+        original_detect = context_injector.detect_project
+        try:
+            project_dir = self._create_project("analysis_cache", {"features": [
+                {"id": "BE-001", "description": "Login API", "agent_assigned": "backend", "dependencies": []}
+            ]})
+            self._create_architecture(project_dir)
+            (project_dir / "package.json").write_text('{"dependencies": {}}')
+            (project_dir / "src" / "nested").mkdir(parents=True)
+            (project_dir / "src" / "nested" / "app.ts").write_text("export {}\n")
+
+            detections = []
+            context_injector.detect_project = lambda path=".": detections.append(path) or {
+                "languages": {"typescript": {}}, "frameworks": {}, "architecture": {}}
+
+            def inject():
+                # Un injector nuevo por inyección simula llamadas desde procesos distintos
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return ContextInjector(str(project_dir)).inject_context_for_agent("backend", "BE-001")
+
+            first = inject()
+            # Editar código fuente no toca manifests ni directorios de primer nivel
+            (project_dir / "src" / "nested" / "app.ts").write_text("export const app = 1\n")
+            second = inject()
+            persisted = (project_dir / ".claude" / "project_analysis.json").exists()
+
+            if len(detections) == 1 and persisted and second["project_analysis"] == first["project_analysis"]:
+                self._log_test("Analysis Cache - Reuse", True)
+            else:
+                self._log_test("Analysis Cache - Reuse", False,
+                               f"detections={len(detections)}, persisted={persisted}")
+
+            # Editar un manifest o añadir un directorio de primer nivel invalida el análisis
+            (project_dir / "package.json").write_text('{"dependencies": {"react": "^18.0.0"}}')
+            inject()
+            after_manifest = len(detections)
+            (project_dir / "backend").mkdir()
+            inject()
+
+            if after_manifest == 2 and len(detections) == 3:
+                self._log_test("Analysis Cache - Invalidation", True)
+            else:
+                self._log_test("Analysis Cache - Invalidation", False, f"detections={len(detections)}")
+
+        except Exception as e:
+            self._log_test("Project Analysis Cache", False, f"Exception: {str(e)}")
+        finally:
+            context_injector.detect_project = original_detect
+
+    def _test_token_budget(self):
+        """Test 11: Verificar el recorte por prioridad dentro del presupuesto de tokens."""
+        print("\n🔍 Testing Token-Budgeted Context...")
+
+        try:
+            project_dir = self._create_project("token_budget", {"features": [
+                {"id": "BE-001", "description": "Login API " * 20, "agent_assigned": "backend", "dependencies": []}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            endpoints = "".join(f"  - {{path: /items/{i}, method: GET, description: Item {i}}}\n" for i in range(300))
+            (architecture_root / "global" / "api-contracts.yaml").write_text("endpoints:\n" + endpoints)
+
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                full = injector.inject_context_for_agent("backend", "BE-001", "auth")
+                budgeted = injector.inject_context_for_agent("backend", "BE-001", "auth", token_budget=1500)
+                full_again = injector.inject_context_for_agent("backend", "BE-001", "auth")
+
+            budget = budgeted["context_budget"]
+            payload = {key: value for key, value in budgeted.items() if key != "context_budget"}
+            sections = budget["sections"]
+            if (estimate_tokens(budgeted) <= 1500 and estimate_tokens(payload) < budget["estimated_tokens"] <= 1500
+                    and budgeted["task_details"] == full["task_details"]
+                    and sections["task_details"]["status"] == "full"
+                    and sections["feature_architecture"]["status"] == "full"
+                    and sections["global_architecture"]["status"] in ("truncated", "omitted")
+                    and "context_budget" not in full):
+                self._log_test("Token Budget - Priority Fit", True,
+                               f"{estimate_tokens(full)} -> {budget['estimated_tokens']} tokens")
+            else:
+                self._log_test("Token Budget - Priority Fit", False, f"budget={budget}")
+
+            # Recortar no debe mutar la arquitectura cacheada
+            if full_again == full and len(full_again["global_architecture"]["api_contracts"]["endpoints"]) == 300:
+                self._log_test("Token Budget - Cache Untouched", True)
+            else:
+                self._log_test("Token Budget - Cache Untouched", False, "cached architecture was modified")
+
+            # Una lista cuyo primer elemento no cabe se omite en lugar de dejar solo el marcador
+            with contextlib.redirect_stdout(io.StringIO()):
+                fitted = fit_context_to_budget({"agent_type": "backend", "notes": ["x" * 400, "y"]}, 60)
+            if "notes" not in fitted and fitted["context_budget"]["sections"]["notes"]["status"] == "omitted":
+                self._log_test("Token Budget - No Marker-Only Lists", True)
+            else:
+                self._log_test("Token Budget - No Marker-Only Lists", False, f"fitted={fitted}")
+
+            # El resultado entero (metadatos incluidos) cabe, también con textos que crecen al escaparse
+            escaped = {"agent_type": "backend", "task_id": "T-1", "task_details": {"notes": 'a"\n' * 400},
+                       "global_architecture": {"endpoints": ["GET /items"] * 200}, "project_info": {"name": "p"}}
+            sizes = {budget: estimate_tokens(fit_context_to_budget(escaped, budget)) for budget in (150, 400, 1000, 2000)}
+            if all(size <= budget for budget, size in sizes.items()):
+                self._log_test("Token Budget - Metadata Counted", True, f"sizes={sizes}")
+            else:
+                self._log_test("Token Budget - Metadata Counted", False, f"sizes={sizes}")
+
+        except Exception as e:
+            self._log_test("Token-Budgeted Context", False, f"Exception: {str(e)}")
+
+    def _test_context_projections(self):
+        """Test 12: Verificar las proyecciones por defecto y el override del proyecto."""
+        print("\n🔍 Testing Declarative Context Projections...")
+
+        try:
+            project_dir = self._create_project("projections", {"features": []})
+            self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            global_arch = injector.load_global_architecture()
+            cross_cutting = injector.load_cross_cutting_concerns()
+
+            frontend = injector._filter_context_for_agent("frontend", global_arch, cross_cutting)
+            expected = {
+                "stack_decisions": {"frontend": {"framework": "remix"}, "project_type": "web"},
+                "coding_standards": {
+                    "naming_conventions": {"files": "kebab-case"},
+                    "project_structure": {"routes": "app/routes"},
+                    "git_workflow": {"branches": "trunk"}
+                },
+                "api_contracts": global_arch["api_contracts"]
+            }
+            if frontend["global"] == expected and frontend["cross_cutting"] is cross_cutting:
+                self._log_test("Projections - Default Specs", True)
+            else:
+                self._log_test("Projections - Default Specs", False, f"frontend={frontend['global']}")
+
+            # DevOps, gen-AI y los agentes no listados ya no reciben la arquitectura entera
+            devops = injector._filter_context_for_agent("devops", global_arch, cross_cutting)
+            genai = injector._filter_context_for_agent("genai", global_arch, cross_cutting)
+            unlisted = injector._filter_context_for_agent("qa", global_arch, cross_cutting)
+            if (devops["global"] == {
+                    "stack_decisions": {"infrastructure": {"cloud": "aws"}, "deployment": {},
+                                        "backend": {"framework": "fastapi"}, "frontend": {"framework": "remix"},
+                                        "project_type": "web"},
+                    "coding_standards": {"project_structure": global_arch["coding_standards"]["project_structure"],
+                                         "git_workflow": {"branches": "trunk"}}}
+                    and devops["cross_cutting"] == {"logging": {"format": "json"}, "testing_strategy": {}}
+                    and genai["global"] == {"stack_decisions": {"backend": {"framework": "fastapi"}, "ai": {},
+                                                                "project_type": "web"},
+                                            "api_contracts": global_arch["api_contracts"]}
+                    and list(genai["cross_cutting"]) == ["error_handling", "logging"]
+                    and list(unlisted["global"]) == ["stack_decisions", "coding_standards"]
+                    and unlisted["cross_cutting"] is cross_cutting):
+                self._log_test("Projections - DevOps, Gen-AI and Default", True)
+            else:
+                self._log_test("Projections - DevOps, Gen-AI and Default", False,
+                               f"devops={devops}, genai={genai}, unlisted={list(unlisted['global'])}")
+
+            # Un agente nuevo y un ajuste de frontend sin tocar código
+            (project_dir / ".harness" / "context-projections.yaml").write_text(
+                "agents:\n"
+                "  genai:\n"
+                "    global:\n"
+                "      stack: stack_decisions.backend\n"
+                "      endpoints: {select: api_contracts.endpoints, default: []}\n"
+                "    cross_cutting: {errors: error_handling}\n"
+                "  frontend:\n"
+                "    global: {api_contracts: api_contracts}\n"
+            )
+            genai = injector._filter_context_for_agent("genai", global_arch, cross_cutting)
+            frontend = injector._filter_context_for_agent("frontend", global_arch, cross_cutting)
+            if (genai["global"] == {"stack": {"framework": "fastapi"},
+                                    "endpoints": global_arch["api_contracts"]["endpoints"]}
+                    and genai["cross_cutting"] == {"errors": cross_cutting["error_handling"]}
+                    and list(frontend["global"]) == ["api_contracts"]):
+                self._log_test("Projections - Project Override", True)
+            else:
+                self._log_test("Projections - Project Override", False, f"genai={genai}, frontend={frontend}")
+
+        except Exception as e:
+            self._log_test("Declarative Context Projections", False, f"Exception: {str(e)}")
+
+    def _test_context_bundles(self):
+        """Test 13: Verificar que el bundle por agente se reutiliza y se reconstruye al cambiar."""
+        print("\n🔍 Testing Per-Agent Context Bundles...")
+
+        try:
+            project_dir = self._create_project("bundles", {"features": [
+                {"id": "BE-001", "description": "Login API", "agent_assigned": "backend", "dependencies": []},
+                {"id": "BE-002", "description": "Logout API", "agent_assigned": "backend", "dependencies": []}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+
+            def inject(task_id):
+                injector = ContextInjector(str(project_dir))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    context = injector.inject_context_for_agent("backend", task_id, "auth")
+                return context, injector.telemetry["bundles"]
+
+            first, first_stats = inject("BE-001")
+            second, second_stats = inject("BE-002")
+            bundle_file = project_dir / ".harness" / ".cache" / "bundles" / "backend.marshal"
+
+            shared_sections = [key for key in first if key not in ("task_id", "task_details")]
+            if (first_stats["rebuilds"] == 1 and second_stats["disk_hits"] == 1 and second_stats["rebuilds"] == 0
+                    and bundle_file.exists() and second["task_details"]["id"] == "BE-002"
+                    and all(first[key] == second[key] for key in shared_sections)):
+                self._log_test("Context Bundles - Reuse", True)
+            else:
+                self._log_test("Context Bundles - Reuse", False, f"first={first_stats}, second={second_stats}")
+
+            # Cambiar una entrada del bundle (estándares globales) lo reconstruye
+            (architecture_root / "global" / "coding-standards.yaml").write_text(
+                "naming_conventions:\n  files: snake_case\n")
+            edited, edited_stats = inject("BE-001")
+            if (edited_stats["rebuilds"] == 1
+                    and edited["global_architecture"]["coding_standards"]["naming_conventions"] == {"files": "snake_case"}):
+                self._log_test("Context Bundles - Rebuild On Change", True)
+            else:
+                self._log_test("Context Bundles - Rebuild On Change", False, f"stats={edited_stats}")
+
+            # Un bundle leído de disco es idéntico al recién construido: fechas y claves int incluidas
+            (architecture_root / "global" / "api-contracts.yaml").write_text(
+                "version: 2024-05-01\nresponses: {200: ok, 404: missing}\n")
+            fresh, fresh_stats = inject("BE-001")
+            cached, cached_stats = inject("BE-001")
+            contracts = cached["global_architecture"]["api_contracts"]
+            if (fresh_stats["rebuilds"] == 1 and cached_stats["disk_hits"] == 1 and cached == fresh
+                    and contracts["version"] == datetime.date(2024, 5, 1) and list(contracts["responses"]) == [200, 404]):
+                self._log_test("Context Bundles - Disk Round Trip", True)
+            else:
+                self._log_test("Context Bundles - Disk Round Trip", False,
+                               f"stats={cached_stats}, contracts={contracts}")
+
+        except Exception as e:
+            self._log_test("Per-Agent Context Bundles", False, f"Exception: {str(e)}")
+
+    def _test_context_blobs(self):
+        """Test 14: Verificar la deduplicación por contenido y la resolución de referencias."""
+        print("\n🔍 Testing Content-Addressed Context Blobs...")
+
+        try:
+            project_dir = self._create_project("blobs", {"features": [
+                {"id": f"T-00{i}", "description": f"Task {i}", "agent_assigned": agent, "dependencies": []}
+                for i, agent in enumerate(["frontend", "backend", "data", "frontend"])
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            endpoints = "".join(f"  - {{path: /items/{i}, method: GET, description: Item {i}}}\n" for i in range(40))
+            (architecture_root / "global" / "api-contracts.yaml").write_text("endpoints:\n" + endpoints)
+            errors = "".join(f"  E{i:03d}: {{status: 400, message: Validation error {i}}}\n" for i in range(40))
+            (architecture_root / "cross-cutting" / "error-handling.yaml").write_text("errors:\n" + errors)
+
+            requests = [("frontend", "T-000", "auth"), ("backend", "T-001", "auth"),
+                        ("data", "T-002"), ("frontend", "T-003")]
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                full = injector.inject_context_batch(requests)
+                references = injector.inject_context_batch(requests, as_references=True)
+
+            # Otro proceso (el agente) materializa su contexto desde disco
+            resolved = [ContextInjector(str(project_dir)).resolve_context(context) for context in references]
+            cross_cutting_refs = {json.dumps(context["cross_cutting_concerns"]) for context in references}
+            stats = injector.telemetry["blobs"]
+
+            if resolved == full and len(cross_cutting_refs) == 1 and "$blob" in cross_cutting_refs.pop():
+                self._log_test("Context Blobs - Resolve", True)
+            else:
+                self._log_test("Context Blobs - Resolve", False, f"refs={cross_cutting_refs}")
+
+            full_size = sum(len(json.dumps(context)) for context in full)
+            reference_size = sum(len(json.dumps(context)) for context in references)
+            if stats["memo_hits"] > 0 and stats["bytes_written"] < full_size and reference_size < full_size / 4:
+                self._log_test("Context Blobs - Deduplication", True,
+                               f"{full_size} bytes -> {reference_size} in contexts + {stats['bytes_written']} in blobs")
+            else:
+                self._log_test("Context Blobs - Deduplication", False, f"stats={stats}, sizes={full_size}/{reference_size}")
+
+            # Todos los blobs envejecen; un lote nuevo renueva los que usa y el huérfano se poda
+            blobs_dir = project_dir / ".harness" / ".cache" / "blobs"
+            orphan = injector._blobs.put(b'{"orphan": true}')
+            for blob in blobs_dir.glob("*/*.json"):
+                os.utime(blob, (0, 0))
+            pruner = ContextInjector(str(project_dir), use_disk_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                refreshed = pruner.inject_context_batch(requests, as_references=True)
+                pruned = pruner.prune_blobs(max_age_seconds=3600)
+            remaining = {blob.stem for blob in blobs_dir.glob("*/*.json")}
+            if (pruned["removed"] == 1 and orphan not in remaining and pruned["kept"] == len(remaining)
+                    and [ContextInjector(str(project_dir)).resolve_context(context) for context in refreshed] == full):
+                self._log_test("Context Blobs - Prune", True)
+            else:
+                self._log_test("Context Blobs - Prune", False, f"pruned={pruned}, orphan kept={orphan in remaining}")
+
+        except Exception as e:
+            self._log_test("Content-Addressed Context Blobs", False, f"Exception: {str(e)}")
+
+    def _test_delta_injection(self):
+        """Test 15: Verificar que un agente reanudado solo recibe las secciones cambiadas."""
+        print("\n🔍 Testing Delta Context Injection...")
+
+        try:
+            project_dir = self._create_project("delta", {"features": [
+                {"id": "T-001", "description": "Login form", "agent_assigned": "frontend", "dependencies": []},
+                {"id": "T-002", "description": "Signup form", "agent_assigned": "frontend", "dependencies": []}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                first = injector.inject_context_for_agent("frontend", "T-001", delta=True, agent_id="fe-1")
+                second = injector.inject_context_for_agent("frontend", "T-002", delta=True, agent_id="fe-1")
+                (architecture_root / "global" / "api-contracts.yaml").write_text(
+                    "endpoints:\n  - {path: /sessions, method: POST, description: Create session}\n")
+                third = injector.inject_context_for_agent("frontend", "T-002", delta=True, agent_id="fe-1")
+                injector.reset_agent_manifest("fe-1")
+                fourth = injector.inject_context_for_agent("frontend", "T-001", delta=True, agent_id="fe-1")
+
+            if (first["context_mode"] == "full" and "global_architecture" in first
+                    and second["context_mode"] == "delta" and second["changed_sections"] == {}
+                    and second["task_details"]["id"] == "T-002"
+                    and "global_architecture" in second["unchanged_sections"]):
+                self._log_test("Delta Injection - Unchanged Sections Skipped", True)
+            else:
+                self._log_test("Delta Injection - Unchanged Sections Skipped", False,
+                               f"first={first.get('context_mode')}, second={second}")
+
+            changed = third.get("changed_sections", {})
+            if (list(changed) == ["global_architecture"]
+                    and changed["global_architecture"]["api_contracts"]["endpoints"][0]["path"] == "/sessions"
+                    and fourth["context_mode"] == "full"):
+                self._log_test("Delta Injection - Changed Sections Sent", True)
+            else:
+                self._log_test("Delta Injection - Changed Sections Sent", False,
+                               f"changed={list(changed)}, fourth={fourth.get('context_mode')}")
+
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    injector.inject_context_batch([("frontend", "T-001"), ("frontend", "T-002")], delta=True)
+                self._log_test("Delta Injection - Distinct Agent Ids", False, "duplicate agent ids accepted")
+            except ValueError:
+                self._log_test("Delta Injection - Distinct Agent Ids", True)
+
+        except Exception as e:
+            self._log_test("Delta Context Injection", False, f"Exception: {str(e)}")
+
+    def _test_claude_md_index(self):
+        """Test 16: Verificar el índice de claude.md y los extractores que lo consultan."""
+        print("\n🔍 Testing Indexed claude.md Parser...")
+
+        content = (
+            "# Claude Context - Shop\n\n"
+            "## 🎯 Contexto del Proyecto\n\n"
+            "### Dominio de Negocio\n"
+            "- **Qué hace**: Marketplace de reservas\n"
+            "- **Usuarios objetivo**: Hoteles\n\n"
+            "### Reglas de Negocio Críticas\n"
+            "- Cancelación hasta 24h antes\n"
+            "- Comisión sobre precio final\n"
+            "```text\n- no es una regla\n## tampoco es un heading\n```\n\n"
+            "## 🚨 Consideraciones Especiales\n\n"
+            "### Performance Crítica (p95)\n"
+            "- **Checkout**: Target <200ms\n\n"
+            "### Seguridad Específica\n"
+            "- **Rate limiting**: 100 req/min\n\n"
+            "## 🎯 **Información para Claude Code**\n\n"
+            "### Patrones de Código Específicos del Proyecto\n"
+            "```python\ndef handler():\n    pass\n```\n\n"
+            "### Convenciones de Naming Específicas\n"
+            "- **Archivos**: kebab-case\n\n"
+            "Última actualización: 2026-10-01\n"
+        )
+
+        try:
+            index = ClaudeMdIndex(content)
+            domain = index.section("🎯 Contexto del Proyecto")
+            rules = domain.subsection("Reglas de Negocio Críticas")
+            if ([section.title for section in domain.children] == ["Dominio de Negocio", "Reglas de Negocio Críticas"]
+                    and rules.bullets() == ["Cancelación hasta 24h antes", "Comisión sobre precio final"]
+                    and rules.code_blocks() == ["- no es una regla\n## tampoco es un heading"]
+                    and domain.label("Usuarios objetivo") == "Hoteles"
+                    and index.section("tampoco") is None):
+                self._log_test("claude.md Index - Sections, Bullets and Fences", True)
+            else:
+                self._log_test("claude.md Index - Sections, Bullets and Fences", False,
+                               f"children={[s.title for s in domain.children]}, bullets={rules.bullets()}")
+
+            parsed = ContextInjector.__new__(ContextInjector)._parse_claude_md_content(content)
+            expected = {
+                "business_domain": {"description": "Marketplace de reservas", "target_users": "Hoteles",
+                                    "unique_value": None},
+                "business_rules": ["Cancelación hasta 24h antes", "Comisión sobre precio final"],
+                "performance": "- **Checkout**: Target <200ms",
+                "security": "- **Rate limiting**: 100 req/min",
+                "monitoring": None,
+                "patterns": ["def handler():\n    pass"],
+                "naming_conventions": "- **Archivos**: kebab-case\n\nÚltima actualización: 2026-10-01",
+                "last_updated": "2026-10-01"
+            }
+            if parsed == expected:
+                self._log_test("claude.md Index - Extractors", True)
+            else:
+                self._log_test("claude.md Index - Extractors", False, f"parsed={parsed}")
+
+            # El valor de un label puede ir en la línea siguiente (como con la regex original)
+            wrapped = ClaudeMdIndex("## Dominio\n- **Qué hace**:\n  Reservas de hotel\n- **Usuarios**\n\n  Viajeros\n")
+            section = wrapped.section("Dominio")
+            if section.label("Qué hace") == "Reservas de hotel" and section.label("Usuarios") == "Viajeros":
+                self._log_test("claude.md Index - Label Value On Next Line", True)
+            else:
+                self._log_test("claude.md Index - Label Value On Next Line", False,
+                               f"labels={section.label('Qué hace')!r}, {section.label('Usuarios')!r}")
+
+        except Exception as e:
+            self._log_test("Indexed claude.md Parser", False, f"Exception: {str(e)}")
+
+    def _test_claude_md_cache(self):
+        """Test 17: Verificar que claude.md se parsea una vez por contenido, entre procesos."""
+        print("\n🔍 Testing Parsed claude.md Cache...")
+
+        try:
+            project_dir = self._create_project("claude_md_cache", {"features": []})
+            claude_md = project_dir / "claude.md"
+            original = "## 🎯 Contexto del Proyecto\n- **Qué hace**: Reservas\n"
+            claude_md.write_text(original)
+
+            injector = ContextInjector(str(project_dir))
+            with contextlib.redirect_stdout(io.StringIO()):
+                first = injector._load_claude_md_context()
+                second = injector._load_claude_md_context()
+                # Un proceso nuevo (otro agente) reutiliza el parseo de disco
+                other = ContextInjector(str(project_dir))
+                third = other._load_claude_md_context()
+            stats, other_stats = injector.telemetry["claude_md_cache"], other.telemetry["claude_md_cache"]
+
+            description = first["project_context"]["business_domain"]["description"]
+            if (description == "Reservas" and first == second == third
+                    and stats["misses"] == 1 and stats["memory_hits"] == 1
+                    and other_stats["disk_hits"] == 1 and other_stats["misses"] == 0):
+                self._log_test("claude.md Cache - Parsed Once", True)
+            else:
+                self._log_test("claude.md Cache - Parsed Once", False, f"stats={stats}, other={other_stats}")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                claude_md.write_text(original.replace("Reservas", "Reservas de hoteles"))
+                edited = injector._load_claude_md_context()
+                claude_md.write_text(original)
+                reverted = other._load_claude_md_context()
+
+            if (edited["project_context"]["business_domain"]["description"] == "Reservas de hoteles"
+                    and stats["misses"] == 2 and reverted == first and other_stats["misses"] == 0):
+                self._log_test("claude.md Cache - Content Hash Key", True)
+            else:
+                self._log_test("claude.md Cache - Content Hash Key", False, f"stats={stats}, other={other_stats}")
+
+            # Con finales de línea CRLF el parseo es el mismo que con LF (como read_text())
+            template = skill_path.parent / "harness-context" / "templates" / "python-fastapi-template.md"
+            content = template.read_text(encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                claude_md.write_bytes(content.encode("utf-8"))
+                lf = ContextInjector(str(project_dir))._load_claude_md_context()
+                claude_md.write_bytes(content.replace("\n", "\r\n").encode("utf-8"))
+                crlf = ContextInjector(str(project_dir))._load_claude_md_context()
+            if crlf == lf and "\\r" not in json.dumps(crlf):
+                self._log_test("claude.md Cache - CRLF Newlines", True)
+            else:
+                self._log_test("claude.md Cache - CRLF Newlines", False, f"parsed={crlf}")
+
+        except Exception as e:
+            self._log_test("Parsed claude.md Cache", False, f"Exception: {str(e)}")
+
+    def _test_lazy_context(self):
+        """Test 18: Verificar que las secciones perezosas solo se cargan al accederlas."""
+        print("\n🔍 Testing Lazy Context Sections...")
+
+        try:
+            project_dir = self._create_project("lazy", {"features": [
+                {"id": "T-001", "description": "Login API", "agent_assigned": "backend", "dependencies": []}
+            ]})
+            self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                context = injector.inject_context_for_agent("backend", "T-001", "auth", lazy=True)
+                task = context["task_details"]
+                feature = context["feature_architecture"]
+            untouched = injector.telemetry["bundles"]["rebuilds"] == 0 and not context.is_resolved("global_architecture")
+
+            if task["description"] == "Login API" and feature["architecture"] == {"pattern": "jwt"} and untouched:
+                self._log_test("Lazy Context - Untouched Sections Not Loaded", True,
+                               f"pending: {', '.join(context.pending_sections())}")
+            else:
+                self._log_test("Lazy Context - Untouched Sections Not Loaded", False, repr(context))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                materialized = context.to_dict()
+                eager = injector.inject_context_for_agent("backend", "T-001", "auth")
+            if (materialized == eager and list(materialized) == list(eager)
+                    and injector.telemetry["bundles"]["rebuilds"] == 1 and json.dumps(materialized)):
+                self._log_test("Lazy Context - Materialization", True)
+            else:
+                self._log_test("Lazy Context - Materialization", False, f"keys={list(materialized)}")
+
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    injector.inject_context_for_agent("backend", "T-001", lazy=True, token_budget=500)
+                self._log_test("Lazy Context - Budget Rejected", False, "lazy + token_budget accepted")
+            except ValueError:
+                self._log_test("Lazy Context - Budget Rejected", True)
+
+        except Exception as e:
+            self._log_test("Lazy Context Sections", False, f"Exception: {str(e)}")
+
+    def _test_clean_architecture_tables(self):
+        """Test 19: Verificar tablas congeladas, composición memoizada y extensión del proyecto."""
+        print("\n🔍 Testing Clean Architecture Tables...")
+
+        try:
+            project_dir = self._create_project("clean_architecture", {"features": []})
+            injector = ContextInjector(str(project_dir))
+            remix = {"languages": {"typescript": {}}, "frameworks": {"remix": {}}}
+            remix_vite = {"languages": {"typescript": {}}, "frameworks": {"remix": {}, "vite": {}}}
+
+            frontend = injector._get_clean_architecture_context("frontend", remix)
+            shared = injector._get_clean_architecture_context("frontend", remix_vite)
+            try:
+                frontend["agent_guidelines"].append("mutated")
+                read_only = False
+            except TypeError:
+                read_only = True
+
+            if (frontend is shared and read_only
+                    and list(frontend["framework_integration"]) == ["remix"]
+                    and list(frontend["language_patterns"]) == ["typescript"]
+                    and frontend["focus_layers"] == ["presentation"]
+                    and json.loads(json.dumps(frontend)) == frontend):
+                self._log_test("Clean Architecture - Frozen and Memoized", True,
+                               f"stats={injector.telemetry['clean_architecture']}")
+            else:
+                self._log_test("Clean Architecture - Frozen and Memoized", False,
+                               f"shared={frontend is shared}, read_only={read_only}")
+
+            (project_dir / ".harness").mkdir(exist_ok=True)
+            (project_dir / ".harness" / "clean-architecture-patterns.yaml").write_text(
+                "agents:\n"
+                "  frontend:\n"
+                "    framework_integration:\n"
+                "      vue: {composables: Call application use cases}\n"
+                "  backend:\n"
+                "    framework_integration:\n"
+                "      django: {views: Thin controllers that call use cases}\n"
+            )
+            vue = injector._get_clean_architecture_context(
+                "frontend", {"languages": {"typescript": {}}, "frameworks": {"vue": {}}})
+            django = injector._get_clean_architecture_context(
+                "backend", {"languages": {"python": {}}, "frameworks": {"django": {}}})
+            remix_again = injector._get_clean_architecture_context("frontend", remix)
+
+            if (vue["framework_integration"] == {"vue": {"composables": "Call application use cases"}}
+                    and list(django["framework_integration"]) == ["django"]
+                    and list(django["language_patterns"]) == ["python"]
+                    and remix_again["framework_integration"] == frontend["framework_integration"]
+                    and len(remix_again["agent_guidelines"]) == 4):
+                self._log_test("Clean Architecture - Project Extension", True)
+            else:
+                self._log_test("Clean Architecture - Project Extension", False,
+                               f"vue={vue.get('framework_integration')}, django={django.get('framework_integration')}")
+
+        except Exception as e:
+            self._log_test("Clean Architecture Tables", False, f"Exception: {str(e)}")
+
+    def _test_context_streaming(self):
+        """Test 20: Verificar que el JSON en streaming es idéntico a json.dumps y cuenta bytes."""
+        print("\n🔍 Testing Streaming Context Emission...")
+
+        try:
+            project_dir = self._create_project("streaming", {"features": [
+                {"id": "T-001", "description": "Añadir login con €uro", "agent_assigned": "backend", "dependencies": []}
+            ]})
+            self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                context = injector.inject_context_for_agent("backend", "T-001", "auth")
+                lazy = injector.inject_context_for_agent("backend", "T-001", "auth", lazy=True)
+
+            matches = True
+            for compact, options in ((False, {"indent": 2}), (True, {"separators": (",", ":")})):
+                expected = json.dumps(context, ensure_ascii=False, **options) + "\n"
+                text, binary = io.StringIO(), io.BytesIO()
+                emitted = stream_context(context, text, compact=compact)
+                streamed_lazy = stream_context(lazy, binary, compact=compact)
+                matches = (matches and text.getvalue() == expected and binary.getvalue().decode("utf-8") == expected
+                           and emitted == streamed_lazy == len(expected.encode("utf-8")))
+
+            if matches and not lazy.pending_sections():
+                self._log_test("Context Streaming - Identical Output", True)
+            else:
+                self._log_test("Context Streaming - Identical Output", False, f"pending={lazy.pending_sections()}")
+
+            output = project_dir / "context.json"
+            result = subprocess.run(
+                [sys.executable, str(utils_path / "context_injector.py"), "backend", "T-001",
+                 "--output", str(output), "--compact"],
+                cwd=project_dir, capture_output=True, text=True, timeout=60
+            )
+            written = output.read_bytes() if output.exists() else b""
+            if (result.returncode == 0 and f"{len(written)} bytes" in result.stdout
+                    and json.loads(written)["task_details"]["id"] == "T-001" and b"\n  " not in written):
+                self._log_test("Context Streaming - CLI Output", True, f"{len(written)} bytes")
+            else:
+                self._log_test("Context Streaming - CLI Output", False, result.stdout[-300:] + result.stderr[-300:])
+
+            # Sin --output, stdout es JSON válido y los mensajes de estado van a stderr
+            result = subprocess.run(
+                [sys.executable, str(utils_path / "context_injector.py"), "backend", "T-001"],
+                cwd=project_dir, capture_output=True, text=True, timeout=60
+            )
+            try:
+                streamed = json.loads(result.stdout)
+            except ValueError:
+                streamed = {}
+            if result.returncode == 0 and streamed.get("task_details", {}).get("id") == "T-001" and "bytes" in result.stderr:
+                self._log_test("Context Streaming - CLI Stdout", True)
+            else:
+                self._log_test("Context Streaming - CLI Stdout", False, result.stdout[:300] + result.stderr[-300:])
+
+        except Exception as e:
+            self._log_test("Streaming Context Emission", False, f"Exception: {str(e)}")
+
+    def _test_relevance_selection(self):
+        """Test 21: Verificar la selección por relevancia y la persistencia del índice BM25."""
+        print("\n🔍 Testing Task Relevance Selection...")
+
+        try:
+            project_dir = self._create_project("relevance", {"features": [
+                {"id": "T-001", "description": "Add pagination to the orders listing",
+                 "acceptance_criteria": ["Orders are returned 20 per page"],
+                 "agent_assigned": "backend", "dependencies": []}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir))
+            with contextlib.redirect_stdout(io.StringIO()):
+                full = injector.inject_context_for_agent("backend", "T-001")
+                context = injector.inject_context_for_agent("backend", "T-001", relevance_top_k=1)
+
+            global_arch = context["global_architecture"]
+            report = context["context_relevance"]
+            if (global_arch["api_contracts"]["endpoints"] == [full["global_architecture"]["api_contracts"]["endpoints"][2]]
+                    and list(global_arch["database_schema"]["tables"]) == ["orders"]
+                    and global_arch["coding_standards"] == full["global_architecture"]["coding_standards"]
+                    and report["unmatched"] == ["standards"] and "order" in report["query_terms"]
+                    and len(full["global_architecture"]["api_contracts"]["endpoints"]) == 3):
+                self._log_test("Relevance - Task Selection", True, f"selected={report['selected']}")
+            else:
+                self._log_test("Relevance - Task Selection", False, f"report={report}")
+
+            # Otro proceso reutiliza el índice persistido hasta que cambia un YAML de origen
+            fresh = ContextInjector(str(project_dir))
+            with contextlib.redirect_stdout(io.StringIO()):
+                reused = fresh.inject_context_for_agent("backend", "T-001", relevance_top_k=1)
+            persisted = (fresh.telemetry["relevance_index"]["disk_loads"] == 1
+                         and fresh.telemetry["relevance_index"]["builds"] == 0
+                         and reused["context_relevance"] == report)
+
+            (architecture_root / "global" / "api-contracts.yaml").write_text(
+                "endpoints:\n"
+                "  - {path: /users, method: GET, description: List users, entity: user}\n"
+                "  - {path: /orders, method: GET, description: List orders, entity: order}\n"
+                "  - {path: '/orders/{id}', method: GET, description: Get one order, entity: order}\n"
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                updated = fresh.inject_context_for_agent("backend", "T-001", relevance_top_k=2)
+
+            endpoints = [endpoint["path"] for endpoint in updated["global_architecture"]["api_contracts"]["endpoints"]]
+            if persisted and endpoints == ["/orders", "/orders/{id}"] and fresh.telemetry["relevance_index"]["builds"] == 1:
+                self._log_test("Relevance - Index Refreshed on Change", True, f"stats={fresh.get_telemetry()['relevance_index']}")
+            else:
+                self._log_test("Relevance - Index Refreshed on Change", False, f"endpoints={endpoints}")
+
+        except Exception as e:
+            self._log_test("Task Relevance Selection", False, f"Exception: {str(e)}")
+
+    def _test_architecture_index(self):
+        """Test 22: Verificar los índices de endpoints/tablas/entidades y la inyección de lo referenciado."""
+        print("\n🔍 Testing Architecture Indexes...")
+
+        try:
+            project_dir = self._create_project("architecture_index", {"features": [
+                {"id": "T-001", "description": "Implement POST /users with email validation",
+                 "tables": ["users"], "agent_assigned": "backend", "dependencies": []},
+                {"id": "T-002", "description": "Add an index to orders", "tables": ["orders"],
+                 "agent_assigned": "backend", "dependencies": []}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+
+            index = injector.get_architecture_index()
+            order = injector.query_architecture(entities=["orders"])
+            if (index.endpoint("GET /users/")[0]["description"] == "List users"
+                    and len(index.endpoint("/users")) == 2
+                    and index.table("orders") == {"columns": {"id": "uuid", "user_id": "uuid"}, "relations": ["users"]}
+                    and index.entity("user") == {"endpoints": ["GET /users", "POST /users"], "tables": ["users"]}
+                    and order["api_contracts"]["endpoints"] == [{"path": "/orders", "method": "GET",
+                                                                 "description": "List orders", "entity": "order"}]
+                    and list(order["database_schema"]["tables"]) == ["orders"]
+                    and injector.get_architecture_index() is index):
+                self._log_test("Architecture Index - Lookups", True, f"stats={injector.telemetry['architecture_index']}")
+            else:
+                self._log_test("Architecture Index - Lookups", False, f"order={order}")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                context = injector.inject_context_for_agent("backend", "T-001", referenced_only=True)
+                tables_only = injector.inject_context_for_agent("backend", "T-002", referenced_only=True)
+            global_arch = context["global_architecture"]
+            full_contracts = injector.load_global_architecture()["api_contracts"]
+            if (global_arch["api_contracts"]["endpoints"] == [index.endpoint("POST /users")[0]]
+                    and list(global_arch["database_schema"]["tables"]) == ["users"]
+                    and context["context_references"] == {"endpoints": ["POST /users"], "tables": ["users"],
+                                                          "entities": [], "unresolved": [],
+                                                          "narrowed": ["api_contracts", "database_schema"],
+                                                          "sent_in_full": []}
+                    # Sin endpoints referenciados el contrato va completo y se indica
+                    and tables_only["global_architecture"]["api_contracts"] == full_contracts
+                    and tables_only["context_references"]["sent_in_full"] == ["api_contracts"]):
+                self._log_test("Architecture Index - Referenced Injection", True)
+            else:
+                self._log_test("Architecture Index - Referenced Injection", False,
+                               f"references={context.get('context_references')}")
+
+            (architecture_root / "global" / "api-contracts.yaml").write_text(
+                "endpoints:\n  - {path: /users, method: POST, description: Register user}\n")
+            rebuilt = injector.get_architecture_index()
+            if rebuilt is not index and injector.telemetry["architecture_index"]["builds"] == 2:
+                self._log_test("Architecture Index - Rebuilt on Change", True)
+            else:
+                self._log_test("Architecture Index - Rebuilt on Change", False,
+                               f"stats={injector.telemetry['architecture_index']}")
+
+        except Exception as e:
+            self._log_test("Architecture Indexes", False, f"Exception: {str(e)}")
+
+    def _test_upcoming_task_prefetch(self):
+        """Test 23: Verificar el prefetch de features de la cola de listos y el tope de memoria."""
+        print("\n🔍 Testing Upcoming Task Prefetch...")
+
+        try:
+            project_dir = self._create_project("upcoming_prefetch", {"features": [
+                {"id": "T-001", "description": "Login", "feature": "auth", "agent_assigned": "backend",
+                 "dependencies": [], "passes": False},
+                {"id": "T-002", "description": "Invoices", "feature": "billing", "agent_assigned": "backend",
+                 "dependencies": [], "passes": False},
+                {"id": "T-003", "description": "Refunds", "feature": "billing", "agent_assigned": "backend",
+                 "dependencies": ["T-002"], "passes": False}
+            ]})
+            architecture_root = self._create_architecture(project_dir)
+            billing_dir = architecture_root / "features" / "billing"
+            billing_dir.mkdir(parents=True)
+            (billing_dir / "architecture.yaml").write_text("pattern: ledger\n")
+            (billing_dir / "components.yaml").write_text("components: [InvoiceTable, RefundDialog]\n")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                ready = TaskCoordinator(str(project_dir)).get_available_tasks()
+            injector = ContextInjector(str(project_dir), use_disk_cache=False)
+            warmed = injector.prefetch_upcoming_tasks(ready).result(timeout=30)
+
+            reloads = injector.telemetry["architecture_cache"]["reloads"]
+            hits = injector.telemetry["architecture_cache"]["hits"]
+            billing = injector.load_feature_architecture("billing")
+            if (sorted(warmed) == ["auth", "billing"] and billing is warmed["billing"]
+                    and injector.telemetry["architecture_cache"]["hits"] == hits + 1
+                    and injector.telemetry["architecture_cache"]["reloads"] == reloads
+                    and injector.telemetry["feature_prefetch"] == {"scheduled": 2, "warmed": 2, "errors": 0}):
+                self._log_test("Upcoming Prefetch - Launch Is a Cache Hit", True,
+                               f"architecture_cache={injector.get_telemetry()['architecture_cache']}")
+            else:
+                self._log_test("Upcoming Prefetch - Launch Is a Cache Hit", False, f"telemetry={injector.get_telemetry()}")
+
+            # Con un tope menor que ambas features se expulsa la menos usada junto con sus documentos
+            capped = ContextInjector(str(project_dir), use_disk_cache=False,
+                                     architecture_cache_bytes=injector.telemetry["architecture_cache"]["bytes"] - 1)
+            capped.prefetch_upcoming_tasks(["auth", "billing"]).result(timeout=30)
+            injector.close()
+            capped.close()
+            stats = capped.telemetry["architecture_cache"]
+            auth_documents = [path for path in capped._document_cache if "/features/auth/" in path]
+            if (stats["evictions"] == 1 and stats["entries"] == 1 and stats["bytes"] <= stats["max_bytes"]
+                    and not auth_documents and capped.load_feature_architecture("auth") == warmed["auth"]):
+                self._log_test("Upcoming Prefetch - Memory Cap", True, f"stats={stats}")
+            else:
+                self._log_test("Upcoming Prefetch - Memory Cap", False, f"stats={stats}, auth={auth_documents}")
+
+        except Exception as e:
+            self._log_test("Upcoming Task Prefetch", False, f"Exception: {str(e)}")
+
+    def _test_bounded_architecture_cache(self):
+        """Test 24: Verificar que la caché de arquitectura no crece con el número de features."""
+        print("\n🔍 Testing Bounded Architecture Cache...")
+
+        try:
+            project_dir = self._create_project("bounded_cache", {"features": []})
+            architecture_root = self._create_architecture(project_dir)
+            names = [f"feature{number:02d}" for number in range(30)]
+            for name in names:
+                feature_dir = architecture_root / "features" / name
+                feature_dir.mkdir(parents=True)
+                (feature_dir / "architecture.yaml").write_text(f"pattern: {name}\nlayers: [domain, application]\n")
+                (feature_dir / "components.yaml").write_text(f"components: [{name.title()}Page]\n")
+
+            injector = ContextInjector(str(project_dir), use_disk_cache=False, architecture_cache_entries=5)
+            stats = injector.telemetry["architecture_cache"]
+            resident = []
+            correct = True
+            for _ in range(2):
+                for name in names:
+                    correct = correct and injector.load_feature_architecture(name)["architecture"]["pattern"] == name
+                    resident.append((stats["entries"], len(injector._document_cache)))
+
+            hits = stats["hits"]
+            injector.load_feature_architecture(names[-1])
+            if (correct and max(entries for entries, _ in resident) == 5
+                    and max(documents for _, documents in resident) <= 10
+                    and stats["evictions"] == 55 and stats["hits"] == hits + 1):
+                self._log_test("Bounded Cache - Entry Limit", True, f"stats={injector.get_telemetry()['architecture_cache']}")
+            else:
+                self._log_test("Bounded Cache - Entry Limit", False, f"stats={stats}, resident={resident[-3:]}")
+
+            # Un tope en bytes para ~3 features deja la memoria plana aunque se carguen las 30
+            feature_bytes = stats["bytes"] // stats["entries"]
+            by_size = ContextInjector(str(project_dir), use_disk_cache=False,
+                                      architecture_cache_bytes=feature_bytes * 3, architecture_cache_entries=None)
+            peak = 0
+            for name in names:
+                by_size.load_feature_architecture(name)
+                peak = max(peak, by_size.telemetry["architecture_cache"]["bytes"])
+            size_stats = by_size.telemetry["architecture_cache"]
+            if peak <= size_stats["max_bytes"] and 0 < size_stats["entries"] <= 4 and size_stats["evictions"] >= 26:
+                self._log_test("Bounded Cache - Memory Limit", True, f"peak={peak}/{size_stats['max_bytes']} bytes")
+            else:
+                self._log_test("Bounded Cache - Memory Limit", False, f"peak={peak}, stats={size_stats}")
+
+            # Las recargas de los threads de prefetch se suman bajo el lock de la caché
+            cache = by_size._architecture_cache
+            reloads = size_stats["reloads"]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: [cache.count("reloads") for _ in range(2000)], range(8)))
+            if size_stats["reloads"] == reloads + 16000 and len(cache) == size_stats["entries"]:
+                self._log_test("Bounded Cache - Locked Counters", True)
+            else:
+                self._log_test("Bounded Cache - Locked Counters", False, f"reloads={size_stats['reloads'] - reloads}")
+
+        except Exception as e:
+            self._log_test("Bounded Architecture Cache", False, f"Exception: {str(e)}")
+
+    def _print_test_results(self):
+        """Imprime resumen final de tests."""
+        print("\n" + "=" * 50)
+        print("📊 TEST RESULTS SUMMARY")
+        print("=" * 50)
+
+        passed = sum(1 for test in self.test_results if test["passed"])
+        total = len(self.test_results)
+
+        print(f"✅ Passed: {passed}/{total}")
+        print(f"❌ Failed: {total - passed}/{total}")
+
+        if total - passed > 0:
+            print("\n❌ FAILED TESTS:")
+            for test in self.test_results:
+                if not test["passed"]:
+                    print(f"   - {test['name']}: {test['details']}")
+
+        print(f"\n{'🎉 ALL TESTS PASSED!' if passed == total else '⚠️  SOME TESTS FAILED'}")
+
+
+def main():
+    """Función principal para ejecutar los tests."""
+    tester = HarnessImplementTester()
+    success = tester.run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Architecture Index para el Context Injector
+
+Índices sobre `api-contracts.yaml` y `database-schema.yaml`:
+endpoint (método + path) -> spec, tabla -> columnas/relaciones y
+entidad -> endpoints y tablas que la referencian. Con ellos el injector
+extrae exactamente las sub-specs que un task referencia (un endpoint, una
+tabla) con una búsqueda en diccionario en lugar de enviar el contrato
+completo. El resto de claves de cada documento (convenciones, formatos de
+respuesta, paginación) se conserva tal cual.
+
+Formatos de endpoints admitidos:
+
+    endpoints:                       # lista de dicts
+      - {path: /users, method: GET, entity: user}
+    endpoints:                       # lista de strings
+      - GET /users
+    endpoints:                       # mapping path -> spec o métodos
+      /users: {get: {...}, post: {...}}
+
+Las tablas se leen de `tables` (mapping nombre -> spec o lista de dicts con
+`name`); las relaciones, de `relations`, `references` o `foreign_keys`.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+ANY_METHOD = '*'
+
+# Segmentos que no identifican una entidad al derivarla del path
+NON_ENTITY_SEGMENTS = frozenset({'api', 'rest', 'graphql'})
+
+RELATION_KEYS = ('relations', 'references', 'foreign_keys')
+
+# Campos del task con referencias explícitas y con texto libre
+TASK_REFERENCE_FIELDS = ('endpoints', 'tables', 'entities')
+TASK_TEXT_FIELDS = ('title', 'name', 'description', 'acceptance_criteria', 'steps')
+
+_PARAM_RE = re.compile(r'\{[^/}]*\}|:[^/]+|<[^/>]*>')
+_VERSION_RE = re.compile(r'v\d+')
+_ENDPOINT_REF_RE = re.compile(r'\b(' + '|'.join(HTTP_METHODS) + r')\s+(/[^\s,;)\'"`]*)')
+
+EndpointKey = Tuple[str, str]
+
+
+def normalize_path(path: str) -> str:
+    """Path comparable: sin barra final y con los parámetros anónimos ({id}, :id, <id> -> {})."""
+    path = '/' + str(path).strip().strip('/')
+    return _PARAM_RE.sub('{}', path)
+
+
+def parse_endpoint_reference(reference: str) -> EndpointKey:
+    """'GET /users/{id}' -> ('GET', '/users/{}'); un path sin método vale para todos."""
+    parts = str(reference).split(None, 1)
+    if len(parts) == 2 and parts[0].upper() in HTTP_METHODS:
+        return parts[0].upper(), normalize_path(parts[1])
+    return ANY_METHOD, normalize_path(reference)
+
+
+def singular(name: str) -> str:
+    name = str(name).lower()
+    return name[:-1] if len(name) > 3 and name.endswith('s') and not name.endswith('ss') else name
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+class ArchitectureIndex:
+    """Índices de solo lectura sobre los contratos de API y el esquema de datos."""
+
+    def __init__(self, api_contracts: Optional[Dict[str, Any]], database_schema: Optional[Dict[str, Any]]):
+        self.api_contracts = api_contracts if isinstance(api_contracts, dict) else {}
+        self.database_schema = database_schema if isinstance(database_schema, dict) else {}
+        # (MÉTODO, path normalizado) -> (localizador en el documento, spec)
+        self.endpoints: Dict[EndpointKey, Tuple[Tuple, Any]] = {}
+        self.tables: Dict[str, Any] = {}
+        self.entity_endpoints: Dict[str, List[EndpointKey]] = {}
+        self.entity_tables: Dict[str, List[str]] = {}
+        self.endpoints_key = next((key for key in ('endpoints', 'paths') if key in self.api_contracts), None)
+        self._index_endpoints()
+        self._index_tables()
+
+    def _index_endpoints(self) -> None:
+        collection = self.api_contracts.get(self.endpoints_key) if self.endpoints_key else None
+        if isinstance(collection, dict):
+            for path, spec in collection.items():
+                methods = [key for key in spec if str(key).upper() in HTTP_METHODS] if isinstance(spec, dict) else []
+                if methods:
+                    for method in methods:
+                        self._add_endpoint(str(method).upper(), path, (path, method), spec[method])
+                else:
+                    method = spec.get('method') if isinstance(spec, dict) else None
+                    self._add_endpoint(str(method or ANY_METHOD).upper(), path, (path, None), spec)
+        elif isinstance(collection, list):
+            for position, item in enumerate(collection):
+                if isinstance(item, dict) and 'path' in item:
+                    method, path = str(item.get('method') or ANY_METHOD).upper(), item['path']
+                elif isinstance(item, str):
+                    method, path = parse_endpoint_reference(item)
+                else:
+                    continue
+                self._add_endpoint(method, path, (position,), item)
+
+    def _add_endpoint(self, method: str, path: str, locator: Tuple, spec: Any) -> None:
+        key = (method, normalize_path(path))
+        self.endpoints[key] = (locator, spec)
+
+        entities = []
+        if isinstance(spec, dict):
+            entities = _as_list(spec.get('entity')) + _as_list(spec.get('entities'))
+        if not entities:
+            # Sin entidad declarada: el primer segmento estático del path (/api/v1/orders/{id} -> order)
+            segments = [segment for segment in key[1].split('/')
+                        if segment and segment != '{}' and segment not in NON_ENTITY_SEGMENTS
+                        and not _VERSION_RE.fullmatch(segment)]
+            entities = segments[:1]
+        for entity in entities:
+            self.entity_endpoints.setdefault(singular(entity), []).append(key)
+
+    def _index_tables(self) -> None:
+        tables = self.database_schema.get('tables')
+        if isinstance(tables, dict):
+            items = tables.items()
+        elif isinstance(tables, list):
+            items = [(item['name'], item) for item in tables if isinstance(item, dict) and 'name' in item]
+        else:
+            items = []
+
+        for name, spec in items:
+            self.tables[str(name)] = spec
+            entities = {singular(name)}
+            if isinstance(spec, dict) and spec.get('entity'):
+                entities.add(singular(spec['entity']))
+            for entity in entities:
+                self.entity_tables.setdefault(entity, []).append(str(name))
+
+    def endpoint(self, reference: str) -> List[Any]:
+        """Specs de un endpoint ('GET /users/{id}'); un path sin método devuelve todos sus métodos."""
+        return [self.endpoints[key][1] for key in self._match_endpoint(reference)]
+
+    def table(self, name: str) -> Optional[Dict[str, Any]]:
+        """Columnas y relaciones de una tabla (None si no existe)."""
+        if name not in self.tables:
+            return None
+        spec = self.tables[name]
+        columns = spec.get('columns') if isinstance(spec, dict) else spec
+        relations = []
+        if isinstance(spec, dict):
+            for key in RELATION_KEYS:
+                relations += _as_list(spec.get(key))
+        return {'columns': columns, 'relations': relations}
+
+    def entity(self, name: str) -> Dict[str, List[str]]:
+        """Endpoints ('MÉTODO path' del documento) y tablas que referencian una entidad."""
+        entity = singular(name)
+        return {
+            'endpoints': [self._display(key) for key in self.entity_endpoints.get(entity, [])],
+            'tables': list(self.entity_tables.get(entity, []))
+        }
+
+    def _match_endpoint(self, reference: str) -> List[EndpointKey]:
+        method, path = parse_endpoint_reference(reference)
+        if method != ANY_METHOD:
+            return [key for key in ((method, path), (ANY_METHOD, path)) if key in self.endpoints]
+        return [key for key in self.endpoints if key[1] == path]
+
+    def _display(self, key: EndpointKey) -> str:
+        locator, spec = self.endpoints[key]
+        if isinstance(spec, str) and len(locator) == 1:
+            return spec
+        path = locator[0] if len(locator) == 2 else spec['path']
+        return f"{key[0]} {path}" if key[0] != ANY_METHOD else str(path)
+
+    def references(self, task: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Referencias de un task: las declaradas en `endpoints`, `tables` y
+        `entities` más los 'MÉTODO /path' que aparezcan en su texto.
+        """
+        references = {field: [str(value) for value in _as_list(task.get(field))] for field in TASK_REFERENCE_FIELDS}
+        for field in TASK_TEXT_FIELDS:
+            for value in _as_list(task.get(field)):
+                references['endpoints'] += [f"{method} {path.rstrip('.')}" for method, path in _ENDPOINT_REF_RE.findall(str(value))]
+        return {field: list(dict.fromkeys(values)) for field, values in references.items()}
+
+    def extract(self, endpoints: Iterable[str] = (), tables: Iterable[str] = (),
+                entities: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Sub-documentos con solo lo referenciado, en la misma forma que los originales.
+
+        Una entidad arrastra sus endpoints y tablas. Las claves de cada
+        documento que no son la colección indexada se conservan.
+
+        Returns:
+            {'api_contracts': ..., 'database_schema': ..., 'unresolved': [...]}
+            (cada documento solo si alguna referencia lo tocó)
+        """
+        endpoint_keys, table_names, unresolved = [], [], []
+        for reference in endpoints:
+            matched = self._match_endpoint(reference)
+            endpoint_keys += matched
+            if not matched:
+                unresolved.append(reference)
+        for name in tables:
+            if name in self.tables:
+                table_names.append(name)
+            else:
+                unresolved.append(name)
+        for name in entities:
+            entity = singular(name)
+            if entity not in self.entity_endpoints and entity not in self.entity_tables:
+                unresolved.append(name)
+            endpoint_keys += self.entity_endpoints.get(entity, [])
+            table_names += self.entity_tables.get(entity, [])
+
+        extracted: Dict[str, Any] = {'unresolved': unresolved}
+        if endpoint_keys:
+            extracted['api_contracts'] = dict(self.api_contracts, **{
+                self.endpoints_key: self._select_endpoints(dict.fromkeys(endpoint_keys))})
+        if table_names:
+            selected = set(table_names)
+            source = self.database_schema['tables']
+            if isinstance(source, dict):
+                narrowed = {name: spec for name, spec in source.items() if str(name) in selected}
+            else:
+                narrowed = [item for item in source if isinstance(item, dict) and str(item.get('name')) in selected]
+            extracted['database_schema'] = dict(self.database_schema, tables=narrowed)
+        return extracted
+
+    def _select_endpoints(self, keys: Iterable[EndpointKey]) -> Any:
+        """Colección de endpoints reducida a `keys`, en el orden y la forma del documento."""
+        locators = [self.endpoints[key][0] for key in keys]
+        source = self.api_contracts[self.endpoints_key]
+        if isinstance(source, list):
+            return [source[position] for position in sorted({locator[0] for locator in locators})]
+
+        wanted: Dict[Any, Optional[set]] = {}
+        for path, method in locators:
+            if method is None:
+                wanted[path] = None
+            elif wanted.get(path, set()) is not None:
+                wanted.setdefault(path, set()).add(method)
+        narrowed = {}
+        for path, spec in source.items():
+            if path not in wanted:
+                continue
+            methods = wanted[path]
+            narrowed[path] = spec if methods is None else {
+                key: value for key, value in spec.items() if key in methods or str(key).upper() not in HTTP_METHODS}
+        return narrowed
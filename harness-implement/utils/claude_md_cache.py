@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Claude.md Cache para el Context Injector
+
+El resultado de parsear claude.md se memoiza en proceso y se persiste en
+`.harness/.cache/claude_md/<sha256>.json`, con el hash del contenido como
+clave: cualquier proceso (cada agente, el orquestador o un validador)
+que lea el mismo claude.md reutiliza el parseo en lugar de repetirlo. Se
+guarda en JSON para que herramientas fuera de Python puedan leerlo.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from .file_io import atomic_write_text, stat_signature
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_text, stat_signature
+
+# Subir la versión cuando cambien los extractores: las entradas viejas dejan de valer
+PARSER_VERSION = 3
+
+
+class ClaudeMdCache:
+    """
+    Parseos de claude.md por hash de contenido, en memoria y en disco.
+
+    En un mismo proceso, si el stat del fichero no cambió ni siquiera se
+    vuelve a leer; si cambió, se lee y se hashea antes de decidir si hay
+    que parsear.
+    """
+
+    def __init__(self, cache_dir: Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'write_errors': 0}
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+        # Ruta -> (firma stat, sha256) de la última lectura
+        self._hashes: Dict[Path, Tuple[Any, str]] = {}
+
+    def load(self, file_path: Path, parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Devuelve el parseo de `file_path`, reutilizándolo si el contenido ya se parseó.
+
+        Args:
+            file_path: Ruta de claude.md
+            parse: Función que parsea el contenido (texto) en un dict
+
+        Returns:
+            Dict con la información estructurada extraída
+        """
+        file_path = Path(file_path)
+        signature = stat_signature(file_path)
+        known = self._hashes.get(file_path)
+        if known and signature is not None and known[0] == signature and known[1] in self._parsed:
+            self.stats['memory_hits'] += 1
+            return self._parsed[known[1]]
+
+        raw = file_path.read_bytes()
+        content_hash = hashlib.sha256(raw).hexdigest()
+        self._hashes[file_path] = (signature, content_hash)
+
+        if content_hash in self._parsed:
+            self.stats['memory_hits'] += 1
+            return self._parsed[content_hash]
+
+        parsed = self._read_entry(content_hash)
+        if parsed is not None:
+            self.stats['disk_hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            # Como read_text(): los extractores no deben ver '\r' de ficheros CRLF o CR
+            text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            parsed = parse(text)
+            self._write_entry(content_hash, parsed)
+
+        self._parsed[content_hash] = parsed
+        return parsed
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.json"
+
+    def _read_entry(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._entry_path(content_hash), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(entry, dict) or entry.get('parser_version') != PARSER_VERSION
+                or entry.get('sha256') != content_hash):
+            return None
+        return entry.get('parsed')
+
+    def _write_entry(self, content_hash: str, parsed: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        entry = {'parser_version': PARSER_VERSION, 'sha256': content_hash, 'parsed': parsed}
+        try:
+            atomic_write_text(str(self._entry_path(content_hash)), json.dumps(entry, ensure_ascii=False))
+        except (OSError, TypeError, ValueError):
+            # La caché es una optimización: sin entrada en disco el siguiente proceso vuelve a parsear
+            self.stats['write_errors'] += 1
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Claude.md Index para el Context Injector
+
+Índice de claude.md construido en una sola pasada: un único `finditer`
+multilínea localiza las líneas estructurales (headings y vallas de código)
+y con ellas se arma el árbol de secciones (`##`, `###`, ...) con sus
+offsets y la lista de bloques de código cercados. Los bullets y los
+`**labels**` de una sección se indexan la primera vez que se consultan,
+buscando solo dentro de su rango de offsets, así que el coste total es
+lineal en el tamaño del fichero en lugar de una regex `DOTALL` sobre el
+texto completo por cada campo extraído.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+
+# Líneas estructurales: heading (grupos 1-2) o valla de código (grupo 3). Se
+# buscan tras un '\n' literal y no con '^' multilínea: el motor de regex salta
+# así directamente de salto de línea en salto de línea
+STRUCTURE_LINE_RE = re.compile(r'(?:(#{1,6}) (.*)|(```|~~~).*)')
+STRUCTURE_RE = re.compile(r'\n' + STRUCTURE_LINE_RE.pattern)
+BULLET_RE = re.compile(r'\n- (.+)')
+# `**label**: valor`; el valor puede ir en la siguiente línea no vacía. Los dos
+# puntos, si están, se consumen siempre: con `:?` la regex retrocedía y
+# devolvía ':' como valor cuando este iba en la línea siguiente
+LABEL_RE = re.compile(r'\*\*(.+?)\*\*(?=(?::|(?!:))\s*(\S.*))')
+TIMESTAMP_MARKER = 'Última actualización:'
+
+TitleQuery = Union[str, Pattern]
+
+
+def _title_matches(title: str, query: TitleQuery) -> bool:
+    if isinstance(query, str):
+        return title.startswith(query)
+    return query.search(title) is not None
+
+
+class MarkdownSection:
+    """
+    Sección de claude.md delimitada por su heading.
+
+    El cuerpo va desde el final de la línea del heading hasta el siguiente
+    heading de nivel igual o superior (las subsecciones forman parte de él).
+    """
+
+    def __init__(self, index: 'ClaudeMdIndex', level: int, title: str, start: int, body_start: int):
+        self.index = index
+        self.level = level
+        self.title = title
+        self.start = start
+        self.body_start = body_start
+        self.end = len(index.content)
+        self.children: List['MarkdownSection'] = []
+        self._labels: Optional[Dict[str, str]] = None
+
+    @property
+    def text(self) -> str:
+        return self.index.content[self.body_start:self.end].strip()
+
+    def subsection(self, title: TitleQuery) -> Optional['MarkdownSection']:
+        """Primera subsección directa cuyo título empieza por `title` (o casa con la regex)."""
+        for child in self.children:
+            if child.level == self.level + 1 and _title_matches(child.title, title):
+                return child
+        return None
+
+    def label(self, name: str) -> Optional[str]:
+        """Valor de la primera aparición de `**name**: valor` dentro de la sección."""
+        if self._labels is None:
+            self._labels = {}
+            for match in LABEL_RE.finditer(self.index.content, self.body_start, self.end):
+                if not self.index.in_code_block(match.start()):
+                    self._labels.setdefault(match.group(1), match.group(2).strip())
+        return self._labels.get(name)
+
+    def bullets(self) -> List[str]:
+        """Bullets `- ...` de la sección (subsecciones incluidas, bloques de código excluidos)."""
+        return [match.group(1).strip()
+                for match in BULLET_RE.finditer(self.index.content, self.body_start, self.end)
+                if not self.index.in_code_block(match.start() + 1)]
+
+    def code_blocks(self) -> List[str]:
+        """Contenido de los bloques de código cercados de la sección."""
+        blocks = self.index.code_blocks
+        first = bisect_left(blocks, (self.body_start,))
+        last = bisect_left(blocks, (self.end,), lo=first)
+        return [self.index.content[body_start:body_end].strip() for _, _, body_start, body_end in blocks[first:last]]
+
+
+class ClaudeMdIndex:
+    """Índice de secciones y bloques de código de claude.md."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.root = MarkdownSection(self, 0, '', 0, 0)
+        self.sections: List[MarkdownSection] = []
+        # (inicio valla, fin valla de cierre, inicio contenido, fin contenido)
+        self.code_blocks: List[Tuple[int, int, int, int]] = []
+        self._code_starts: List[int] = []
+        self.last_updated = self._find_last_updated()
+        self._build()
+
+    def section(self, title: TitleQuery, level: int = 2) -> Optional[MarkdownSection]:
+        """Primera sección de `level` cuyo título empieza por `title` (o casa con la regex)."""
+        for section in self.sections:
+            if section.level == level and _title_matches(section.title, title):
+                return section
+        return None
+
+    def in_code_block(self, offset: int) -> bool:
+        position = bisect_right(self._code_starts, offset) - 1
+        return position >= 0 and offset < self.code_blocks[position][1]
+
+    def _build(self) -> None:
+        stack = [self.root]
+        fence: Optional[Tuple[str, int, int]] = None
+
+        for line_start, match in self._structural_lines():
+            marker = match.group(3)
+            if fence is not None:
+                # Dentro de un bloque de código solo cuenta la valla de cierre
+                if marker == fence[0]:
+                    self.code_blocks.append((fence[1], match.end(), fence[2], line_start))
+                    self._code_starts.append(fence[1])
+                    fence = None
+                continue
+            if marker:
+                fence = (marker, line_start, match.end() + 1)
+                continue
+
+            level = len(match.group(1))
+            while stack[-1].level >= level:
+                stack.pop().end = line_start
+            # El cuerpo empieza en el '\n' que cierra el heading
+            section = MarkdownSection(self, level, match.group(2).strip(), line_start, match.end())
+            stack[-1].children.append(section)
+            stack.append(section)
+            self.sections.append(section)
+
+    def _structural_lines(self):
+        first = STRUCTURE_LINE_RE.match(self.content)
+        if first:
+            yield 0, first
+        for match in STRUCTURE_RE.finditer(self.content):
+            yield match.start() + 1, match
+
+    def _find_last_updated(self) -> Optional[str]:
+        position = self.content.find(TIMESTAMP_MARKER)
+        if position < 0:
+            return None
+        line_end = self.content.find('\n', position)
+        value = self.content[position + len(TIMESTAMP_MARKER):line_end if line_end >= 0 else None].strip()
+        return value or None
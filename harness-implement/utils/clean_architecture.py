@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Clean Architecture Patterns para el Context Injector
+
+Las tablas de capas, guidelines por agente, integraciones por framework y
+patrones por lenguaje se leen de `templates/clean-architecture.yaml` (más
+la extensión opcional del proyecto en
+`.harness/clean-architecture-patterns.yaml`), se congelan en estructuras
+de solo lectura y el contexto de cada (agente, lenguajes, frameworks) se
+compone una sola vez. Solo se recargan si alguno de los dos ficheros cambia.
+
+Se congela con subclases de dict/list y no con MappingProxyType/tuplas:
+el contexto se serializa con json.dumps en bundles, blobs, deltas y en los
+propios agentes, y así sigue siendo JSON y comparando igual que un dict.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, NoReturn, Optional, Tuple
+
+try:
+    from .file_io import stat_signature
+    from .yaml_cache import parse_yaml
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import stat_signature
+    from yaml_cache import parse_yaml
+
+DEFAULT_PATTERNS_PATH = Path(__file__).parent.parent / "templates" / "clean-architecture.yaml"
+PROJECT_PATTERNS_FILE = ".harness/clean-architecture-patterns.yaml"
+
+
+def _read_only(self, *args, **kwargs) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is shared and read-only; copy it with dict()/list() to modify")
+
+
+class FrozenDict(dict):
+    """dict de solo lectura (copy/deepcopy/pickle devuelven un dict normal)."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """list de solo lectura (copy/deepcopy/pickle devuelven una list normal)."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Copia profunda de solo lectura de una estructura de dicts y listas."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(child)) for key, child in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+EMPTY = FrozenDict()
+
+
+def _merge(base: Dict, override: Dict) -> Dict:
+    """Fusión recursiva de mappings; el resto de valores (listas incluidas) se sustituyen."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class CleanArchitecturePatterns:
+    """Tablas congeladas de Clean Architecture y contextos compuestos memoizados."""
+
+    def __init__(self, project_root: Path, defaults_path: Path = DEFAULT_PATTERNS_PATH):
+        self.defaults_path = Path(defaults_path)
+        self.extension_path = Path(project_root) / PROJECT_PATTERNS_FILE
+        self.stats = {'composed': 0, 'memo_hits': 0}
+        self._signatures: Optional[Tuple] = None
+        self._tables: Dict[str, Any] = EMPTY
+        self._composed: Dict[Tuple, Dict[str, Any]] = {}
+
+    def context_for(self, agent_type: str, project_analysis: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Contexto de Clean Architecture para un agente (compartido y de solo lectura).
+
+        Args:
+            agent_type: Tipo de agente
+            project_analysis: Análisis del proyecto (lenguajes y frameworks detectados)
+
+        Returns:
+            Dict congelado con capas, foco del agente y patrones aplicables
+        """
+        tables = self.tables()
+        agent = tables['agents'].get(agent_type, EMPTY)
+        integrations = agent.get('framework_integration', EMPTY)
+
+        # La clave solo incluye lo que cambia el resultado: así proyectos con
+        # distintos frameworks irrelevantes para el agente comparten entrada
+        if project_analysis:
+            frameworks = project_analysis.get('frameworks', {})
+            languages = project_analysis.get('languages', {})
+            framework = next((name for name in integrations if name in frameworks), None)
+            detected = tuple(name for name in tables['language_patterns'] if name in languages)
+        else:
+            framework, detected = None, None
+        key = (agent_type, detected, framework)
+
+        composed = self._composed.get(key)
+        if composed is not None:
+            self.stats['memo_hits'] += 1
+            return composed
+
+        context = {
+            'architecture_type': tables['architecture_type'],
+            'layers': tables['layers']
+        }
+        if 'focus_layers' in agent:
+            context['focus_layers'] = agent['focus_layers']
+        if 'agent_guidelines' in agent:
+            context['agent_guidelines'] = agent['agent_guidelines']
+        if framework:
+            context['framework_integration'] = FrozenDict({framework: integrations[framework]})
+        if detected is not None:
+            context['language_patterns'] = FrozenDict(
+                (name, tables['language_patterns'][name]) for name in detected)
+
+        self.stats['composed'] += 1
+        self._composed[key] = composed = FrozenDict(context)
+        return composed
+
+    def tables(self) -> Dict[str, Any]:
+        """Tablas congeladas (se recargan si la plantilla o la extensión del proyecto cambian)."""
+        signatures = (stat_signature(self.defaults_path), stat_signature(self.extension_path))
+        if signatures != self._signatures:
+            self._load()
+            self._signatures = signatures
+        return self._tables
+
+    def _load(self) -> None:
+        tables = _merge(self._read(self.defaults_path), self._read(self.extension_path))
+        tables.pop('version', None)
+        tables.setdefault('architecture_type', 'clean_hexagonal')
+        for section in ('layers', 'agents', 'language_patterns'):
+            tables[section] = tables.get(section) or {}
+        self._tables = freeze(tables)
+        self._composed = {}
+
+    @staticmethod
+    def _read(path: Path) -> Dict:
+        if not path.exists():
+            return {}
+        tables = parse_yaml(path.read_bytes()) or {}
+        if not isinstance(tables, dict):
+            raise ValueError(f"Invalid clean architecture patterns in {path}: expected a mapping")
+        return tables
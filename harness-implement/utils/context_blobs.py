@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Context Blobs para el Context Injector
+
+Almacén direccionado por contenido en `.harness/.cache/blobs/`: cada
+sección grande de un contexto se serializa una vez, se guarda como
+`<sha256>.json` y el contexto la referencia como `{"$blob": "<sha256>"}`.
+Los agentes de un mismo grupo comparten así cross-cutting, api_contracts
+o claude.md en disco en lugar de recibir una copia cada uno;
+`resolve_context` devuelve la vista materializada.
+
+Reescribir un blob existente solo renueva su mtime, así que `prune`
+puede borrar por antigüedad los que ningún lote reciente ha usado.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+try:
+    from .file_io import atomic_write_bytes
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_bytes
+
+BLOB_KEY = '$blob'
+
+# Valores más pequeños se dejan en línea: la referencia costaría casi lo mismo
+MIN_BLOB_BYTES = 512
+
+# Profundidad máxima a la que se extraen blobs (sección y sus hijos directos,
+# p.ej. global_architecture.api_contracts)
+MAX_BLOB_DEPTH = 2
+
+# Antigüedad por defecto a partir de la cual `prune` borra un blob sin uso
+DEFAULT_BLOB_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Un proceso largo renueva el mtime de los blobs que ya conoce como mucho cada hora
+TOUCH_INTERVAL_SECONDS = 3600
+
+
+def is_blob_reference(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_KEY in value
+
+
+def _serialize(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+class BlobStore:
+    """Blobs JSON inmutables identificados por el sha256 de su serialización."""
+
+    def __init__(self, blobs_dir: Path):
+        self.blobs_dir = Path(blobs_dir)
+        self.stats = {'written': 0, 'deduplicated': 0, 'bytes_written': 0, 'memo_hits': 0,
+                      'pruned': 0, 'bytes_pruned': 0}
+        # digest -> momento en que este proceso lo escribió o renovó
+        self._known: Dict[str, float] = {}
+        self._resolved: Dict[str, Any] = {}
+
+    def put(self, serialized: bytes) -> str:
+        """Guarda un blob ya serializado (si no existía) y devuelve su digest."""
+        digest = hashlib.sha256(serialized).hexdigest()
+        now = time.time()
+        if now - self._known.get(digest, float('-inf')) < TOUCH_INTERVAL_SECONDS:
+            self.stats['deduplicated'] += 1
+            return digest
+
+        path = self._blob_path(digest)
+        if path.exists():
+            self.stats['deduplicated'] += 1
+            # Renovar el mtime: el blob sigue en uso y `prune` no debe borrarlo
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        else:
+            atomic_write_bytes(str(path), serialized)
+            self.stats['written'] += 1
+            self.stats['bytes_written'] += len(serialized)
+        self._known[digest] = now
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """Carga un blob por digest (los blobs son inmutables: se cachean en memoria)."""
+        if digest not in self._resolved:
+            with open(self._blob_path(digest), 'rb') as f:
+                self._resolved[digest] = json.loads(f.read())
+        return self._resolved[digest]
+
+    def encoder(self) -> 'BlobEncoder':
+        """Encoder para un lote: memoiza la serialización por identidad de objeto."""
+        return BlobEncoder(self)
+
+    def resolve(self, value: Any) -> Any:
+        """Sustituye recursivamente las referencias `{"$blob": ...}` por su contenido."""
+        if is_blob_reference(value):
+            return self.resolve(self.get(value[BLOB_KEY]))
+        if isinstance(value, dict):
+            return {key: self.resolve(child) for key, child in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def prune(self, max_age_seconds: float = DEFAULT_BLOB_MAX_AGE_SECONDS) -> Dict[str, int]:
+        """
+        Borra los blobs que ningún lote ha escrito ni reutilizado en `max_age_seconds`.
+
+        Un contexto emitido antes del corte puede dejar de resolverse: se
+        asume que los agentes materializan su contexto al arrancar.
+
+        Returns:
+            {'removed': n, 'bytes_freed': n, 'kept': n}
+        """
+        cutoff = time.time() - max_age_seconds
+        result = {'removed': 0, 'bytes_freed': 0, 'kept': 0}
+        if not self.blobs_dir.is_dir():
+            return result
+
+        for shard in self.blobs_dir.iterdir():
+            if not shard.is_dir():
+                continue
+            for path in shard.glob('*.json'):
+                try:
+                    stat = path.stat()
+                    if stat.st_mtime >= cutoff:
+                        result['kept'] += 1
+                        continue
+                    path.unlink()
+                except OSError:
+                    # Borrado por otro proceso a la vez
+                    continue
+                result['removed'] += 1
+                result['bytes_freed'] += stat.st_size
+                self._known.pop(path.stem, None)
+                self._resolved.pop(path.stem, None)
+            try:
+                shard.rmdir()
+            except OSError:
+                # Quedan blobs en el directorio
+                pass
+
+        self.stats['pruned'] += result['removed']
+        self.stats['bytes_pruned'] += result['bytes_freed']
+        return result
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / f"{digest}.json"
+
+
+class BlobEncoder:
+    """
+    Convierte contextos en referencias a blobs.
+
+    Los contextos de un lote comparten objetos (el mismo dict de
+    cross-cutting o de api_contracts en varios agentes), así que se
+    memoiza por `id()` y cada objeto se serializa una sola vez. Se guarda
+    una referencia a cada objeto memoizado para que su id no se reutilice
+    mientras viva el encoder.
+    """
+
+    def __init__(self, store: BlobStore):
+        self.store = store
+        self._memo: Dict[int, Tuple[Any, Any]] = {}
+
+    def encode_context(self, context: Dict[str, Any], inline_keys=('agent_type', 'task_id')) -> Dict[str, Any]:
+        """Devuelve el contexto con sus secciones grandes sustituidas por referencias."""
+        return {key: value if key in inline_keys else self.encode(value) for key, value in context.items()}
+
+    def encode(self, value: Any, depth: int = 0) -> Any:
+        if not isinstance(value, (dict, list)):
+            return value
+
+        memoized = self._memo.get(id(value))
+        if memoized is not None:
+            self.store.stats['memo_hits'] += 1
+            return memoized[1]
+
+        encoded = value
+        if isinstance(value, dict) and depth + 1 < MAX_BLOB_DEPTH:
+            encoded = {key: self.encode(child, depth + 1) for key, child in value.items()}
+
+        serialized = _serialize(encoded)
+        if len(serialized) >= MIN_BLOB_BYTES:
+            encoded = {BLOB_KEY: self.store.put(serialized)}
+
+        self._memo[id(value)] = (value, encoded)
+        return encoded
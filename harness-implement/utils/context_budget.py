@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Context Budget para el Context Injector
+
+Estimación rápida de tokens y ensamblado del contexto inyectado dentro de
+un presupuesto: las secciones se incluyen por orden de prioridad y las
+que no caben enteras se recortan (listas y textos) o se resumen (claves
+omitidas), de modo que el agente recibe primero lo esencial del task.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Heurística habitual para texto/JSON en inglés y español: ~4 caracteres por token
+CHARS_PER_TOKEN = 4
+ESTIMATOR_NAME = 'compact_json_chars/4'
+
+# Claves del sobre que siempre se envían completas
+ENVELOPE_KEYS = ('agent_type', 'task_id', 'methodology')
+
+# Orden de prioridad de las secciones; lo no listado va al final en su orden original
+SECTION_PRIORITY = (
+    'task_details',
+    'feature_architecture',
+    'global_architecture',
+    'cross_cutting_concerns',
+    'project_context',
+    'clean_architecture_patterns',
+    'project_analysis',
+    'project_info'
+)
+
+TRUNCATED_KEY = '_truncated'
+
+# Centinela de "no cabe": None es un valor legítimo en el contexto
+OMITTED = object()
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estima los tokens de un valor por la longitud de su JSON compacto."""
+    encoded = json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+    return -(-len(encoded) // CHARS_PER_TOKEN)
+
+
+def _shrink(value: Any, budget: int, cost: Optional[int] = None) -> Tuple[Any, int, bool]:
+    """
+    Reduce `value` para que quepa en `budget` tokens.
+
+    Returns:
+        (valor reducido u OMITTED si no cabe nada, tokens estimados, si se recortó)
+    """
+    if cost is None:
+        cost = estimate_tokens(value)
+    if cost <= budget:
+        return value, cost, False
+    if budget <= 0:
+        return OMITTED, 0, True
+
+    if isinstance(value, dict):
+        kept, used, omitted = {}, 1, []
+        for key, child in value.items():
+            key_cost = estimate_tokens(key) + 1
+            child, child_cost, _ = _shrink(child, budget - used - key_cost)
+            if child is OMITTED:
+                omitted.append(key)
+                continue
+            kept[key] = (child, key_cost + child_cost)
+            used += key_cost + child_cost
+
+        # El marcador con las claves omitidas también consume presupuesto
+        order = {key: index for index, key in enumerate(value)}
+        while kept and used + estimate_tokens({TRUNCATED_KEY: {'omitted_keys': omitted}}) > budget:
+            key, (_, child_cost) = kept.popitem()
+            omitted.append(key)
+            omitted.sort(key=order.get)
+            used -= child_cost
+
+        result = {key: child for key, (child, _) in kept.items()}
+        result[TRUNCATED_KEY] = {'omitted_keys': omitted}
+        result_cost = estimate_tokens(result)
+        return (result, result_cost, True) if result_cost <= budget else (OMITTED, 0, True)
+
+    if isinstance(value, list):
+        kept, used = [], 1
+        marker_cost = estimate_tokens(f"... {len(value)} more items")
+        for index, item in enumerate(value):
+            item_cost = estimate_tokens(item) + 1
+            if used + item_cost + marker_cost > budget:
+                if index == 0:
+                    # Una lista con solo el marcador no aporta nada
+                    return OMITTED, 0, True
+                kept.append(f"... {len(value) - index} more items")
+                break
+            kept.append(item)
+            used += item_cost
+        kept_cost = estimate_tokens(kept)
+        return (kept, kept_cost, True) if kept_cost <= budget else (OMITTED, 0, True)
+
+    if isinstance(value, str):
+        # El escapado JSON (comillas, saltos de línea) ocupa más de un carácter:
+        # se parte de la estimación por caracteres y se busca por bisección el
+        # prefijo más largo que cabe de verdad
+        low, high = 0, min(len(value), budget * CHARS_PER_TOKEN - 8)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if estimate_tokens(value[:middle] + "...") <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        if low <= 0:
+            return OMITTED, 0, True
+        truncated = value[:low] + "..."
+        return truncated, estimate_tokens(truncated), True
+
+    # Números, booleanos y None: o caben o no
+    return OMITTED, 0, True
+
+
+def fit_context_to_budget(context: Dict[str, Any], token_budget: int) -> Dict[str, Any]:
+    """
+    Ensambla el contexto por prioridad dentro de `token_budget` tokens.
+
+    Las claves del sobre (agent_type, task_id, methodology) siempre se
+    incluyen. Cada sección se añade completa si cabe; si no, se recorta
+    con lo que queda de presupuesto y, si ya no queda nada, se omite. Los
+    metadatos de 'context_budget' también cuentan: antes de repartir se
+    reserva su tamaño máximo, así que el sobre más los metadatos son el
+    presupuesto mínimo que se puede cumplir.
+
+    Args:
+        context: Contexto completo ya filtrado para el agente
+        token_budget: Presupuesto máximo aproximado de tokens
+
+    Returns:
+        Nuevo dict de contexto con la clave 'context_budget' (metadatos)
+    """
+    ordered: List[str] = [key for key in SECTION_PRIORITY if key in context]
+    ordered += [key for key in context if key not in ordered and key not in ENVELOPE_KEYS]
+
+    fitted = {key: context[key] for key in ENVELOPE_KEYS if key in context}
+    used = estimate_tokens(fitted)
+    sections = {}
+
+    # Cota superior de los metadatos: todas las secciones recortadas y con su tamaño original
+    metadata_reserve = estimate_tokens('context_budget') + 1 + estimate_tokens(_budget_metadata(
+        token_budget, token_budget,
+        {key: {'tokens': estimate_tokens(context[key]), 'original_tokens': estimate_tokens(context[key]),
+               'status': 'truncated'} for key in ordered}))
+    available = token_budget - metadata_reserve
+
+    for key in ordered:
+        cost = estimate_tokens(context[key])
+        remaining = available - used - (estimate_tokens(key) + 1)
+        value, value_cost, truncated = _shrink(context[key], remaining, cost)
+        if value is OMITTED:
+            sections[key] = {'tokens': 0, 'original_tokens': cost, 'status': 'omitted'}
+            continue
+        fitted[key] = value
+        used += estimate_tokens(key) + 1 + value_cost
+        sections[key] = {
+            'tokens': value_cost,
+            'original_tokens': cost,
+            'status': 'truncated' if truncated else 'full'
+        }
+
+    # El total incluye los propios metadatos (token_budget acota los dígitos del total)
+    metadata_key_cost = estimate_tokens('context_budget') + 1
+    estimated = used + metadata_key_cost + estimate_tokens(_budget_metadata(token_budget, token_budget, sections))
+    if estimated > token_budget:
+        # Solo el sobre puede pasarse del presupuesto; el total tiene entonces más dígitos
+        estimated = used + metadata_key_cost + estimate_tokens(_budget_metadata(token_budget, estimated, sections))
+    fitted['context_budget'] = _budget_metadata(token_budget, estimated, sections)
+    return fitted
+
+
+def _budget_metadata(token_budget: int, estimated_tokens: int, sections: Dict[str, Dict]) -> Dict[str, Any]:
+    return {
+        'token_budget': token_budget,
+        'estimated_tokens': estimated_tokens,
+        'estimator': ESTIMATOR_NAME,
+        'sections': sections,
+        'omitted': [key for key, info in sections.items() if info['status'] == 'omitted'],
+        'truncated': [key for key, info in sections.items() if info['status'] == 'truncated']
+    }
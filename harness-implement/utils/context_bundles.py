@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Context Bundles para el Context Injector
+
+La mayor parte de un contexto inyectado es igual para todos los tasks de un
+mismo tipo de agente: arquitectura global proyectada, cross-cutting,
+patrones de clean architecture, project info, análisis del proyecto y
+claude.md. Ese bloque se materializa en
+`.harness/.cache/bundles/<agente>.marshal` junto a la huella de sus entradas
+y solo se reconstruye cuando alguna cambia.
+
+Se guarda con marshal y la codificación de fechas de yaml_cache, no en
+JSON: un bundle leído de disco debe ser idéntico al recién construido
+(fechas de YAML como `datetime.date`, claves int como los códigos HTTP).
+"""
+
+import re
+import json
+import marshal
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    from .file_io import atomic_write_bytes, stat_signature
+    from .yaml_cache import from_marshal, to_marshal
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_bytes, stat_signature
+    from yaml_cache import from_marshal, to_marshal
+
+# Subir la versión invalida los bundles existentes (cambio de forma o de formato)
+BUNDLE_FORMAT_VERSION = 2
+
+# Secciones del contexto que viven en el bundle (en el orden del contexto final)
+BUNDLE_SECTIONS = (
+    'global_architecture',
+    'cross_cutting_concerns',
+    'project_info',
+    'project_analysis',
+    'project_context',
+    'clean_architecture_patterns',
+    'methodology'
+)
+
+
+def bundle_fingerprint(agent_type: str, input_paths: Iterable[Path], extra: Any = None) -> str:
+    """
+    Huella de las entradas de un bundle: stat de cada fichero más datos extra.
+
+    Args:
+        agent_type: Tipo de agente del bundle
+        input_paths: Ficheros de los que depende el bundle (existan o no)
+        extra: Otros valores que afectan al bundle (p.ej. huella del proyecto)
+    """
+    payload = {
+        'version': BUNDLE_FORMAT_VERSION,
+        'agent_type': agent_type,
+        'inputs': [[str(path), stat_signature(path)] for path in input_paths],
+        'extra': extra
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class BundleStore:
+    """
+    Bundles por tipo de agente, en memoria y en disco.
+
+    La copia en memoria evita releer el fichero en un injector longevo; la de
+    disco sirve a procesos nuevos (cada agente lanzado por el orquestador).
+    El fichero contiene dos objetos marshal: la cabecera (versión, agente,
+    huella) y el bundle.
+    """
+
+    def __init__(self, bundles_dir: Path, enabled: bool = True):
+        self.bundles_dir = Path(bundles_dir)
+        self.enabled = enabled
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'rebuilds': 0, 'write_errors': 0}
+        self._memory: Dict[str, tuple] = {}
+
+    def load(self, agent_type: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el bundle vigente de `agent_type`, o None si hay que reconstruirlo."""
+        cached = self._memory.get(agent_type)
+        if cached and cached[0] == fingerprint:
+            self.stats['memory_hits'] += 1
+            return cached[1]
+
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self._bundle_path(agent_type), 'rb') as f:
+                header = marshal.load(f)
+                if (not isinstance(header, dict) or header.get('version') != BUNDLE_FORMAT_VERSION
+                        or header.get('fingerprint') != fingerprint):
+                    return None
+                bundle = from_marshal(marshal.load(f))
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        self.stats['disk_hits'] += 1
+        self._memory[agent_type] = (fingerprint, bundle)
+        return bundle
+
+    def save(self, agent_type: str, fingerprint: str, bundle: Dict[str, Any]) -> None:
+        """Guarda un bundle recién construido."""
+        self.stats['rebuilds'] += 1
+        self._memory[agent_type] = (fingerprint, bundle)
+        if not self.enabled:
+            return
+
+        header = {
+            'version': BUNDLE_FORMAT_VERSION,
+            'agent_type': agent_type,
+            'fingerprint': fingerprint
+        }
+        try:
+            atomic_write_bytes(str(self._bundle_path(agent_type)),
+                               marshal.dumps(header) + marshal.dumps(to_marshal(bundle)))
+        except (OSError, ValueError):
+            # ValueError: un valor que marshal no admite (los contextos son dicts, listas y escalares)
+            # Sin bundle en disco el siguiente proceso lo reconstruye; no es un error de inyección
+            self.stats['write_errors'] += 1
+
+    def _bundle_path(self, agent_type: str) -> Path:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '-', agent_type).strip('-.') or 'agent'
+        return self.bundles_dir / f"{name}.marshal"
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Context Delta para el Context Injector
+
+Modo incremental para agentes reanudados o de larga duración: por cada
+agente se guarda en `.harness/.cache/manifests/<agent_id>.json` el hash de
+cada sección que se le entregó, y la siguiente inyección solo envía las
+secciones añadidas o cambiadas (más los detalles del task y la lista de
+las eliminadas). Sin manifest se entrega el contexto completo.
+"""
+
+import re
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from .file_io import atomic_write_json
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_json
+
+MANIFEST_FORMAT_VERSION = 1
+
+# Claves que se envían siempre y no forman parte del diff
+ALWAYS_SENT = ('agent_type', 'task_id', 'task_details')
+
+# Tope de secciones memoizadas (un injector longevo reconstruye bundles)
+DIGEST_MEMO_LIMIT = 1024
+
+
+class DeltaTracker:
+    """Manifests de secciones entregadas por agente y cálculo de deltas."""
+
+    def __init__(self, manifests_dir: Path):
+        self.manifests_dir = Path(manifests_dir)
+        self.stats = {'full': 0, 'delta': 0, 'sections_sent': 0, 'sections_skipped': 0}
+        # id(objeto) -> (objeto, digest): las secciones de los bundles se reutilizan entre tasks
+        self._digest_memo: Dict[int, Tuple[Any, str]] = {}
+
+    def deliver(self, agent_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Devuelve el delta de `context` respecto a lo último entregado a `agent_id`
+        y actualiza su manifest.
+
+        Returns:
+            El contexto completo con context_mode='full' si no hay manifest, o
+            un delta con context_mode='delta', changed_sections,
+            removed_sections y unchanged_sections
+        """
+        digests = {key: self._digest(value) for key, value in context.items() if key not in ALWAYS_SENT}
+        previous = self.load_manifest(agent_id)
+        self._save_manifest(agent_id, context, digests)
+
+        if previous is None:
+            self.stats['full'] += 1
+            self.stats['sections_sent'] += len(digests)
+            return dict(context, context_mode='full')
+
+        delivered = previous.get('sections', {})
+        changed = {key: context[key] for key, digest in digests.items() if delivered.get(key) != digest}
+        unchanged = [key for key in digests if key not in changed]
+        self.stats['delta'] += 1
+        self.stats['sections_sent'] += len(changed)
+        self.stats['sections_skipped'] += len(unchanged)
+
+        return {
+            'agent_type': context.get('agent_type'),
+            'task_id': context.get('task_id'),
+            'context_mode': 'delta',
+            'task_details': context.get('task_details'),
+            'changed_sections': changed,
+            'removed_sections': [key for key in delivered if key not in digests],
+            'unchanged_sections': unchanged
+        }
+
+    def load_manifest(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._manifest_path(agent_id), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def reset(self, agent_id: str) -> None:
+        """Olvida lo entregado a `agent_id` (la próxima inyección será completa)."""
+        try:
+            self._manifest_path(agent_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _save_manifest(self, agent_id: str, context: Dict[str, Any], digests: Dict[str, str]) -> None:
+        atomic_write_json(str(self._manifest_path(agent_id)), {
+            'version': MANIFEST_FORMAT_VERSION,
+            'agent_id': agent_id,
+            'agent_type': context.get('agent_type'),
+            'last_task_id': context.get('task_id'),
+            'updated_at': datetime.now().isoformat(),
+            'sections': digests
+        })
+
+    def _digest(self, value: Any) -> str:
+        memoized = self._digest_memo.get(id(value))
+        if memoized is not None and memoized[0] is value:
+            return memoized[1]
+        encoded = json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+        digest = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        if isinstance(value, (dict, list)):
+            if len(self._digest_memo) >= DIGEST_MEMO_LIMIT:
+                self._digest_memo.clear()
+            self._digest_memo[id(value)] = (value, digest)
+        return digest
+
+    def _manifest_path(self, agent_id: str) -> Path:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '-', agent_id).strip('-.') or 'agent'
+        return self.manifests_dir / f"{name}.json"
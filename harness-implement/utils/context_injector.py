@@ -9,11 +9,14 @@ para mantener coherencia durante implementación paralela.
 import os
 import sys
 import json
-import yaml
 import re
+import contextlib
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Importar project detector para integración
 try:
@@ -26,6 +29,89 @@ except ImportError:
         def detect_project(path="."):
             return {"languages": {}, "frameworks": {}, "architecture": {}}
 
+try:
+    from .feature_store import open_feature_store
+    from .file_io import stat_signature
+    from .yaml_cache import YamlDocumentCache, parse_yaml, YAML_LOADER_NAME
+    from .project_analysis_cache import ProjectAnalysisCache, project_fingerprint
+    from .context_bundles import BUNDLE_SECTIONS, BundleStore, bundle_fingerprint
+    from .context_blobs import BlobStore, DEFAULT_BLOB_MAX_AGE_SECONDS
+    from .context_delta import DeltaTracker
+    from .claude_md_index import ClaudeMdIndex, MarkdownSection
+    from .claude_md_cache import ClaudeMdCache
+    from .lazy_context import LazyContext
+    from .clean_architecture import CleanArchitecturePatterns
+    from .context_stream import stream_context
+    from .context_budget import estimate_tokens, fit_context_to_budget
+    from .context_projection import ContextProjections
+    from .relevance_index import RelevanceIndex, COLLECTIONS, select_relevant, task_query, tokenize
+    from .architecture_index import ArchitectureIndex
+    from .sized_lru import SizedLRUCache
+except ImportError:
+    from feature_store import open_feature_store
+    from file_io import stat_signature
+    from yaml_cache import YamlDocumentCache, parse_yaml, YAML_LOADER_NAME
+    from project_analysis_cache import ProjectAnalysisCache, project_fingerprint
+    from context_bundles import BUNDLE_SECTIONS, BundleStore, bundle_fingerprint
+    from context_blobs import BlobStore, DEFAULT_BLOB_MAX_AGE_SECONDS
+    from context_delta import DeltaTracker
+    from claude_md_index import ClaudeMdIndex, MarkdownSection
+    from claude_md_cache import ClaudeMdCache
+    from lazy_context import LazyContext
+    from clean_architecture import CleanArchitecturePatterns
+    from context_stream import stream_context
+    from context_budget import estimate_tokens, fit_context_to_budget
+    from context_projection import ContextProjections
+    from relevance_index import RelevanceIndex, COLLECTIONS, select_relevant, task_query, tokenize
+    from architecture_index import ArchitectureIndex
+    from sized_lru import SizedLRUCache
+
+# YAMLs de cada directorio de arquitectura: clave de contexto -> fichero
+GLOBAL_YAML_FILES = {
+    'stack_decisions': 'stack-decisions.yaml',
+    'coding_standards': 'coding-standards.yaml',
+    'api_contracts': 'api-contracts.yaml',
+    'database_schema': 'database-schema.yaml'
+}
+CROSS_CUTTING_YAML_FILES = {
+    'error_handling': 'error-handling.yaml',
+    'logging': 'logging.yaml',
+    'testing_strategy': 'testing-strategy.yaml'
+}
+FEATURE_YAML_FILES = {
+    'architecture': 'architecture.yaml',
+    'api_spec': 'api-spec.yaml',
+    'components': 'components.yaml'
+}
+
+# Hilos para leer y parsear YAMLs en paralelo (I/O en sistemas de ficheros de red)
+DEFAULT_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Topes de la caché en memoria de grupos de arquitectura (global, cross-cutting y features)
+DEFAULT_ARCHITECTURE_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_ARCHITECTURE_CACHE_ENTRIES = 256
+
+# Campos de un task con el nombre de su feature
+TASK_FEATURE_FIELDS = ('feature', 'feature_name')
+
+# Claves del contexto inyectado, en orden
+CONTEXT_KEYS = [
+    'agent_type',
+    'task_id',
+    'task_details',
+    'global_architecture',
+    'cross_cutting_concerns',
+    'feature_architecture',
+    'project_info',
+    'project_analysis',
+    'project_context',
+    'clean_architecture_patterns',
+    'methodology'
+]
+
+# Título de la sección de claude.md con los patrones para Claude Code
+CLAUDE_CODE_SECTION_RE = re.compile(r"🎯.*Claude Code")
+
 class ContextInjector:
     """
     Inyector de contexto arquitectónico para agentes especializados.
@@ -34,45 +120,303 @@ class ContextInjector:
     a agentes para mantener coherencia durante implementación paralela.
     """
 
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", use_disk_cache: bool = True,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 architecture_cache_bytes: int = DEFAULT_ARCHITECTURE_CACHE_BYTES,
+                 architecture_cache_entries: Optional[int] = DEFAULT_ARCHITECTURE_CACHE_ENTRIES):
         self.project_root = Path(project_root)
         self.architecture_root = self.project_root / ".harness/arquitectura"
-        self._architecture_cache = {}
+        self.cache_root = self.project_root / ".harness/.cache"
+        # Grupo ('global', 'cross_cutting', 'feature_<name>') -> (firmas de sus ficheros, dict ensamblado, rutas),
+        # LRU acotada en memoria aproximada: un orquestador de larga duración no acumula todas las features
+        self._architecture_cache = SizedLRUCache(architecture_cache_bytes, architecture_cache_entries,
+                                                 on_evict=self._drop_group_documents, extra_stats={'reloads': 0})
+        # Ruta de cada YAML -> (firma stat, documento parseado); solo los de grupos en caché
+        self._document_cache = {}
+        # Protege las cachés en memoria frente al thread de prefetch
+        self._cache_lock = threading.RLock()
+        self._warned_missing = set()
+        self.max_workers = max_workers
+        self._executor = None
+        self._prefetch_executor = None
+        # Caché persistente de YAML parseados (sobrevive entre procesos)
+        self._yaml_cache = YamlDocumentCache(self.cache_root / "yaml", enabled=use_disk_cache)
+        # Resultado de detect_project persistido en .claude/project_analysis.json
+        self._analysis_cache = ProjectAnalysisCache(self.project_root, enabled=use_disk_cache)
+        # claude.md parseado, por hash de contenido (.harness/.cache/claude_md/)
+        self._claude_md_cache = ClaudeMdCache(self.cache_root / "claude_md", enabled=use_disk_cache)
+        # Proyecciones por agente compiladas desde YAML
+        self._projections = ContextProjections(self.project_root)
+        # Tablas de Clean Architecture congeladas (templates/clean-architecture.yaml)
+        self._clean_architecture = CleanArchitecturePatterns(self.project_root)
+        # Parte del contexto común a todos los tasks de un agente (.harness/.cache/bundles/)
+        self._bundles = BundleStore(self.cache_root / "bundles", enabled=use_disk_cache)
+        # Secciones deduplicadas por contenido para los contextos por referencia
+        self._blobs = BlobStore(self.cache_root / "blobs")
+        # Secciones entregadas a cada agente, para el modo delta
+        self._deltas = DeltaTracker(self.cache_root / "manifests")
+        # Índice BM25 de endpoints, tablas, standards y componentes
+        self._relevance = RelevanceIndex(self.cache_root / "relevance_index.json", enabled=use_disk_cache)
+        # (api_contracts, database_schema, índice) del último documento global cargado
+        self._architecture_index = None
+        self.telemetry = {
+            'yaml_loader': YAML_LOADER_NAME,
+            'yaml_cache': self._yaml_cache.stats,
+            'project_analysis_cache': self._analysis_cache.stats,
+            'claude_md_cache': self._claude_md_cache.stats,
+            'clean_architecture': self._clean_architecture.stats,
+            'bundles': self._bundles.stats,
+            'blobs': self._blobs.stats,
+            'delta': self._deltas.stats,
+            'relevance_index': self._relevance.stats,
+            'architecture_index': {'builds': 0, 'lookups': 0},
+            'architecture_cache': self._architecture_cache.stats,
+            'feature_prefetch': {'scheduled': 0, 'warmed': 0, 'errors': 0}
+        }
 
-    def load_global_architecture(self) -> Dict[str, Any]:
+    def _load_yaml_file(self, file_path: Path) -> Any:
+        """Carga un YAML de arquitectura pasando por la caché persistente."""
+        return self._yaml_cache.load(file_path, parse_yaml)
+
+    def _warn_once(self, key: Any, message: str) -> None:
+        """Imprime un warning solo la primera vez (los dispatchers llaman a los loaders en bucle)."""
+        if key not in self._warned_missing:
+            self._warned_missing.add(key)
+            print(message)
+
+    def _load_architecture_group(self, cache_key: str, directory: Path,
+                                 yaml_files: Dict[str, str], warn_missing: bool = False) -> Dict[str, Any]:
         """
-        Carga toda la arquitectura global desde YAML files.
+        Carga un grupo de YAMLs validando cada fichero por stat.
+
+        Si ningún fichero ha cambiado se devuelve el mismo dict que la vez
+        anterior; si alguno cambió (o apareció/desapareció) solo se vuelve a
+        cargar ese documento.
+
+        Args:
+            cache_key: Clave del grupo en la caché en memoria
+            directory: Directorio del grupo
+            yaml_files: Mapa clave de contexto -> nombre de fichero
+            warn_missing: Avisar (una vez) de los ficheros ausentes
 
         Returns:
-            Dict con toda la arquitectura global cargada
+            Dict clave de contexto -> documento parseado
         """
-        if 'global' in self._architecture_cache:
-            return self._architecture_cache['global']
+        return self._load_architecture_groups([(cache_key, directory, yaml_files, warn_missing)])[cache_key]
 
-        global_arch = {}
-        global_path = self.architecture_root / "global"
+    def _load_architecture_groups(self, groups: List[Tuple[str, Path, Dict[str, str], bool]]) -> Dict[str, Dict]:
+        """
+        Versión multi-grupo de `_load_architecture_group`.
+
+        Los documentos obsoletos de todos los grupos se leen y parsean juntos
+        en el pool de threads; el ensamblado posterior sigue el orden de
+        `yaml_files`, así que el resultado no depende del orden de llegada.
+        """
+        results = {}
+        pending = []
+        stale = {}
+        # Ruta -> documento de todo lo que ensamblan los grupos pendientes
+        documents = {}
+
+        with self._cache_lock:
+            for cache_key, directory, yaml_files, warn_missing in groups:
+                signatures = {key: stat_signature(directory / filename) for key, filename in yaml_files.items()}
+                cached = self._architecture_cache.get(cache_key, lambda entry: entry[0] == signatures)
+                if cached is not None:
+                    results[cache_key] = cached[1]
+                    continue
+
+                pending.append((cache_key, directory, yaml_files, warn_missing, signatures))
+                for key, filename in yaml_files.items():
+                    file_path = directory / filename
+                    signature = signatures[key]
+                    document = self._document_cache.get(str(file_path))
+                    if signature is None:
+                        continue
+                    if document is None or document[0] != signature:
+                        stale[str(file_path)] = (file_path, signature)
+                    else:
+                        documents[str(file_path)] = document[1]
+
+        # Lectura y parseo fuera del lock: el prefetch en segundo plano no bloquea al dispatcher
+        reloaded = self._reload_documents(stale)
+        documents.update(reloaded)
+
+        with self._cache_lock:
+            for path, document in reloaded.items():
+                self._document_cache[path] = (stale[path][1], document)
+
+            for cache_key, directory, yaml_files, warn_missing, signatures in pending:
+                group = {}
+                for key, filename in yaml_files.items():
+                    file_path = directory / filename
+                    if signatures[key] is None:
+                        self._document_cache.pop(str(file_path), None)
+                        if warn_missing:
+                            self._warn_once(file_path, f"⚠️ Warning: {filename} not found, skipping")
+                        continue
+                    self._warned_missing.discard(file_path)
+                    group[key] = documents[str(file_path)]
+
+                paths = tuple(str(directory / filename) for filename in yaml_files.values())
+                self._architecture_cache.put(cache_key, (signatures, group, paths))
+                results[cache_key] = group
+
+        return results
+
+    def _drop_group_documents(self, cache_key: str, entry: Tuple) -> None:
+        """Al expulsar un grupo se liberan también sus documentos parseados."""
+        with self._cache_lock:
+            for path in entry[2]:
+                self._document_cache.pop(path, None)
+
+    def _reload_documents(self, stale: Dict[str, Tuple[Path, Tuple]]) -> Dict[str, Any]:
+        """Lee y parsea los YAMLs obsoletos, en paralelo si hay más de uno."""
+        if not stale:
+            return {}
+
+        paths = sorted(stale)
+        if len(paths) == 1 or self.max_workers <= 1:
+            documents = [self._load_yaml_file(stale[path][0]) for path in paths]
+        else:
+            # map() conserva el orden de entrada y propaga la primera excepción
+            documents = list(self._get_executor().map(
+                lambda path: self._load_yaml_file(stale[path][0]), paths))
+
+        # Los threads de prefetch recargan a la vez: el contador se actualiza bajo el lock de la caché
+        self._architecture_cache.count('reloads', len(paths))
+        return dict(zip(paths, documents))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._cache_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="harness-yaml")
+            return self._executor
+
+    def close(self) -> None:
+        """Espera al prefetch pendiente y libera los pools de threads."""
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def prefetch_architecture(self, feature_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Carga de una vez la arquitectura global, cross-cutting y la de varias features.
+
+        Pensado para preparar el contexto de un grupo paralelo completo: todos
+        los ficheros obsoletos se leen y parsean concurrentemente en lugar de
+        uno detrás de otro.
+
+        Args:
+            feature_names: Features a cargar (por defecto todas las de features/)
+
+        Returns:
+            Dict con 'global', 'cross_cutting' y 'features' (nombre -> arquitectura)
+        """
+        features_root = self.architecture_root / "features"
+        if feature_names is None:
+            feature_names = sorted(path.name for path in features_root.iterdir()
+                                   if path.is_dir()) if features_root.exists() else []
 
+        global_path = self.architecture_root / "global"
         if not global_path.exists():
             raise FileNotFoundError(f"Global architecture not found: {global_path}")
+        groups = [('global', global_path, GLOBAL_YAML_FILES, True)]
 
-        # Cargar todos los YAMLs globales
-        yaml_files = {
-            'stack_decisions': 'stack-decisions.yaml',
-            'coding_standards': 'coding-standards.yaml',
-            'api_contracts': 'api-contracts.yaml',
-            'database_schema': 'database-schema.yaml'
+        cross_cutting_path = self.architecture_root / "cross-cutting"
+        if cross_cutting_path.exists():
+            groups.append(('cross_cutting', cross_cutting_path, CROSS_CUTTING_YAML_FILES, False))
+        else:
+            self._warn_once(cross_cutting_path, "⚠️ Warning: Cross-cutting concerns not found")
+        groups += self._feature_groups(feature_names)
+
+        loaded = self._load_architecture_groups(groups)
+        return {
+            'global': loaded.get('global', {}),
+            'cross_cutting': loaded.get('cross_cutting', {}),
+            'features': {name: loaded.get(f'feature_{name}', {}) for name in dict.fromkeys(feature_names) if name}
         }
 
-        for key, filename in yaml_files.items():
-            file_path = global_path / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    global_arch[key] = yaml.safe_load(f)
-            else:
-                print(f"⚠️ Warning: {filename} not found, skipping")
+    def prefetch_upcoming_tasks(self, tasks: List[Union[Dict[str, Any], Tuple, str]]) -> Future:
+        """
+        Calienta en segundo plano la arquitectura de las features de los próximos tasks.
+
+        Pensado para la cola de tasks listos del coordinador
+        (`get_available_tasks()` y `get_deferred_tasks()`): cuando se lance
+        el agente, `load_feature_architecture` será un acierto de caché en
+        lugar de I/O y parseo de YAML.
 
-        self._architecture_cache['global'] = global_arch
-        return global_arch
+        Args:
+            tasks: Tasks del feature list (campo `feature` o `feature_name`),
+                peticiones (agent_type, task_id, feature_name) o nombres de feature
+
+        Returns:
+            Future con {nombre de feature: arquitectura} de lo calentado
+        """
+        feature_names = [name for name in dict.fromkeys(map(self._task_feature, tasks)) if name]
+        if not feature_names:
+            future = Future()
+            future.set_result({})
+            return future
+
+        prefetch_stats = self.telemetry['feature_prefetch']
+
+        def warm() -> Dict[str, Dict]:
+            try:
+                loaded = self._load_feature_architectures(feature_names)
+            except Exception:
+                prefetch_stats['errors'] += 1
+                raise
+            prefetch_stats['warmed'] += sum(1 for architecture in loaded.values() if architecture)
+            return loaded
+
+        with self._cache_lock:
+            # Un solo thread propio: no ocupa (ni espera) a los workers que parsean los YAML
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="harness-prefetch")
+        prefetch_stats['scheduled'] += len(feature_names)
+        return self._prefetch_executor.submit(warm)
+
+    @staticmethod
+    def _task_feature(task: Union[Dict[str, Any], Tuple, str]) -> Optional[str]:
+        if isinstance(task, str):
+            return task
+        if isinstance(task, dict):
+            return next((task[field] for field in TASK_FEATURE_FIELDS if task.get(field)), None)
+        return task[2] if len(task) > 2 else None
+
+    def _feature_groups(self, feature_names: List[str]) -> List[Tuple[str, Path, Dict[str, str], bool]]:
+        features_root = self.architecture_root / "features"
+        return [(f'feature_{name}', features_root / name, FEATURE_YAML_FILES, False)
+                for name in dict.fromkeys(feature_names) if name and (features_root / name).exists()]
+
+    def _load_feature_architectures(self, feature_names: List[str]) -> Dict[str, Dict]:
+        """Carga solo la arquitectura de las features indicadas (sin global ni cross-cutting)."""
+        loaded = self._load_architecture_groups(self._feature_groups(feature_names))
+        return {name: loaded.get(f'feature_{name}', {}) for name in dict.fromkeys(feature_names) if name}
+
+    def get_telemetry(self) -> Dict[str, Any]:
+        """Telemetría de la inyección: loader YAML usado y contadores de caché."""
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in self.telemetry.items()}
+
+    def load_global_architecture(self) -> Dict[str, Any]:
+        """
+        Carga toda la arquitectura global desde YAML files.
+
+        Returns:
+            Dict con toda la arquitectura global cargada
+        """
+        global_path = self.architecture_root / "global"
+
+        if not global_path.exists():
+            raise FileNotFoundError(f"Global architecture not found: {global_path}")
+
+        return self._load_architecture_group('global', global_path, GLOBAL_YAML_FILES, warn_missing=True)
 
     def load_cross_cutting_concerns(self) -> Dict[str, Any]:
         """
@@ -81,30 +425,13 @@ class ContextInjector:
         Returns:
             Dict con cross-cutting concerns cargados
         """
-        if 'cross_cutting' in self._architecture_cache:
-            return self._architecture_cache['cross_cutting']
-
-        cross_cutting = {}
         cross_cutting_path = self.architecture_root / "cross-cutting"
 
         if not cross_cutting_path.exists():
-            print("⚠️ Warning: Cross-cutting concerns not found")
+            self._warn_once(cross_cutting_path, "⚠️ Warning: Cross-cutting concerns not found")
             return {}
 
-        yaml_files = {
-            'error_handling': 'error-handling.yaml',
-            'logging': 'logging.yaml',
-            'testing_strategy': 'testing-strategy.yaml'
-        }
-
-        for key, filename in yaml_files.items():
-            file_path = cross_cutting_path / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    cross_cutting[key] = yaml.safe_load(f)
-
-        self._architecture_cache['cross_cutting'] = cross_cutting
-        return cross_cutting
+        return self._load_architecture_group('cross_cutting', cross_cutting_path, CROSS_CUTTING_YAML_FILES)
 
     def load_feature_architecture(self, feature_name: str) -> Dict[str, Any]:
         """
@@ -116,31 +443,13 @@ class ContextInjector:
         Returns:
             Dict con arquitectura específica de la feature
         """
-        cache_key = f'feature_{feature_name}'
-        if cache_key in self._architecture_cache:
-            return self._architecture_cache[cache_key]
-
-        feature_arch = {}
         feature_path = self.architecture_root / "features" / feature_name
 
         if not feature_path.exists():
             # Feature no tiene arquitectura específica, retornar vacío
             return {}
 
-        yaml_files = {
-            'architecture': 'architecture.yaml',
-            'api_spec': 'api-spec.yaml',
-            'components': 'components.yaml'
-        }
-
-        for key, filename in yaml_files.items():
-            file_path = feature_path / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    feature_arch[key] = yaml.safe_load(f)
-
-        self._architecture_cache[cache_key] = feature_arch
-        return feature_arch
+        return self._load_architecture_group(f'feature_{feature_name}', feature_path, FEATURE_YAML_FILES)
 
     def get_task_context(self, task_id: str) -> Dict[str, Any]:
         """
@@ -152,24 +461,33 @@ class ContextInjector:
         Returns:
             Dict con detalles del task
         """
-        feature_list_path = self.project_root / ".claude" / "feature_list.json"
+        return self._find_task(self._load_task_index(), task_id)
 
-        if not feature_list_path.exists():
-            raise FileNotFoundError("feature_list.json not found")
+    def _load_task_index(self) -> Dict[str, Dict]:
+        """Lee el feature list una vez y lo indexa por ID de task."""
+        # Fichero único o layout sharded (.claude/features/)
+        store = open_feature_store(str(self.project_root))
 
-        with open(feature_list_path, 'r', encoding='utf-8') as f:
-            feature_list = json.load(f)
+        if not store.exists():
+            raise FileNotFoundError("feature_list.json not found")
 
-        # Buscar el task específico
-        for feature in feature_list.get('features', []):
-            if feature.get('id') == task_id:
-                return feature
+        return {feature.get('id'): feature for feature in store.load().get('features', [])}
 
-        raise ValueError(f"Task {task_id} not found in feature_list.json")
+    @staticmethod
+    def _find_task(task_index: Dict[str, Dict], task_id: str) -> Dict[str, Any]:
+        if task_id not in task_index:
+            raise ValueError(f"Task {task_id} not found in feature_list.json")
+        return task_index[task_id]
 
     def inject_context_for_agent(self, agent_type: str, task_id: str,
                                 feature_name: Optional[str] = None,
-                                auto_detect: bool = True) -> Dict[str, Any]:
+                                auto_detect: bool = True,
+                                token_budget: Optional[int] = None,
+                                delta: bool = False,
+                                agent_id: Optional[str] = None,
+                                lazy: bool = False,
+                                relevance_top_k: Optional[int] = None,
+                                referenced_only: bool = False) -> Union[Dict[str, Any], LazyContext]:
         """
         MÉTODO PRINCIPAL: Inyecta contexto completo para un agente específico.
 
@@ -177,54 +495,249 @@ class ContextInjector:
             agent_type: Tipo de agente (frontend, backend, data, devops)
             task_id: ID del task que va a ejecutar
             feature_name: Nombre de la feature (opcional)
+            token_budget: Máximo aproximado de tokens; las secciones de menor
+                prioridad se recortan o se omiten para caber (opcional)
+            delta: Enviar solo las secciones que cambiaron desde la última
+                inyección a este agente (contexto completo si es la primera)
+            agent_id: Identidad del agente para el modo delta (por defecto agent_type)
+            lazy: Devolver un LazyContext cuyas secciones se cargan al primer
+                acceso (incompatible con token_budget, delta, relevance_top_k y
+                referenced_only, que necesitan todas las secciones)
+            relevance_top_k: Dejar en cada colección (endpoints, tablas,
+                standards, componentes) solo las N unidades más relevantes
+                para el task según el índice BM25 local (opcional)
+            referenced_only: Reducir api_contracts y database_schema a los
+                endpoints, tablas y entidades que el task referencia
 
         Returns:
             Dict con contexto completo inyectado para el agente
         """
         print(f"🔌 Inyectando contexto para {agent_type} agent (task: {task_id})")
 
-        # 1. Cargar arquitectura global (SIEMPRE)
-        global_arch = self.load_global_architecture()
+        if lazy:
+            if token_budget is not None or delta or relevance_top_k is not None or referenced_only:
+                raise ValueError("lazy=True cannot be combined with token_budget, delta, relevance_top_k "
+                                 "or referenced_only: they need every section materialized")
+            return self._lazy_context(agent_type, task_id, feature_name, auto_detect)
+
+        shared = self._load_shared_inputs([agent_type], [feature_name] if feature_name else [], auto_detect)
+        context = self._assemble_context(agent_type, task_id, feature_name, shared, token_budget,
+                                         relevance_top_k, referenced_only)
+        return self._deliver_delta(agent_id or agent_type, context) if delta else context
+
+    def inject_context_batch(self, requests: List[Tuple], auto_detect: bool = True,
+                             token_budget: Optional[int] = None,
+                             as_references: bool = False,
+                             delta: bool = False,
+                             relevance_top_k: Optional[int] = None,
+                             referenced_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Inyecta contexto para todo un grupo paralelo de una vez.
+
+        La arquitectura, el feature list, la auto-detección, claude.md y
+        project_config.json se cargan una sola vez (o se sirven desde los
+        bundles por agente) y se comparten entre todas las peticiones.
+
+        Args:
+            requests: Lista de (agent_type, task_id), (agent_type, task_id, feature_name)
+                o (agent_type, task_id, feature_name, agent_id)
+            auto_detect: Ejecutar la auto-detección del proyecto
+            token_budget: Máximo aproximado de tokens por contexto (opcional)
+            as_references: Devolver las secciones grandes como referencias
+                `{"$blob": sha256}` al almacén de `.harness/.cache/blobs/`
+                (ver `resolve_context`)
+            delta: Modo incremental por agent_id (por defecto agent_type); dos
+                peticiones del lote no pueden compartir agent_id
+            relevance_top_k: Unidades más relevantes por colección y task (opcional)
+            referenced_only: Reducir los contratos a lo que referencia cada task
+
+        Returns:
+            Lista de contextos, en el mismo orden que `requests`
+        """
+        requests = [tuple(request) + (None,) * (4 - len(request)) for request in requests]
+        agent_ids = [agent_id or agent_type for agent_type, _, _, agent_id in requests]
+        if delta and len(set(agent_ids)) != len(agent_ids):
+            raise ValueError("Delta injection needs a distinct agent_id per request "
+                             "(pass it as the 4th element when launching several agents of one type)")
+        print(f"🔌 Inyectando contexto para {len(requests)} agentes")
+
+        shared = self._load_shared_inputs([agent_type for agent_type, _, _, _ in requests],
+                                          [feature_name for _, _, feature_name, _ in requests if feature_name],
+                                          auto_detect)
+        contexts = [self._assemble_context(agent_type, task_id, feature_name, shared, token_budget,
+                                           relevance_top_k, referenced_only)
+                    for agent_type, task_id, feature_name, _ in requests]
+        if delta:
+            contexts = [self._deliver_delta(agent_id, context) for agent_id, context in zip(agent_ids, contexts)]
+        if not as_references:
+            return contexts
+
+        # Un encoder por lote: cada objeto compartido se serializa una sola vez
+        encoder = self._blobs.encoder()
+        references = [encoder.encode_context(context) for context in contexts]
+        blob_stats = self._blobs.stats
+        print(f"   🧱 Blobs: {blob_stats['written']} written, {blob_stats['deduplicated']} deduplicated, "
+              f"{blob_stats['memo_hits']} reused in memory")
+        return references
+
+    def _deliver_delta(self, agent_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce el contexto a lo que `agent_id` no ha recibido todavía."""
+        delivered = self._deltas.deliver(agent_id, context)
+        if delivered['context_mode'] == 'delta':
+            print(f"   🔁 Delta para {agent_id}: {len(delivered['changed_sections'])} secciones cambiadas, "
+                  f"{len(delivered['unchanged_sections'])} sin cambios")
+        else:
+            print(f"   🔁 Sin manifest previo para {agent_id}: contexto completo")
+        return delivered
+
+    def reset_agent_manifest(self, agent_id: str) -> None:
+        """Fuerza un contexto completo en la próxima inyección delta a `agent_id`."""
+        self._deltas.reset(agent_id)
+
+    def resolve_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Materializa un contexto emitido con `as_references=True`.
+
+        Args:
+            context: Contexto con referencias `{"$blob": sha256}`
+
+        Returns:
+            El contexto completo, igual al que se habría inyectado sin referencias
+        """
+        return self._blobs.resolve(context)
+
+    def prune_blobs(self, max_age_seconds: float = DEFAULT_BLOB_MAX_AGE_SECONDS) -> Dict[str, int]:
+        """
+        Borra de `.harness/.cache/blobs/` los blobs sin uso en `max_age_seconds`.
+
+        Cada lote con `as_references=True` renueva los blobs que referencia,
+        así que solo se borran los de contextos antiguos.
+
+        Returns:
+            {'removed': n, 'bytes_freed': n, 'kept': n}
+        """
+        result = self._blobs.prune(max_age_seconds)
+        print(f"🧹 Blobs: {result['removed']} removed ({result['bytes_freed']} bytes), {result['kept']} kept")
+        return result
+
+    def _load_shared_inputs(self, agent_types: List[str], feature_names: List[str],
+                            auto_detect: bool) -> Dict[str, Any]:
+        """
+        Carga las entradas comunes a todas las inyecciones de un grupo.
+
+        Returns:
+            Dict con 'bundles' (agente -> bundle), 'features' (nombre ->
+            arquitectura) y 'tasks' (índice por ID)
+        """
+        bundles, features = self._load_bundles(agent_types, feature_names, auto_detect)
 
-        # 2. Cargar cross-cutting concerns (SIEMPRE)
-        cross_cutting = self.load_cross_cutting_concerns()
+        # 4. Detalles de los tasks
+        return {
+            'bundles': bundles,
+            'features': features,
+            'tasks': self._load_task_index()
+        }
 
-        # 3. Cargar feature architecture si se especifica
-        feature_arch = {}
-        if feature_name:
-            feature_arch = self.load_feature_architecture(feature_name)
+    def _load_bundles(self, agent_types: List[str], feature_names: List[str],
+                      auto_detect: bool) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """
+        Carga (o reconstruye) los bundles de los agentes y las arquitecturas de features.
 
-        # 4. Obtener detalles del task
-        task_context = self.get_task_context(task_id)
+        Lo que no depende del task vive en un bundle por tipo de agente; si
+        todos los bundles están vigentes no se cargan ni la arquitectura
+        global ni claude.md ni la auto-detección.
+
+        Returns:
+            (agente -> bundle, nombre de feature -> arquitectura)
+        """
+        # 1. Bundles por tipo de agente, vigentes mientras no cambie ninguna entrada
+        fingerprints = {agent_type: self._bundle_fingerprint(agent_type, auto_detect)
+                        for agent_type in dict.fromkeys(agent_types)}
+        bundles = {agent_type: self._bundles.load(agent_type, fingerprint)
+                   for agent_type, fingerprint in fingerprints.items()}
+        stale = [agent_type for agent_type, bundle in bundles.items() if bundle is None]
+
+        # 2-3. Arquitectura (global y cross-cutting solo si hay bundles que reconstruir)
+        if stale:
+            architecture = self.prefetch_architecture(feature_names)
+            features = architecture['features']
+            inputs = self._load_bundle_inputs(auto_detect)
+            for agent_type in stale:
+                bundles[agent_type] = self._build_bundle(agent_type, architecture, inputs)
+                if not inputs['detection_failed']:
+                    self._bundles.save(agent_type, fingerprints[agent_type], bundles[agent_type])
+        else:
+            features = self._load_feature_architectures(feature_names)
+
+        print("   📦 Bundles: " + ", ".join(
+            f"{agent_type} ({'rebuilt' if agent_type in stale else 'cached'})" for agent_type in bundles))
+        return bundles, features
+
+    def _bundle_fingerprint(self, agent_type: str, auto_detect: bool) -> str:
+        """Huella de todo aquello de lo que depende el bundle de un agente."""
+        inputs = [self.architecture_root / "global" / filename for filename in GLOBAL_YAML_FILES.values()]
+        inputs += [self.architecture_root / "cross-cutting" / filename for filename in CROSS_CUTTING_YAML_FILES.values()]
+        inputs += [
+            self._projections.defaults_path,
+            self._projections.override_path,
+            self._clean_architecture.defaults_path,
+            self._clean_architecture.extension_path,
+            self.project_root / "claude.md",
+            self.project_root / ".claude" / "project_config.json"
+        ]
+        extra = {
+            'auto_detect': auto_detect,
+            'project': project_fingerprint(self.project_root) if auto_detect else None
+        }
+        return bundle_fingerprint(agent_type, inputs, extra)
 
+    def _load_bundle_inputs(self, auto_detect: bool) -> Dict[str, Any]:
+        """Carga las entradas comunes no arquitectónicas: análisis, claude.md y project info."""
         # 4.5. AUTO-DETECCIÓN: Analizar proyecto actual si está habilitado
+        #      (reutiliza el análisis persistido mientras no cambien los manifests)
         project_analysis = {}
+        detection_failed = False
         if auto_detect:
             try:
-                project_analysis = detect_project(str(self.project_root))
-                print(f"   🔍 Auto-detection complete: {len(project_analysis.get('languages', {}))} languages")
+                misses = self._analysis_cache.stats['misses']
+                project_analysis = self._analysis_cache.load(detect_project)
+                source = "complete" if self._analysis_cache.stats['misses'] > misses else "cached"
+                print(f"   🔍 Auto-detection {source}: {len(project_analysis.get('languages', {}))} languages")
             except Exception as e:
+                detection_failed = True
                 print(f"   ⚠️ Auto-detection failed: {e}")
 
         # 4.6. CLAUDE.MD: Cargar contexto específico del proyecto
         project_context = self._load_claude_md_context()
 
+        yaml_stats = self.telemetry['yaml_cache']
+        print(f"   ⚙️ YAML loader: {self.telemetry['yaml_loader']} "
+              f"(cache: {yaml_stats['hits'] + yaml_stats['rehashed_hits']} hits, {yaml_stats['misses']} parsed)")
+
+        return {
+            'project_analysis': project_analysis,
+            'project_context': project_context,
+            'project_info': self._get_project_info(),
+            # Un bundle sin análisis no se persiste: el siguiente intento lo reconstruye
+            'detection_failed': detection_failed
+        }
+
+    def _build_bundle(self, agent_type: str, architecture: Dict[str, Any],
+                      inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Construye la parte del contexto que comparten todos los tasks de un agente."""
+        project_analysis = inputs['project_analysis']
+
         # 5. Filtrar contexto relevante según tipo de agente
         relevant_context = self._filter_context_for_agent(
-            agent_type, global_arch, cross_cutting, feature_arch, task_context, project_analysis
+            agent_type, architecture['global'], architecture['cross_cutting']
         )
 
-        # 6. Estructura final de contexto
-        injected_context = {
-            'agent_type': agent_type,
-            'task_id': task_id,
-            'task_details': task_context,
+        return {
             'global_architecture': relevant_context['global'],
             'cross_cutting_concerns': relevant_context['cross_cutting'],
-            'feature_architecture': feature_arch,
-            'project_info': self._get_project_info(),
+            'project_info': inputs['project_info'],
             'project_analysis': project_analysis,  # AUTO-DETECCIÓN: Análisis automático del proyecto
-            'project_context': project_context,    # CLAUDE.MD: Contexto específico del proyecto
+            'project_context': inputs['project_context'],    # CLAUDE.MD: Contexto específico del proyecto
             'clean_architecture_patterns': self._get_clean_architecture_context(agent_type, project_analysis),
             'methodology': {
                 'type': 'anthropic-long-running-agents',
@@ -236,71 +749,198 @@ class ContextInjector:
             }
         }
 
-        print(f"   ✅ Contexto inyectado: {len(str(injected_context))} caracteres")
+    def _assemble_context(self, agent_type: str, task_id: str, feature_name: Optional[str],
+                          shared: Dict[str, Any], token_budget: Optional[int] = None,
+                          relevance_top_k: Optional[int] = None,
+                          referenced_only: bool = False) -> Dict[str, Any]:
+        """Fusiona la parte específica del task con el bundle de su agente."""
+        bundle = shared['bundles'][agent_type]
+        feature_arch = shared['features'].get(feature_name, {}) if feature_name else {}
+        task_context = self._find_task(shared['tasks'], task_id)
+
+        # 6. Estructura final de contexto (mismo orden que CONTEXT_KEYS)
+        injected_context = {
+            'agent_type': agent_type,
+            'task_id': task_id,
+            'task_details': task_context,
+            'global_architecture': bundle['global_architecture'],
+            'cross_cutting_concerns': bundle['cross_cutting_concerns'],
+            'feature_architecture': feature_arch,
+            'project_info': bundle['project_info'],
+            'project_analysis': bundle['project_analysis'],
+            'project_context': bundle['project_context'],
+            'clean_architecture_patterns': bundle['clean_architecture_patterns'],
+            'methodology': bundle['methodology']
+        }
+
+        # 7. Reducir los contratos a lo que el task referencia y quedarse con los endpoints, tablas, standards y componentes relevantes para el task
+        if referenced_only:
+            injected_context = self._narrow_to_references(injected_context, task_context)
+        if relevance_top_k is not None:
+            injected_context = self._select_relevant(injected_context, task_context, relevance_top_k)
+
+        # 8. Ajustar al presupuesto de tokens por prioridad
+        if token_budget is not None:
+            injected_context = fit_context_to_budget(injected_context, token_budget)
+            budget = injected_context['context_budget']
+            trimmed = budget['truncated'] + budget['omitted']
+            print(f"   ✅ Contexto inyectado ({agent_type}, {task_id}): ~{budget['estimated_tokens']}/{token_budget} tokens"
+                  + (f" (recortado: {', '.join(trimmed)})" if trimmed else ""))
+        else:
+            print(f"   ✅ Contexto inyectado ({agent_type}, {task_id}): ~{estimate_tokens(injected_context)} tokens")
         return injected_context
 
-    def _filter_context_for_agent(self, agent_type: str, global_arch: Dict,
-                                 cross_cutting: Dict, feature_arch: Dict,
-                                 task_context: Dict, project_analysis: Dict = None) -> Dict[str, Any]:
+    def get_architecture_index(self) -> ArchitectureIndex:
+        """Índice de endpoints, tablas y entidades del documento global actual (se reconstruye si cambia)."""
+        global_arch = self.load_global_architecture()
+        api_contracts = global_arch.get('api_contracts')
+        database_schema = global_arch.get('database_schema')
+        cached = self._architecture_index
+        # La caché de documentos devuelve el mismo objeto mientras el fichero no cambie
+        if cached is None or cached[0] is not api_contracts or cached[1] is not database_schema:
+            self.telemetry['architecture_index']['builds'] += 1
+            cached = self._architecture_index = (api_contracts, database_schema,
+                                                 ArchitectureIndex(api_contracts, database_schema))
+        return cached[2]
+
+    def query_architecture(self, endpoints: Optional[List[str]] = None, tables: Optional[List[str]] = None,
+                           entities: Optional[List[str]] = None, task_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Filtra el contexto según el tipo de agente para enviar solo lo relevante.
+        Extrae de api_contracts y database_schema solo las sub-specs referenciadas.
+
+        Args:
+            endpoints: 'MÉTODO /path' o '/path' (todos sus métodos)
+            tables: Nombres de tabla
+            entities: Entidades (arrastran sus endpoints y tablas)
+            task_id: Añadir las referencias del task (campos endpoints,
+                tables, entities y 'MÉTODO /path' en su texto)
 
-        Esto reduce tokens y mejora la eficiencia del contexto.
+        Returns:
+            {'api_contracts', 'database_schema', 'unresolved'} con los
+            documentos reducidos (solo los que alguna referencia toca)
+        """
+        index = self.get_architecture_index()
+        references = {'endpoints': list(endpoints or []), 'tables': list(tables or []),
+                      'entities': list(entities or [])}
+        if task_id is not None:
+            for field, values in index.references(self.get_task_context(task_id)).items():
+                references[field] += values
+        self.telemetry['architecture_index']['lookups'] += 1
+        return index.extract(**references)
+
+    def _narrow_to_references(self, context: Dict[str, Any], task: Dict[str, Any]) -> Dict[str, Any]:
         """
-        filtered = {
-            'global': {},
-            'cross_cutting': cross_cutting  # Cross-cutting siempre relevante
+        Sustituye las colecciones de endpoints y tablas del contexto por lo que el task referencia.
+
+        Un documento que ninguna referencia toca se envía completo (como en la
+        selección por relevancia): un task sin endpoints explícitos puede
+        necesitar igualmente el contrato. `context_references` lo indica en
+        `narrowed` y `sent_in_full`.
+        """
+        index = self.get_architecture_index()
+        references = index.references(task)
+        extracted = index.extract(**references)
+        self.telemetry['architecture_index']['lookups'] += 1
+
+        global_arch = dict(context['global_architecture'])
+        reduced, sent_in_full = [], []
+        for document, collection in (('api_contracts', index.endpoints_key), ('database_schema', 'tables')):
+            # Solo se reduce lo que la proyección del agente ya incluía
+            projected = global_arch.get(document)
+            if not (isinstance(projected, dict) and collection in projected):
+                continue
+            if document in extracted:
+                global_arch[document] = dict(projected, **{collection: extracted[document][collection]})
+                reduced.append(document)
+            else:
+                sent_in_full.append(document)
+
+        narrowed = dict(context, global_architecture=global_arch)
+        narrowed['context_references'] = dict(references, unresolved=extracted['unresolved'],
+                                              narrowed=reduced, sent_in_full=sent_in_full)
+        print(f"   📌 Referencias del task: {len(references['endpoints'])} endpoints, "
+              f"{len(references['tables'])} tablas, {len(references['entities'])} entidades"
+              + (f" (sin resolver: {', '.join(extracted['unresolved'])})" if extracted['unresolved'] else "")
+              + (f" (sin referencias, completos: {', '.join(sent_in_full)})" if sent_in_full else ""))
+        return narrowed
+
+    def _select_relevant(self, context: Dict[str, Any], task: Dict[str, Any], top_k: int) -> Dict[str, Any]:
+        """Reduce las colecciones del contexto a las unidades que más puntúan para el task."""
+        if top_k < 1:
+            raise ValueError(f"relevance_top_k must be a positive integer, got {top_k}")
+        self._refresh_relevance_index()
+
+        query = task_query(task)
+        selected, report = select_relevant(context, self._relevance.score(query), top_k)
+        report['query_terms'] = list(dict.fromkeys(tokenize(query)))
+        selected['context_relevance'] = report
+
+        omitted = sum(report['omitted'].values())
+        print(f"   🎯 Relevancia: {sum(map(len, report['selected'].values()))} unidades seleccionadas, "
+              f"{omitted} omitidas" + (f" (sin coincidencias: {', '.join(report['unmatched'])})"
+                                        if report['unmatched'] else ""))
+        return selected
+
+    def _refresh_relevance_index(self) -> None:
+        """Reconstruye el índice de relevancia si cambió alguno de sus YAML de origen."""
+        global_path = self.architecture_root / "global"
+        sources = {
+            'endpoints': global_path / GLOBAL_YAML_FILES['api_contracts'],
+            'tables': global_path / GLOBAL_YAML_FILES['database_schema'],
+            'standards': global_path / GLOBAL_YAML_FILES['coding_standards']
         }
+        components = sorted((self.architecture_root / "features").glob(f"*/{FEATURE_YAML_FILES['components']}"))
+
+        def load_collections() -> List[Tuple[str, Any]]:
+            collections = []
+            for kind, path in [*sources.items(), *(('components', path) for path in components)]:
+                document = self._load_yaml_file(path) if path.exists() else None
+                # La ruta de cada colección dentro de su YAML es la del contexto sin la sección y el documento
+                for key in COLLECTIONS[kind][2:]:
+                    document = document.get(key) if isinstance(document, dict) else None
+                collections.append((kind, document))
+            return collections
+
+        self._relevance.refresh([*sources.values(), *components], load_collections)
+
+    def _lazy_context(self, agent_type: str, task_id: str, feature_name: Optional[str],
+                      auto_detect: bool) -> LazyContext:
+        """
+        Contexto con las secciones como thunks memoizados.
 
-        if agent_type == 'frontend':
-            # Frontend necesita: UI patterns, frontend stack, API contracts
-            filtered['global'] = {
-                'stack_decisions': {
-                    'frontend': global_arch.get('stack_decisions', {}).get('frontend', {}),
-                    'project_type': global_arch.get('stack_decisions', {}).get('project_type')
-                },
-                'coding_standards': {
-                    'naming_conventions': global_arch.get('coding_standards', {}).get('naming_conventions', {}),
-                    'project_structure': global_arch.get('coding_standards', {}).get('project_structure', {}).get('frontend', {}),
-                    'git_workflow': global_arch.get('coding_standards', {}).get('git_workflow', {})
-                },
-                'api_contracts': global_arch.get('api_contracts', {})  # Para consumir APIs
-            }
+        Las secciones del bundle se resuelven juntas al primer acceso a
+        cualquiera de ellas (el bundle es la unidad de caché); el task y la
+        arquitectura de la feature se cargan por separado.
+        """
+        @lru_cache(maxsize=None)
+        def bundle() -> Dict[str, Any]:
+            return self._load_bundles([agent_type], [], auto_detect)[0][agent_type]
 
-        elif agent_type == 'backend':
-            # Backend necesita: Backend stack, database schema, API contracts
-            filtered['global'] = {
-                'stack_decisions': {
-                    'backend': global_arch.get('stack_decisions', {}).get('backend', {}),
-                    'infrastructure': global_arch.get('stack_decisions', {}).get('infrastructure', {}),
-                    'project_type': global_arch.get('stack_decisions', {}).get('project_type')
-                },
-                'coding_standards': {
-                    'naming_conventions': global_arch.get('coding_standards', {}).get('naming_conventions', {}),
-                    'project_structure': global_arch.get('coding_standards', {}).get('project_structure', {}).get('backend', {}),
-                    'git_workflow': global_arch.get('coding_standards', {}).get('git_workflow', {})
-                },
-                'api_contracts': global_arch.get('api_contracts', {}),
-                'database_schema': global_arch.get('database_schema', {})
-            }
+        def from_bundle(section: str):
+            return lambda: bundle()[section]
 
-        elif agent_type == 'data':
-            # Data agent necesita: Database schema, data stack, infrastructure
-            filtered['global'] = {
-                'stack_decisions': global_arch.get('stack_decisions', {}),
-                'coding_standards': global_arch.get('coding_standards', {}),
-                'database_schema': global_arch.get('database_schema', {})
-            }
+        def feature_architecture() -> Dict[str, Any]:
+            if not feature_name:
+                return {}
+            return self._load_feature_architectures([feature_name]).get(feature_name, {})
 
-        elif agent_type == 'devops':
-            # DevOps necesita: Infrastructure, deployment, todo el stack
-            filtered['global'] = global_arch  # DevOps ve todo
+        thunks = {section: from_bundle(section) for section in BUNDLE_SECTIONS}
+        thunks['task_details'] = lambda: self._find_task(self._load_task_index(), task_id)
+        thunks['feature_architecture'] = feature_architecture
 
-        else:
-            # Agente genérico ve todo
-            filtered['global'] = global_arch
+        print(f"   💤 Contexto diferido ({agent_type}, {task_id}): las secciones se cargan al primer acceso")
+        return LazyContext({'agent_type': agent_type, 'task_id': task_id}, thunks, CONTEXT_KEYS)
+
+    def _filter_context_for_agent(self, agent_type: str, global_arch: Dict,
+                                 cross_cutting: Dict) -> Dict[str, Any]:
+        """
+        Filtra el contexto según el tipo de agente para enviar solo lo relevante.
 
-        return filtered
+        Esto reduce tokens y mejora la eficiencia del contexto. Las proyecciones
+        por agente se declaran en templates/context-projections.yaml y el
+        proyecto puede ajustarlas en .harness/context-projections.yaml.
+        """
+        return self._projections.project(agent_type, global_arch, cross_cutting)
 
     def _get_project_info(self) -> Dict[str, Any]:
         """Obtiene información básica del proyecto."""
@@ -323,10 +963,11 @@ class ContextInjector:
             return {"project_context": None, "claude_md_available": False}
 
         try:
-            content = claude_md_path.read_text(encoding='utf-8')
-            parsed = self._parse_claude_md_content(content)
+            misses = self._claude_md_cache.stats['misses']
+            parsed = self._claude_md_cache.load(claude_md_path, self._parse_claude_md_content)
+            source = "parsed" if self._claude_md_cache.stats['misses'] > misses else "cached"
 
-            print(f"   📋 claude.md loaded: {len(parsed)} sections parsed")
+            print(f"   📋 claude.md loaded: {len(parsed)} sections {source}")
 
             return {
                 "project_context": {
@@ -351,7 +992,7 @@ class ContextInjector:
 
     def _parse_claude_md_content(self, content: str) -> Dict[str, Any]:
         """
-        Parser básico de markdown para extraer información estructurada de claude.md
+        Extrae información estructurada de claude.md a partir de su índice
 
         Args:
             content: Contenido completo del archivo claude.md
@@ -359,102 +1000,77 @@ class ContextInjector:
         Returns:
             Dict con información estructurada extraída
         """
+        index = ClaudeMdIndex(content)
         parsed = {}
 
         # 1. DOMINIO DE NEGOCIO
-        business_domain = self._extract_section_content(content, r"## 🎯 Contexto del Proyecto")
+        business_domain = index.section("🎯 Contexto del Proyecto")
         if business_domain:
             parsed["business_domain"] = {
-                "description": self._extract_bullet_point(business_domain, "Qué hace"),
-                "target_users": self._extract_bullet_point(business_domain, "Usuarios objetivo"),
-                "unique_value": self._extract_bullet_point(business_domain, "Valor único")
+                "description": business_domain.label("Qué hace"),
+                "target_users": business_domain.label("Usuarios objetivo"),
+                "unique_value": business_domain.label("Valor único")
             }
 
             # Reglas de negocio
-            rules_section = self._extract_subsection(business_domain, "### Reglas de Negocio Críticas")
+            rules_section = business_domain.subsection("Reglas de Negocio Críticas")
             if rules_section:
-                parsed["business_rules"] = self._extract_bullet_points(rules_section)
+                parsed["business_rules"] = rules_section.bullets()
 
         # 2. DECISIONES TECNOLÓGICAS
-        tech_section = self._extract_section_content(content, r"## 🏗️ Arquitectura de ESTE Proyecto")
+        tech_section = index.section("🏗️ Arquitectura de ESTE Proyecto")
         if tech_section:
-            stack_info = self._extract_subsection(tech_section, "### Stack Tecnológico Elegido")
-            decisions_info = self._extract_subsection(tech_section, "### Decisiones Arquitectónicas Específicas")
+            stack_info = tech_section.subsection("Stack Tecnológico Elegido")
+            decisions_info = tech_section.subsection("Decisiones Arquitectónicas Específicas")
 
             parsed["tech_decisions"] = {
-                "language": self._extract_bullet_point(stack_info, "Lenguaje") if stack_info else None,
-                "framework": self._extract_bullet_point(stack_info, "Framework") if stack_info else None,
-                "database": self._extract_bullet_point(stack_info, "Base de datos") if stack_info else None,
-                "deployment": self._extract_bullet_point(stack_info, "Deploy") if stack_info else None,
-                "authentication": self._extract_bullet_point(decisions_info, "Autenticación") if decisions_info else None,
-                "cache_strategy": self._extract_bullet_point(decisions_info, "Estado/Cache") if decisions_info else None,
-                "storage": self._extract_bullet_point(decisions_info, "Storage") if decisions_info else None
+                "language": stack_info.label("Lenguaje") if stack_info else None,
+                "framework": stack_info.label("Framework") if stack_info else None,
+                "database": stack_info.label("Base de datos") if stack_info else None,
+                "deployment": stack_info.label("Deploy") if stack_info else None,
+                "authentication": decisions_info.label("Autenticación") if decisions_info else None,
+                "cache_strategy": decisions_info.label("Estado/Cache") if decisions_info else None,
+                "storage": decisions_info.label("Storage") if decisions_info else None
             }
 
         # 3. ENDPOINTS/RUTAS CRÍTICAS
-        config_section = self._extract_section_content(content, r"## 🔧 Configuración Específica")
+        config_section = index.section("🔧 Configuración Específica")
         if config_section:
-            endpoints_info = self._extract_subsection(config_section, "### Endpoints/Rutas Críticas")
+            endpoints_info = config_section.subsection("Endpoints/Rutas Críticas")
             if endpoints_info:
-                parsed["endpoints"] = self._extract_code_blocks(endpoints_info)
+                parsed["endpoints"] = endpoints_info.code_blocks()
 
         # 4. CONTEXTO DEL EQUIPO
-        team_section = self._extract_section_content(content, r"## 👥 Contexto del Equipo")
+        team_section = index.section("👥 Contexto del Equipo")
         if team_section:
             parsed["team"] = {
-                "responsibilities": self._extract_subsection(team_section, "### Responsabilidades"),
-                "workflow": self._extract_subsection(team_section, "### Flujo de Trabajo")
+                "responsibilities": self._section_text(team_section.subsection("Responsabilidades")),
+                "workflow": self._section_text(team_section.subsection("Flujo de Trabajo"))
             }
 
         # 5. CONSIDERACIONES ESPECIALES
-        special_section = self._extract_section_content(content, r"## 🚨 Consideraciones Especiales")
+        special_section = index.section("🚨 Consideraciones Especiales")
         if special_section:
-            parsed["performance"] = self._extract_subsection(special_section, "### Performance Crítica")
-            parsed["security"] = self._extract_subsection(special_section, "### Seguridad Específica")
-            parsed["monitoring"] = self._extract_subsection(special_section, "### Monitoreo y Alertas")
+            parsed["performance"] = self._section_text(special_section.subsection("Performance Crítica"))
+            parsed["security"] = self._section_text(special_section.subsection("Seguridad Específica"))
+            parsed["monitoring"] = self._section_text(special_section.subsection("Monitoreo y Alertas"))
 
         # 6. PATRONES ESPECÍFICOS (si hay sección de Claude Code)
-        claude_section = self._extract_section_content(content, r"## 🎯.*Claude Code")
+        claude_section = index.section(CLAUDE_CODE_SECTION_RE)
         if claude_section:
-            parsed["patterns"] = self._extract_code_blocks(claude_section)
-            parsed["naming_conventions"] = self._extract_subsection(claude_section, "### Convenciones de Naming")
+            parsed["patterns"] = claude_section.code_blocks()
+            parsed["naming_conventions"] = self._section_text(claude_section.subsection("Convenciones de Naming"))
 
         # 7. FECHA DE ÚLTIMA ACTUALIZACIÓN
-        timestamp_match = re.search(r"Última actualización: (.+)", content)
-        if timestamp_match:
-            parsed["last_updated"] = timestamp_match.group(1).strip()
+        if index.last_updated:
+            parsed["last_updated"] = index.last_updated
 
         return parsed
 
-    def _extract_section_content(self, content: str, section_pattern: str) -> Optional[str]:
-        """Extrae contenido de una sección específica"""
-        pattern = f"{section_pattern}(.*?)(?=\n## |$)"
-        match = re.search(pattern, content, re.DOTALL)
-        return match.group(1).strip() if match else None
-
-    def _extract_subsection(self, section_content: str, subsection_pattern: str) -> Optional[str]:
-        """Extrae contenido de una subsección específica"""
-        pattern = f"{subsection_pattern}(.*?)(?=\n### |\n## |$)"
-        match = re.search(pattern, section_content, re.DOTALL)
-        return match.group(1).strip() if match else None
-
-    def _extract_bullet_point(self, content: str, bullet_text: str) -> Optional[str]:
-        """Extrae el valor de un bullet point específico"""
-        pattern = f"\\*\\*{re.escape(bullet_text)}\\*\\*:?\\s*(.+)"
-        match = re.search(pattern, content)
-        return match.group(1).strip() if match else None
-
-    def _extract_bullet_points(self, content: str) -> List[str]:
-        """Extrae todos los bullet points de una sección"""
-        pattern = r"^- (.+)$"
-        matches = re.findall(pattern, content, re.MULTILINE)
-        return [match.strip() for match in matches]
-
-    def _extract_code_blocks(self, content: str) -> List[str]:
-        """Extrae bloques de código de una sección"""
-        pattern = r"```[\w]*\n?(.*?)```"
-        matches = re.findall(pattern, content, re.DOTALL)
-        return [match.strip() for match in matches]
+    @staticmethod
+    def _section_text(section: Optional[MarkdownSection]) -> Optional[str]:
+        """Texto de una sección del índice (None si no existe o está vacía)"""
+        return (section.text or None) if section else None
 
     def validate_architecture_completeness(self) -> Dict[str, bool]:
         """
@@ -486,198 +1102,33 @@ class ContextInjector:
 
         # Validar archivos de proyecto
         validation['project_config'] = (self.project_root / ".claude" / "project_config.json").exists()
-        validation['feature_list'] = (self.project_root / ".claude" / "feature_list.json").exists()
+        validation['feature_list'] = open_feature_store(str(self.project_root)).exists()
 
         return validation
 
     def _get_clean_architecture_context(self, agent_type: str, project_analysis: Dict = None) -> Dict[str, Any]:
         """
-        NUEVO: Genera contexto específico de Clean Architecture para el agente.
+        Contexto de Clean Architecture para el agente.
+
+        Las tablas viven en templates/clean-architecture.yaml (extensibles en
+        .harness/clean-architecture-patterns.yaml) y el resultado se memoiza
+        por (agente, lenguajes, framework): es de solo lectura y compartido.
 
         Args:
             agent_type: Tipo de agente
             project_analysis: Análisis del proyecto actual
 
         Returns:
-            Dict con patrones y guidelines de Clean Architecture
-        """
-        # Contexto base de Clean Architecture
-        clean_context = {
-            'architecture_type': 'clean_hexagonal',
-            'layers': {
-                'domain': {
-                    'description': 'Core business logic, entities, value objects, domain services',
-                    'dependencies': [],
-                    'constraints': [
-                        'No framework dependencies',
-                        'No I/O operations',
-                        'Pure business logic only',
-                        'Technology agnostic'
-                    ],
-                    'patterns': ['entities', 'value_objects', 'domain_services', 'domain_events']
-                },
-                'application': {
-                    'description': 'Use cases, commands, queries, application services, ports',
-                    'dependencies': ['domain'],
-                    'constraints': [
-                        'Orchestrates domain objects',
-                        'Defines ports for infrastructure',
-                        'No direct infrastructure dependencies'
-                    ],
-                    'patterns': ['use_cases', 'commands', 'queries', 'ports', 'dto']
-                },
-                'infrastructure': {
-                    'description': 'Adapters, repositories, external services, frameworks',
-                    'dependencies': ['domain', 'application'],
-                    'constraints': [
-                        'Implements ports from application layer',
-                        'Contains framework-specific code',
-                        'Handles I/O operations'
-                    ],
-                    'patterns': ['adapters', 'repositories', 'external_services', 'database_models']
-                },
-                'presentation': {
-                    'description': 'Controllers, DTOs, validation, routing, middleware',
-                    'dependencies': ['domain', 'application'],
-                    'constraints': [
-                        'Handles HTTP/API concerns',
-                        'Input validation and serialization',
-                        'Framework-specific presentation logic',
-                        'No direct domain manipulation'
-                    ],
-                    'patterns': ['controllers', 'dto', 'validation', 'routing', 'middleware']
-                }
-            }
-        }
-
-        # Contexto específico por tipo de agente
-        if agent_type == 'frontend':
-            # Frontend principalmente trabaja en presentation layer
-            clean_context['focus_layers'] = ['presentation']
-            clean_context['agent_guidelines'] = [
-                'Implement controllers that delegate to application use cases',
-                'Create DTOs for data transfer between layers',
-                'Handle input validation at presentation boundary',
-                'Keep UI logic separate from business logic'
-            ]
-            if project_analysis and 'remix' in project_analysis.get('frameworks', {}):
-                clean_context['framework_integration'] = {
-                    'remix': {
-                        'loaders': 'Handle data fetching, call application use cases',
-                        'actions': 'Handle form submissions, call application commands',
-                        'components': 'Pure presentation logic, receive props from loaders',
-                        'error_boundaries': 'Handle presentation-layer errors'
-                    }
-                }
-
-        elif agent_type == 'backend':
-            # Backend trabaja principalmente en application e infrastructure
-            clean_context['focus_layers'] = ['application', 'infrastructure']
-            clean_context['agent_guidelines'] = [
-                'Implement use cases that orchestrate domain objects',
-                'Define ports (interfaces) in application layer',
-                'Implement adapters in infrastructure layer',
-                'Keep business logic in domain layer'
-            ]
-            if project_analysis:
-                frameworks = project_analysis.get('frameworks', {})
-                if 'fastapi' in frameworks:
-                    clean_context['framework_integration'] = {
-                        'fastapi': {
-                            'dependencies': 'Use for dependency injection of use cases',
-                            'routers': 'Thin controllers that call use cases',
-                            'middleware': 'Cross-cutting concerns (auth, logging)',
-                            'background_tasks': 'Async use case execution'
-                        }
-                    }
-                elif 'spring-boot' in frameworks:
-                    clean_context['framework_integration'] = {
-                        'spring-boot': {
-                            'services': 'Application services implementing use cases',
-                            'repositories': 'Data access ports and adapters',
-                            'controllers': 'Presentation layer handling HTTP',
-                            'configuration': 'Dependency injection configuration'
-                        }
-                    }
-
-        elif agent_type == 'data':
-            # Data agent se enfoca en infrastructure (repositories, adapters)
-            clean_context['focus_layers'] = ['infrastructure']
-            clean_context['agent_guidelines'] = [
-                'Implement repository interfaces defined in application layer',
-                'Create database adapters that implement ports',
-                'Handle data mapping between domain and database models',
-                'Ensure database operations don\'t leak into business logic'
-            ]
-
-        elif agent_type == 'devops':
-            # DevOps maneja toda la infraestructura
-            clean_context['focus_layers'] = ['infrastructure']
-            clean_context['agent_guidelines'] = [
-                'Configure deployment for layered architecture',
-                'Set up monitoring for each architectural layer',
-                'Ensure proper separation of concerns in deployment',
-                'Configure testing strategies for each layer'
-            ]
-
-        # Añadir lenguajes específicos si están detectados
-        if project_analysis:
-            detected_langs = project_analysis.get('languages', {})
-            clean_context['language_patterns'] = {}
-
-            if 'typescript' in detected_langs:
-                clean_context['language_patterns']['typescript'] = {
-                    'naming_conventions': {
-                        'entities': 'PascalCase classes',
-                        'use_cases': 'PascalCase with UseCase suffix',
-                        'repositories': 'PascalCase with Repository suffix',
-                        'interfaces': 'I prefix for ports'
-                    },
-                    'directory_structure': {
-                        'domain': 'src/domain/',
-                        'application': 'src/application/',
-                        'infrastructure': 'src/infrastructure/',
-                        'presentation': 'src/presentation/'
-                    }
-                }
-
-            if 'python' in detected_langs:
-                clean_context['language_patterns']['python'] = {
-                    'naming_conventions': {
-                        'entities': 'PascalCase classes',
-                        'use_cases': 'snake_case with _use_case suffix',
-                        'repositories': 'PascalCase with Repository suffix',
-                        'interfaces': 'Abstract base classes'
-                    },
-                    'directory_structure': {
-                        'domain': 'app/domain/',
-                        'application': 'app/application/',
-                        'infrastructure': 'app/infrastructure/',
-                        'presentation': 'app/api/'
-                    }
-                }
-
-            if 'kotlin' in detected_langs:
-                clean_context['language_patterns']['kotlin'] = {
-                    'naming_conventions': {
-                        'entities': 'PascalCase classes',
-                        'use_cases': 'PascalCase with UseCase suffix',
-                        'repositories': 'PascalCase with Repository interface',
-                        'services': 'PascalCase with Service suffix'
-                    },
-                    'directory_structure': {
-                        'domain': 'src/main/kotlin/domain/',
-                        'application': 'src/main/kotlin/application/',
-                        'infrastructure': 'src/main/kotlin/infrastructure/',
-                        'presentation': 'src/main/kotlin/presentation/'
-                    }
-                }
-
-        return clean_context
+            Dict de solo lectura con patrones y guidelines de Clean Architecture
+        """
+        return self._clean_architecture.context_for(agent_type, project_analysis)
 
 # Función utilitaria para uso directo desde skills
 def inject_context(agent_type: str, task_id: str, feature_name: Optional[str] = None,
-                  project_root: str = ".") -> Dict[str, Any]:
+                  project_root: str = ".", token_budget: Optional[int] = None,
+                  delta: bool = False, agent_id: Optional[str] = None,
+                  lazy: bool = False, relevance_top_k: Optional[int] = None,
+                  referenced_only: bool = False) -> Union[Dict[str, Any], LazyContext]:
     """
     Función utilitaria para inyectar contexto desde skills.
 
@@ -686,12 +1137,62 @@ def inject_context(agent_type: str, task_id: str, feature_name: Optional[str] =
         task_id: ID del task
         feature_name: Nombre de la feature (opcional)
         project_root: Directorio raíz del proyecto
+        token_budget: Máximo aproximado de tokens del contexto (opcional)
+        delta: Enviar solo lo cambiado desde la última inyección a `agent_id`
+        agent_id: Identidad del agente para el modo delta (por defecto agent_type)
+        lazy: Devolver un LazyContext que carga cada sección al primer acceso
+        relevance_top_k: Unidades más relevantes por colección para el task (opcional)
+        referenced_only: Reducir los contratos a los endpoints y tablas que referencia el task
 
     Returns:
-        Dict con contexto inyectado
+        Dict con contexto inyectado (o LazyContext; `to_dict()` lo materializa)
     """
     injector = ContextInjector(project_root)
-    return injector.inject_context_for_agent(agent_type, task_id, feature_name)
+    return injector.inject_context_for_agent(agent_type, task_id, feature_name, token_budget=token_budget,
+                                             delta=delta, agent_id=agent_id, lazy=lazy,
+                                             relevance_top_k=relevance_top_k, referenced_only=referenced_only)
+
+def inject_context_batch(requests: List[Tuple], project_root: str = ".",
+                         token_budget: Optional[int] = None,
+                         as_references: bool = False,
+                         delta: bool = False,
+                         relevance_top_k: Optional[int] = None,
+                         referenced_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Función utilitaria para inyectar contexto a un grupo paralelo completo.
+
+    Args:
+        requests: Lista de (agent_type, task_id, feature_name[, agent_id])
+        project_root: Directorio raíz del proyecto
+        token_budget: Máximo aproximado de tokens por contexto (opcional)
+        as_references: Emitir las secciones grandes como referencias a blobs
+        delta: Modo incremental por agent_id
+        relevance_top_k: Unidades más relevantes por colección y task (opcional)
+        referenced_only: Reducir los contratos a lo que referencia cada task
+
+    Returns:
+        Lista de contextos, en el mismo orden que `requests`
+    """
+    injector = ContextInjector(project_root)
+    try:
+        return injector.inject_context_batch(requests, token_budget=token_budget,
+                                             as_references=as_references, delta=delta,
+                                             relevance_top_k=relevance_top_k, referenced_only=referenced_only)
+    finally:
+        injector.close()
+
+def resolve_context(context: Dict[str, Any], project_root: str = ".") -> Dict[str, Any]:
+    """
+    Función utilitaria para que un agente materialice su contexto por referencias.
+
+    Args:
+        context: Contexto con referencias `{"$blob": sha256}`
+        project_root: Directorio raíz del proyecto
+
+    Returns:
+        Contexto completo
+    """
+    return ContextInjector(project_root).resolve_context(context)
 
 # Función para validar arquitectura desde skills
 def validate_architecture(project_root: str = ".") -> bool:
@@ -716,17 +1217,43 @@ def validate_architecture(project_root: str = ".") -> bool:
 
 if __name__ == "__main__":
     # Test del sistema de inyección
-    if len(sys.argv) > 1:
-        agent_type = sys.argv[1]
-        task_id = sys.argv[2] if len(sys.argv) > 2 else "TEST-001"
-
-        try:
-            injector = ContextInjector()
-            context = injector.inject_context_for_agent(agent_type, task_id)
-            print(json.dumps(context, indent=2, ensure_ascii=False))
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            sys.exit(1)
+    # Uso: context_injector.py <agent_type> [task_id] [--output FICHERO] [--compact]
+    args = sys.argv[1:]
+    compact = '--compact' in args
+    output_path = None
+    if '--output' in args:
+        position = args.index('--output')
+        output_path = args[position + 1] if position + 1 < len(args) else None
+        if not output_path:
+            print("❌ Error: --output requires a file path")
+            sys.exit(2)
+        del args[position:position + 2]
+    args = [arg for arg in args if arg != '--compact']
+
+    if args:
+        agent_type = args[0]
+        task_id = args[1] if len(args) > 1 else "TEST-001"
+
+        # Sin --output, stdout es solo el JSON: los mensajes de estado (también
+        # los de las secciones que se cargan durante el streaming) van a stderr
+        json_out = sys.stdout
+        status = contextlib.redirect_stdout(sys.stderr) if not output_path else contextlib.nullcontext()
+        with status:
+            try:
+                injector = ContextInjector()
+                # Perezoso: cada sección se resuelve y se escribe en streaming sin
+                # materializar ni serializar el contexto completo en memoria
+                context = injector.inject_context_for_agent(agent_type, task_id, lazy=True)
+                if output_path:
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        emitted = stream_context(context, f, compact=compact)
+                    print(f"💾 Contexto escrito en {output_path}: {emitted} bytes")
+                else:
+                    emitted = stream_context(context, json_out, compact=compact)
+                    print(f"💾 {emitted} bytes emitidos")
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
     else:
         # Validar arquitectura
         is_valid = validate_architecture()
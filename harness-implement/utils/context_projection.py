@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Context Projection para el Context Injector
+
+Proyecciones declarativas de la arquitectura por tipo de agente. Las specs
+se leen de `templates/context-projections.yaml` (más el override opcional
+del proyecto en `.harness/context-projections.yaml`) y se compilan una vez
+en funciones extractoras; solo se recompilan si alguno de los dos ficheros
+cambia.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from .file_io import stat_signature
+    from .yaml_cache import parse_yaml
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import stat_signature
+    from yaml_cache import parse_yaml
+
+DEFAULT_PROJECTIONS_PATH = Path(__file__).parent.parent / "templates" / "context-projections.yaml"
+PROJECT_PROJECTIONS_FILE = ".harness/context-projections.yaml"
+
+# Secciones que proyecta cada agente
+SECTIONS = ('global', 'cross_cutting')
+
+Extractor = Callable[[Dict], Any]
+
+_MISSING = object()
+
+
+def _identity(source: Dict) -> Any:
+    return source
+
+
+def _compile_select(path: str, default: Any) -> Extractor:
+    keys = tuple(path.split('.'))
+
+    def extract(source: Dict) -> Any:
+        value = source
+        for key in keys:
+            value = value.get(key, _MISSING) if isinstance(value, dict) else _MISSING
+            if value is _MISSING:
+                # Copia del default: el agente puede mutar su contexto
+                return dict(default) if isinstance(default, dict) else default
+        return value
+
+    return extract
+
+
+def compile_projection(spec: Any, where: str = "projection") -> Extractor:
+    """
+    Compila una spec de proyección en una función `source -> valor proyectado`.
+
+    Args:
+        spec: "*", ruta con puntos, {select, default} o mapping anidado
+        where: Ubicación de la spec para los mensajes de error
+
+    Returns:
+        Función extractora
+    """
+    if spec == '*':
+        return _identity
+
+    if isinstance(spec, str):
+        return _compile_select(spec, {})
+
+    if isinstance(spec, dict) and 'select' in spec:
+        if not isinstance(spec['select'], str):
+            raise ValueError(f"{where}: 'select' must be a dotted path string")
+        return _compile_select(spec['select'], spec.get('default', {}))
+
+    if isinstance(spec, dict):
+        fields = tuple((key, compile_projection(child, f"{where}.{key}")) for key, child in spec.items())
+
+        def project(source: Dict) -> Dict:
+            return {key: extract(source) for key, extract in fields}
+
+        return project
+
+    raise ValueError(f"{where}: unsupported projection spec {spec!r}")
+
+
+class ContextProjections:
+    """
+    Proyecciones compiladas por tipo de agente.
+
+    Los agentes del override del proyecto sustituyen por completo a los de
+    la spec por defecto; las secciones que un agente no declara se toman
+    de `default`.
+    """
+
+    def __init__(self, project_root: Path, defaults_path: Path = DEFAULT_PROJECTIONS_PATH):
+        self.defaults_path = Path(defaults_path)
+        self.override_path = Path(project_root) / PROJECT_PROJECTIONS_FILE
+        self._signatures: Optional[Tuple] = None
+        self._compiled: Dict[str, Dict[str, Extractor]] = {}
+        self._fallback: Dict[str, Extractor] = {}
+
+    def project(self, agent_type: str, global_arch: Dict, cross_cutting: Dict) -> Dict[str, Any]:
+        """
+        Aplica la proyección de `agent_type`.
+
+        Returns:
+            Dict con 'global' y 'cross_cutting' proyectados
+        """
+        extractors = self.extractors_for(agent_type)
+        return {
+            'global': extractors['global'](global_arch),
+            'cross_cutting': extractors['cross_cutting'](cross_cutting)
+        }
+
+    def extractors_for(self, agent_type: str) -> Dict[str, Extractor]:
+        """Extractores compilados de un agente (recompila si las specs cambiaron)."""
+        signatures = (stat_signature(self.defaults_path), stat_signature(self.override_path))
+        if signatures != self._signatures:
+            self._compile()
+            self._signatures = signatures
+        return self._compiled.get(agent_type, self._fallback)
+
+    def _compile(self) -> None:
+        spec = self._read(self.defaults_path)
+        override = self._read(self.override_path)
+
+        default_spec = dict(spec.get('default') or {}, **(override.get('default') or {}))
+        agents = dict(spec.get('agents') or {}, **(override.get('agents') or {}))
+
+        self._fallback = {
+            section: compile_projection(default_spec.get(section, '*'), f"default.{section}")
+            for section in SECTIONS
+        }
+        self._compiled = {
+            agent: {
+                section: compile_projection(agent_spec[section], f"agents.{agent}.{section}")
+                if section in (agent_spec or {}) else self._fallback[section]
+                for section in SECTIONS
+            }
+            for agent, agent_spec in agents.items()
+        }
+
+    @staticmethod
+    def _read(path: Path) -> Dict:
+        if not path.exists():
+            return {}
+        spec = parse_yaml(path.read_bytes()) or {}
+        if not isinstance(spec, dict):
+            raise ValueError(f"Invalid context projection spec in {path}: expected a mapping")
+        return spec
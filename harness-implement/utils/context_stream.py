@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Context Stream para el Context Injector
+
+Emisión en streaming de un contexto inyectado como JSON: se escribe
+sección a sección (y, en modo indentado, trozo a trozo dentro de cada
+sección) en stdout o en un fichero, sin construir nunca el documento
+completo en memoria. Con un LazyContext cada sección se resuelve justo
+antes de escribirse. El número de bytes emitidos se obtiene de paso.
+"""
+
+import io
+import json
+from typing import IO, Any, Mapping
+
+STREAM_INDENT = 2
+
+
+class _CountingWriter:
+    """Escribe texto en un stream de texto o binario y cuenta los bytes UTF-8 emitidos."""
+
+    def __init__(self, fp: IO):
+        self._fp = fp
+        self._binary = not isinstance(fp, io.TextIOBase)
+        self.bytes_written = 0
+
+    def write(self, chunk: str) -> None:
+        if self._binary or not chunk.isascii():
+            encoded = chunk.encode('utf-8')
+            self.bytes_written += len(encoded)
+            self._fp.write(encoded if self._binary else chunk)
+        else:
+            self.bytes_written += len(chunk)
+            self._fp.write(chunk)
+
+
+def stream_context(context: Mapping[str, Any], fp: IO, compact: bool = False) -> int:
+    """
+    Escribe `context` como JSON en `fp` de forma incremental.
+
+    Args:
+        context: Contexto inyectado (dict o LazyContext)
+        fp: Stream de texto (stdout, fichero 'w') o binario (fichero 'wb')
+        compact: JSON sin espacios en lugar de indentado a 2
+
+    Returns:
+        Bytes UTF-8 emitidos (incluido el salto de línea final)
+    """
+    writer = _CountingWriter(fp)
+    if compact:
+        # Una sección por llamada: el encoder C solo se usa en encode(), no en iterencode()
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=STREAM_INDENT, default=str)
+        nested = '\n' + ' ' * STREAM_INDENT
+
+    writer.write('{')
+    for position, key in enumerate(context):
+        value = context[key]
+        if compact:
+            writer.write((',' if position else '') + encoder.encode(key) + ':' + encoder.encode(value))
+            continue
+        writer.write((',' if position else '') + nested + encoder.encode(key) + ': ')
+        # Los '\n' de los strings salen escapados: todo '\n' literal es estructural
+        for chunk in encoder.iterencode(value):
+            writer.write(chunk.replace('\n', nested))
+    writer.write('}\n' if compact or not context else '\n}\n')
+    return writer.bytes_written
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Coordinator Metrics para Harness Long-Running Agents
+
+Contadores, gauges e histogramas de latencia del TaskCoordinator, exportados
+en formato textfile-collector de Prometheus (node_exporter).
+
+Cada proceso acumula deltas en memoria y los fusiona al hacer flush con el
+estado persistido junto al fichero .prom, de forma que los contadores sean
+monótonos aunque cada invocación del CLI sea un proceso nuevo.
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .file_io import file_lock, atomic_write_text
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import file_lock, atomic_write_text
+
+# Buckets de latencia en segundos (de 1ms a 30s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    'harness_coordinator_operations_total': ('counter', 'Coordinator operations executed'),
+    'harness_coordinator_operation_duration_seconds': ('histogram', 'Coordinator operation latency'),
+    'harness_coordinator_claim_duration_seconds': ('histogram', 'Latency of claiming a task (mark in progress)'),
+    'harness_coordinator_tasks_claimed_total': ('counter', 'Tasks moved to in_progress'),
+    'harness_coordinator_tasks_completed_total': ('counter', 'Tasks marked as completed'),
+    'harness_coordinator_tasks_failed_total': ('counter', 'Tasks marked as failed'),
+    'harness_coordinator_queue_depth': ('gauge', 'Tasks ready to be claimed'),
+    'harness_coordinator_tasks_in_progress': ('gauge', 'Tasks currently in progress'),
+    'harness_coordinator_last_flush_timestamp_seconds': ('gauge', 'Unix time of the last metrics flush')
+}
+
+
+def _series_key(name: str, labels: Optional[Dict[str, str]] = None) -> str:
+    """Clave serializable de una serie (nombre + labels ordenados)."""
+    return f"{name}|{json.dumps(labels or {}, sort_keys=True)}"
+
+
+def _split_key(key: str) -> Tuple[str, Dict[str, str]]:
+    name, labels = key.split('|', 1)
+    return name, json.loads(labels)
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = (f'{key}="{_escape_label_value(value)}"' for key, value in sorted(labels.items()))
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CoordinatorMetrics:
+    """
+    Registro de métricas del coordinador con export atómico a Prometheus.
+
+    Los contadores e histogramas se mantienen siempre en memoria; solo se
+    escriben a disco si hay un `textfile_path` configurado.
+    """
+
+    def __init__(self, textfile_path: Optional[str] = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.textfile_path = textfile_path
+        self.state_path = f"{textfile_path}.state.json" if textfile_path else None
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Dict] = {}
+        self._gauges: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True si las métricas se persisten en un fichero textfile."""
+        return bool(self.textfile_path)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1) -> None:
+        """Incrementa un contador."""
+        key = _series_key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 0) -> None:
+        """Fija el valor actual de un gauge."""
+        self._gauges[_series_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Registra una observación de latencia en un histograma."""
+        key = _series_key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            self._histograms[key] = histogram
+
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram['buckets'][index] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+    def snapshot(self) -> Dict:
+        """Estado acumulado: lo persistido más los deltas de este proceso."""
+        state = self._load_state()
+        self._merge_into(state)
+        return state
+
+    def flush(self) -> bool:
+        """
+        Fusiona los deltas con el estado persistido y reescribe el fichero .prom.
+
+        Returns:
+            True si se escribió el fichero, False si las métricas no están habilitadas
+        """
+        if not self.enabled:
+            return False
+
+        # Serializa el read-merge-write del estado entre procesos
+        with file_lock(self.textfile_path):
+            state = self._load_state()
+            self.set_gauge('harness_coordinator_last_flush_timestamp_seconds',
+                           value=round(datetime.now().timestamp(), 3))
+            self._merge_into(state)
+            atomic_write_text(self.state_path, json.dumps(state))
+            atomic_write_text(self.textfile_path, self.render(state))
+
+        # Los deltas ya están en el estado persistido
+        self._counters.clear()
+        self._histograms.clear()
+        self._gauges.clear()
+        return True
+
+    def render(self, state: Optional[Dict] = None) -> str:
+        """Renderiza el estado en formato de exposición de Prometheus."""
+        state = state if state is not None else self.snapshot()
+        series: Dict[str, List[str]] = {}
+
+        for key, value in sorted(state['counters'].items()):
+            name, labels = _split_key(key)
+            series.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for key, value in sorted(state['gauges'].items()):
+            name, labels = _split_key(key)
+            series.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for key, histogram in sorted(state['histograms'].items()):
+            name, labels = _split_key(key)
+            lines = series.setdefault(name, [])
+            bounds = list(state.get('buckets', self.buckets)) + [float('inf')]
+            counts = histogram['buckets'] + [histogram['count']]
+            for bound, count in zip(bounds, counts):
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+
+        output = []
+        for name in sorted(series):
+            metric_type, help_text = METRIC_HELP.get(name, ('untyped', name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(series[name])
+        return "\n".join(output) + "\n"
+
+    def _merge_into(self, state: Dict) -> None:
+        """Suma contadores/histogramas y sobrescribe gauges sobre `state`."""
+        for key, value in self._counters.items():
+            state['counters'][key] = state['counters'].get(key, 0) + value
+
+        for key, histogram in self._histograms.items():
+            stored = state['histograms'].get(key)
+            if stored is None or len(stored['buckets']) != len(histogram['buckets']):
+                state['histograms'][key] = {
+                    'buckets': list(histogram['buckets']),
+                    'sum': histogram['sum'],
+                    'count': histogram['count']
+                }
+                continue
+            stored['buckets'] = [a + b for a, b in zip(stored['buckets'], histogram['buckets'])]
+            stored['sum'] += histogram['sum']
+            stored['count'] += histogram['count']
+
+        state['gauges'].update(self._gauges)
+        state['buckets'] = list(self.buckets)
+
+    def _load_state(self) -> Dict:
+        empty = {'counters': {}, 'histograms': {}, 'gauges': {}, 'buckets': list(self.buckets)}
+        if not self.state_path or not os.path.exists(self.state_path):
+            return empty
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return empty
+        for section in ('counters', 'histograms', 'gauges'):
+            state.setdefault(section, {})
+        return state
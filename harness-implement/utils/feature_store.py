@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Feature Store para Harness Long-Running Agents
+
+Persistencia de la lista de tasks del coordinador en dos layouts:
+
+- Fichero único: `.claude/feature_list.json` (layout clásico)
+- Sharded: `.claude/features/<shard>.json` por categoría o feature, más un
+  `manifest.json` con los metadatos del plan y las dependencias que cruzan
+  shards. Cada writer bloquea solo el shard que modifica y los lectores
+  solo vuelven a parsear los shards que han cambiado desde la última lectura.
+"""
+
+import os
+import re
+import json
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .file_io import file_lock, atomic_write_json, stat_signature
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import file_lock, atomic_write_json, stat_signature
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SHARD_KEYS = ('category', 'feature')
+
+# Mutador de un task: modifica el dict en sitio
+TaskMutator = Callable[[Dict], None]
+
+
+def _read_json(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class SingleFileStore:
+    """Layout clásico: todo el plan en `.claude/feature_list.json`."""
+
+    layout = 'single'
+
+    def __init__(self, feature_list_path: str):
+        self.feature_list_path = feature_list_path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.feature_list_path)
+
+    def watched_paths(self) -> List[str]:
+        """Ficheros cuyo cambio implica un cambio del plan."""
+        return [self.feature_list_path]
+
+    def load(self) -> Dict:
+        return _read_json(self.feature_list_path)
+
+    def save(self, feature_list: Dict) -> None:
+        with file_lock(self.feature_list_path):
+            atomic_write_json(self.feature_list_path, feature_list)
+
+    def update_task(self, task_id: str, mutate: TaskMutator) -> Optional[Dict]:
+        """
+        Read-modify-write de un task bajo lock.
+
+        Returns:
+            El task actualizado, o None si no existe
+        """
+        with file_lock(self.feature_list_path):
+            feature_list = self.load()
+            for task in feature_list.get('features', []):
+                if task.get('id') == task_id:
+                    mutate(task)
+                    atomic_write_json(self.feature_list_path, feature_list)
+                    return task
+        return None
+
+
+class ShardedFeatureStore:
+    """
+    Layout sharded: un fichero de tasks por categoría o feature.
+
+    Las dependencias dentro de un shard viven en cada task; las que cruzan
+    shards se guardan en el manifest (`cross_shard_dependencies`) y se
+    reincorporan a `dependencies` en la vista fusionada.
+    """
+
+    layout = 'sharded'
+
+    def __init__(self, features_dir: str):
+        self.features_dir = features_dir
+        self.manifest_path = os.path.join(features_dir, MANIFEST_NAME)
+        self._manifest_cache: Optional[Tuple[Tuple, Dict]] = None
+        self._shard_cache: Dict[str, Tuple[Tuple, Dict]] = {}
+        self._task_shards: Dict[str, str] = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def watched_paths(self) -> List[str]:
+        return [self.manifest_path] + [self._shard_path(name) for name in self.load_manifest().get('shards', {})]
+
+    def load_manifest(self) -> Dict:
+        signature = stat_signature(self.manifest_path)
+        if signature is None:
+            raise FileNotFoundError(f"Sharded feature list manifest not found: {self.manifest_path}")
+        if self._manifest_cache and self._manifest_cache[0] == signature:
+            return self._manifest_cache[1]
+        manifest = _read_json(self.manifest_path)
+        self._manifest_cache = (signature, manifest)
+        return manifest
+
+    def load_shard(self, name: str) -> Dict:
+        """Carga un shard, reutilizando la lectura anterior si no ha cambiado."""
+        path = self._shard_path(name)
+        signature = stat_signature(path)
+        if signature is None:
+            return {'features': []}
+
+        cached = self._shard_cache.get(name)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        shard = _read_json(path)
+        self._shard_cache[name] = (signature, shard)
+        for task in shard.get('features', []):
+            self._task_shards[task['id']] = name
+        return shard
+
+    def iter_tasks(self) -> Iterator[Dict]:
+        """Recorre los tasks shard a shard con las dependencias cross-shard fusionadas."""
+        manifest = self.load_manifest()
+        cross_dependencies = manifest.get('cross_shard_dependencies', {})
+
+        for name in manifest.get('shards', {}):
+            for task in self.load_shard(name).get('features', []):
+                extra = cross_dependencies.get(task['id'])
+                if extra:
+                    task = dict(task, dependencies=list(task.get('dependencies', [])) + extra)
+                else:
+                    task = dict(task)
+                yield task
+
+    def load(self) -> Dict:
+        """Vista fusionada compatible con el layout de fichero único."""
+        manifest = self.load_manifest()
+        feature_list = {key: value for key, value in manifest.items()
+                        if key not in ('layout', 'version', 'shard_key', 'shards', 'cross_shard_dependencies')}
+        feature_list['features'] = list(self.iter_tasks())
+        return feature_list
+
+    def save(self, feature_list: Dict) -> None:
+        """Reescribe el plan completo repartiéndolo de nuevo en shards."""
+        shard_key = self.load_manifest().get('shard_key', 'category') if self.exists() else 'category'
+        write_sharded(self.features_dir, feature_list, shard_key)
+        self._shard_cache.clear()
+        self._task_shards.clear()
+
+    def update_task(self, task_id: str, mutate: TaskMutator) -> Optional[Dict]:
+        """
+        Read-modify-write de un task bloqueando solo su shard.
+
+        Returns:
+            El task actualizado, o None si no existe
+        """
+        # Un segundo intento si el índice task -> shard estaba obsoleto
+        for _ in range(2):
+            name = self._locate(task_id)
+            if name is None:
+                return None
+
+            path = self._shard_path(name)
+            with file_lock(path):
+                # Releer bajo lock: la copia cacheada puede estar obsoleta
+                shard = _read_json(path) if stat_signature(path) is not None else {'features': []}
+                for task in shard.get('features', []):
+                    if task.get('id') == task_id:
+                        mutate(task)
+                        atomic_write_json(path, shard)
+                        self._shard_cache[name] = (stat_signature(path), shard)
+                        return task
+
+            # El task se movió de shard (re-shard o move) entre la búsqueda y el lock
+            self._task_shards.pop(task_id, None)
+        return None
+
+    def _locate(self, task_id: str) -> Optional[str]:
+        name = self._task_shards.get(task_id)
+        if name is not None:
+            return name
+        for shard_name in self.load_manifest().get('shards', {}):
+            # Buscar en el contenido: un shard sin cambios viene de caché y no reindexa
+            if any(task.get('id') == task_id for task in self.load_shard(shard_name).get('features', [])):
+                self._task_shards[task_id] = shard_name
+                return shard_name
+        return None
+
+    def _shard_path(self, name: str) -> str:
+        filename = self.load_manifest().get('shards', {}).get(name, f"{name}.json")
+        return os.path.join(self.features_dir, filename)
+
+
+def shard_name_for(task: Dict, shard_key: str = 'category') -> str:
+    """Nombre de shard (seguro como nombre de fichero) de un task."""
+    if shard_key == 'feature':
+        value = task.get('feature') or task.get('category', 'other')
+    else:
+        value = task.get('category', 'other')
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', str(value)).strip('-.') or 'other'
+
+
+def write_sharded(features_dir: str, feature_list: Dict, shard_key: str = 'category') -> Dict:
+    """
+    Reparte un feature list en shards y escribe el manifest.
+
+    Args:
+        features_dir: Directorio destino (p.ej. .claude/features)
+        feature_list: Plan completo con la clave 'features'
+        shard_key: 'category' o 'feature'
+
+    Returns:
+        El manifest escrito
+    """
+    if shard_key not in SHARD_KEYS:
+        raise ValueError(f"Unknown shard key '{shard_key}'. Use one of: {', '.join(SHARD_KEYS)}")
+
+    tasks = feature_list.get('features', [])
+    task_shards = {task['id']: shard_name_for(task, shard_key) for task in tasks}
+
+    shards: Dict[str, List[Dict]] = {}
+    cross_dependencies: Dict[str, List[str]] = {}
+    for task in tasks:
+        name = task_shards[task['id']]
+        local, cross = [], []
+        for dep_id in task.get('dependencies', []):
+            (local if task_shards.get(dep_id) == name else cross).append(dep_id)
+        if cross:
+            cross_dependencies[task['id']] = cross
+        shards.setdefault(name, []).append(dict(task, dependencies=local))
+
+    manifest = {key: value for key, value in feature_list.items() if key != 'features'}
+    manifest.update({
+        'layout': 'sharded',
+        'version': MANIFEST_VERSION,
+        'shard_key': shard_key,
+        'shards': {name: f"{name}.json" for name in shards},
+        'cross_shard_dependencies': cross_dependencies
+    })
+
+    manifest_path = os.path.join(features_dir, MANIFEST_NAME)
+    with file_lock(manifest_path):
+        for name, shard_tasks in sorted(shards.items()):
+            shard_path = os.path.join(features_dir, f"{name}.json")
+            with file_lock(shard_path):
+                atomic_write_json(shard_path, {'features': shard_tasks})
+        atomic_write_json(manifest_path, manifest)
+
+    return manifest
+
+
+def open_feature_store(project_root: str = "."):
+    """
+    Devuelve el store del proyecto: sharded si existe `.claude/features/manifest.json`,
+    fichero único en otro caso.
+    """
+    sharded = ShardedFeatureStore(os.path.join(project_root, ".claude", "features"))
+    if sharded.exists():
+        return sharded
+    return SingleFileStore(os.path.join(project_root, ".claude", "feature_list.json"))
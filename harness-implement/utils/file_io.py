@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Utilidades de ficheros compartidas por los utils de harness-implement
+
+Locks entre procesos y escrituras atómicas para los ficheros de estado
+(.claude/feature_list.json, shards, métricas y cachés).
+"""
+
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin locking entre procesos
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Lock exclusivo entre procesos asociado a `path`.
+
+    Se bloquea un fichero hermano `<path>.lock` y no el propio fichero,
+    porque las escrituras atómicas lo reemplazan (rename) y un lock sobre
+    el inodo antiguo dejaría de proteger nada.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def stat_signature(path) -> Optional[Tuple[int, int, int]]:
+    """
+    Firma (inodo, mtime_ns, tamaño) de un fichero, o None si no existe.
+
+    El inodo detecta reemplazos atómicos (rename) aunque conserven mtime y tamaño.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def atomic_write_text(path: str, content: str, mode: int = 0o644) -> None:
+    """Escribe en un temporal del mismo directorio y lo renombra (atómico en POSIX)."""
+    atomic_write_bytes(path, content.encode('utf-8'), mode)
+
+
+def atomic_write_bytes(path: str, content: bytes, mode: int = 0o644) -> None:
+    """Versión binaria de atomic_write_text."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        # mkstemp crea el fichero 0600; los lectores (collector, otros agentes) necesitan leerlo
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: Any, indent: int = 2) -> None:
+    """Serializa `data` como JSON y lo escribe de forma atómica."""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Lazy Context para el Context Injector
+
+Contexto inyectado cuyas secciones son thunks que se evalúan y memoizan
+al primer acceso. Un caller que solo lee `task_details` y una o dos
+secciones no paga la carga de arquitectura, auto-detección o claude.md
+que no toca; `to_dict()` materializa el contexto completo para
+serializarlo.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class LazyContext(Mapping):
+    """
+    Mapping de solo lectura con valores perezosos.
+
+    Se serializa con `to_dict()` (json.dumps no acepta un Mapping que no
+    sea dict, a propósito: así nunca se vuelca un thunk sin evaluar).
+    """
+
+    def __init__(self, sections: Dict[str, Any], thunks: Dict[str, Callable[[], Any]], order: List[str]):
+        """
+        Args:
+            sections: Valores ya disponibles
+            thunks: Clave -> función sin argumentos que calcula el valor
+            order: Orden de las claves del contexto
+        """
+        self._values = dict(sections)
+        self._thunks = dict(thunks)
+        self._order = list(order)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        # Si el thunk falla la sección sigue pendiente y se reintenta en el próximo acceso
+        value = self._thunks[key]()
+        self._values[key] = value
+        del self._thunks[key]
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._thunks
+
+    def is_resolved(self, key: str) -> bool:
+        """True si la sección ya se calculó (o nunca fue perezosa)."""
+        return key in self._values
+
+    def pending_sections(self) -> List[str]:
+        return [key for key in self._order if key in self._thunks]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Evalúa todas las secciones pendientes y devuelve el contexto completo."""
+        return {key: self[key] for key in self._order}
+
+    def __repr__(self) -> str:
+        resolved = [key for key in self._order if key in self._values]
+        return f"LazyContext(resolved={resolved}, pending={self.pending_sections()})"
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Progress Watch para Harness Long-Running Agents
+
+Modo `watch` del task coordinator: detecta cambios en feature_list.json
+(inotify en Linux, polling de os.stat como fallback), recalcula solo los
+tasks que han cambiado y redibuja el progreso en el sitio.
+"""
+
+import os
+import sys
+import json
+import time
+import select
+import ctypes
+import ctypes.util
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from .task_coordinator import TaskCoordinator
+    from .file_io import stat_signature
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from task_coordinator import TaskCoordinator
+    from file_io import stat_signature
+
+# Eventos inotify relevantes (ver inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Secuencias ANSI para redibujar en el sitio
+CURSOR_HOME = "\x1b[H"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+CLEAR_SCREEN = "\x1b[2J"
+
+
+class FileChangeWatcher:
+    """
+    Espera cambios en un conjunto de ficheros.
+
+    Usa inotify (vía ctypes) sobre los directorios que los contienen cuando
+    está disponible; si no, compara la firma de os.stat en cada intervalo.
+    """
+
+    def __init__(self, paths: List[str], poll_interval: float = 1.0):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.poll_interval = poll_interval
+        self._signatures = self._stat_signatures()
+        self._libc = None
+        self._watched_dirs: Set[str] = set()
+        self._inotify_fd = self._init_inotify()
+
+    @property
+    def backend(self) -> str:
+        """Mecanismo de detección en uso ('inotify' o 'stat-polling')."""
+        return 'inotify' if self._inotify_fd is not None else 'stat-polling'
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloquea hasta que alguno de los ficheros cambie o venza el timeout.
+
+        Returns:
+            True si la firma de algún fichero cambió
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            wait = self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+
+            if self._inotify_fd is not None:
+                readable, _, _ = select.select([self._inotify_fd], [], [], wait)
+                if readable:
+                    self._drain_inotify()
+            else:
+                time.sleep(wait)
+
+            # inotify solo despierta; la firma de stat confirma el cambio real
+            signatures = self._stat_signatures()
+            if signatures != self._signatures:
+                self._signatures = signatures
+                return True
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def set_paths(self, paths: List[str]) -> None:
+        """
+        Cambia el conjunto de ficheros vigilados (p.ej. shards nuevos tras
+        reescribir el manifest). Los ficheros nuevos cuentan como cambiados
+        en la siguiente espera, para no perder escrituras ya hechas.
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        if paths == self.paths:
+            return
+        known = dict(zip(self.paths, self._signatures))
+        self.paths = paths
+        self._signatures = tuple(known.get(path) for path in paths)
+        if self._inotify_fd is not None and not self._add_watches(paths):
+            # Sin watch en algún directorio nuevo: volver a polling
+            self.close()
+
+    def close(self) -> None:
+        """Libera el descriptor de inotify si existe."""
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def _stat_signatures(self) -> Tuple:
+        return tuple(stat_signature(path) for path in self.paths)
+
+    def _init_inotify(self) -> Optional[int]:
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+        except (OSError, AttributeError):
+            return None
+
+        self._libc, self._inotify_fd = libc, fd
+        if not self._add_watches(self.paths):
+            os.close(fd)
+            return None
+        return fd
+
+    def _add_watches(self, paths: List[str]) -> bool:
+        """Vigila los directorios de `paths` que aún no lo estaban."""
+        # Vigilar directorios: los writers pueden reemplazar el fichero (rename)
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for directory in sorted({os.path.dirname(path) for path in paths} - self._watched_dirs):
+            if self._libc.inotify_add_watch(self._inotify_fd, directory.encode(), mask) < 0:
+                return False
+            self._watched_dirs.add(directory)
+        return True
+
+    def _drain_inotify(self) -> None:
+        try:
+            while os.read(self._inotify_fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+
+class ProgressWatch:
+    """
+    Estado de progreso mantenido de forma incremental.
+
+    Guarda una firma por task y solo reajusta los agregados de los tasks
+    cuya firma cambia entre lecturas, más la disponibilidad de sus
+    dependientes cuando cambia el estado de completado.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[str, Tuple] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.completed: Set[str] = set()
+        self.ready: Dict[str, str] = {}
+        self.in_flight: Dict[str, Tuple[str, str]] = {}
+        self.categories: Dict[str, Dict[str, int]] = {}
+        self.agents: Dict[str, Dict[str, int]] = {}
+        self.totals = {'total': 0, 'completed': 0, 'in_progress': 0, 'failed': 0}
+
+    @staticmethod
+    def _signature(task: Dict) -> Tuple:
+        if task.get('passes', False):
+            state = 'completed'
+        elif task.get('status') in ('in_progress', 'failed'):
+            state = task.get('status')
+        else:
+            state = 'pending'
+        return (
+            state,
+            task.get('category', 'other'),
+            task.get('agent_assigned', 'unknown'),
+            tuple(task.get('dependencies', [])),
+            task.get('started_at')
+        )
+
+    def apply(self, feature_list: Dict) -> int:
+        """
+        Aplica una nueva lectura del feature_list y devuelve cuántos tasks cambiaron.
+        """
+        new_tasks = {task['id']: self._signature(task) for task in feature_list.get('features', [])}
+        changed: Set[str] = set()
+
+        for task_id in self.tasks.keys() - new_tasks.keys():
+            self._account(task_id, self.tasks.pop(task_id), -1)
+            changed.add(task_id)
+
+        for task_id, signature in new_tasks.items():
+            previous = self.tasks.get(task_id)
+            if previous == signature:
+                continue
+            if previous is not None:
+                self._account(task_id, previous, -1)
+            self.tasks[task_id] = signature
+            self._account(task_id, signature, +1)
+            changed.add(task_id)
+
+        # La disponibilidad de los dependientes cambia si cambia su dependencia
+        to_refresh = set(changed)
+        for task_id in changed:
+            to_refresh |= self.dependents.get(task_id, set())
+        for task_id in to_refresh:
+            self._refresh_ready(task_id)
+
+        return len(changed)
+
+    def _account(self, task_id: str, signature: Tuple, delta: int) -> None:
+        state, category, agent, dependencies, started_at = signature
+
+        for bucket in (self.totals,
+                       self.categories.setdefault(category, {'total': 0, 'completed': 0}),
+                       self.agents.setdefault(agent, {'total': 0, 'completed': 0, 'ready': 0})):
+            bucket['total'] += delta
+            if state == 'completed':
+                bucket['completed'] += delta
+        if state in ('in_progress', 'failed'):
+            self.totals[state] += delta
+
+        for dep_id in dependencies:
+            dependents = self.dependents.setdefault(dep_id, set())
+            if delta > 0:
+                dependents.add(task_id)
+            else:
+                dependents.discard(task_id)
+
+        if state == 'completed':
+            (self.completed.add if delta > 0 else self.completed.discard)(task_id)
+        if state == 'in_progress':
+            if delta > 0:
+                self.in_flight[task_id] = (agent, started_at or '')
+            else:
+                self.in_flight.pop(task_id, None)
+
+    def _refresh_ready(self, task_id: str) -> None:
+        signature = self.tasks.get(task_id)
+        is_ready = (signature is not None and signature[0] == 'pending'
+                    and all(dep in self.completed for dep in signature[3]))
+
+        # Retirar primero la entrada anterior: el task pudo cambiar de agente
+        previous_agent = self.ready.pop(task_id, None)
+        if previous_agent is not None:
+            self.agents[previous_agent]['ready'] -= 1
+
+        if is_ready:
+            agent = signature[2]
+            self.ready[task_id] = agent
+            self.agents[agent]['ready'] += 1
+
+    def render(self) -> List[str]:
+        """Líneas del panel de progreso."""
+        total = self.totals['total']
+        completed = self.totals['completed']
+        percentage = (completed / total * 100) if total > 0 else 0
+        pending = total - completed - self.totals['in_progress'] - self.totals['failed']
+
+        lines = [
+            f"📊 Progreso del Proyecto: {percentage:.1f}%  ({completed}/{total})",
+            f"   ✅ Completadas: {completed}   🔄 En progreso: {self.totals['in_progress']}"
+            f"   ❌ Fallidas: {self.totals['failed']}   ⏳ Pendientes: {pending}",
+            f"   🚦 Cola lista: {len(self.ready)}",
+            "",
+            "📁 Progreso por categoría:"
+        ]
+        for category, stats in sorted(self.categories.items()):
+            if stats['total'] <= 0:
+                continue
+            share = stats['completed'] / stats['total'] * 100
+            lines.append(f"   {category}: {stats['completed']}/{stats['total']} ({share:.0f}%)")
+
+        lines.extend(["", "👥 Progreso por agente:"])
+        for agent, stats in sorted(self.agents.items()):
+            if stats['total'] <= 0:
+                continue
+            share = stats['completed'] / stats['total'] * 100
+            lines.append(f"   {agent}: {stats['completed']}/{stats['total']} ({share:.0f}%)"
+                         f"  listos: {stats['ready']}")
+
+        lines.extend(["", f"🔄 En vuelo ({len(self.in_flight)}):"])
+        for task_id, (agent, started_at) in sorted(self.in_flight.items())[:20]:
+            lines.append(f"   {task_id} [{agent}] desde {started_at[11:19] or '?'}")
+        if len(self.in_flight) > 20:
+            lines.append(f"   ... y {len(self.in_flight) - 20} más")
+
+        return lines
+
+
+def watch_progress(project_root: str = ".", poll_interval: float = 1.0,
+                   max_updates: Optional[int] = None, stream=None) -> None:
+    """
+    Muestra el progreso del proyecto y lo redibuja cuando cambia feature_list.json.
+
+    Args:
+        project_root: Directorio raíz del proyecto
+        poll_interval: Segundos entre comprobaciones de stat
+        max_updates: Número de redibujados tras el que terminar (None = hasta Ctrl+C)
+        stream: Salida (por defecto stdout)
+    """
+    stream = stream or sys.stdout
+    coordinator = TaskCoordinator(project_root)
+    watcher = FileChangeWatcher(coordinator.store.watched_paths(), poll_interval)
+    state = ProgressWatch()
+    interactive = stream.isatty()
+    previous_frame: List[str] = []
+    updates = 0
+
+    if interactive:
+        stream.write(CLEAR_SCREEN)
+
+    try:
+        while True:
+            try:
+                state.apply(coordinator.load_feature_list())
+            except json.JSONDecodeError:
+                # Lectura de un fichero a medio escribir: esperar al siguiente cambio
+                watcher.wait_for_change()
+                continue
+
+            try:
+                # Un manifest reescrito puede traer shards nuevos (o quitar otros)
+                watcher.set_paths(coordinator.store.watched_paths())
+            except (json.JSONDecodeError, FileNotFoundError):
+                # Manifest a medio reescribir: se reintenta tras el próximo cambio
+                pass
+
+            frame = state.render() + [
+                "",
+                f"👀 {watcher.backend} · actualizado {datetime.now().strftime('%H:%M:%S')} · Ctrl+C para salir"
+            ]
+
+            # Solo redibujar si cambió algo más que la línea de estado
+            if frame[:-1] != previous_frame[:-1]:
+                if interactive:
+                    stream.write(CURSOR_HOME + "".join(f"{line}{CLEAR_LINE}\n" for line in frame) + CLEAR_BELOW)
+                else:
+                    stream.write("\n".join(frame) + "\n\n")
+                stream.flush()
+                previous_frame = frame
+                updates += 1
+
+            if max_updates is not None and updates >= max_updates:
+                return
+
+            watcher.wait_for_change()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Project Analysis Cache para el Context Injector
+
+`detect_project` recorre el proyecto con decenas de `rglob` y lanza
+`python --version`; su resultado solo cambia cuando cambian los manifests
+o la estructura de primer nivel. Aquí se persiste en
+`.claude/project_analysis.json` junto a una huella barata (stat de los
+manifests y mtime de los directorios de primer nivel) que decide si sigue
+siendo válido.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .file_io import atomic_write_text
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_text
+
+ANALYSIS_FILE = ".claude/project_analysis.json"
+ANALYSIS_FORMAT_VERSION = 1
+
+# Ficheros cuyo contenido consulta el project detector
+MANIFEST_FILES = (
+    'package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'tsconfig.json',
+    'requirements.txt', 'pyproject.toml', 'Pipfile', 'poetry.lock', 'setup.py', 'manage.py',
+    'build.gradle', 'build.gradle.kts', 'settings.gradle', 'settings.gradle.kts', 'pom.xml'
+)
+
+# Directorios del propio harness/VCS: cambian constantemente y no afectan a la detección
+IGNORED_TOP_LEVEL = {'.claude', '.harness', '.git'}
+
+
+def project_fingerprint(project_root: Path) -> str:
+    """
+    Huella de las entradas de `detect_project` sin recorrer el árbol.
+
+    Combina (mtime_ns, tamaño) de cada manifest y el nombre y mtime de cada
+    entrada de primer nivel, así que añadir un fichero a `src/` o editar
+    `package.json` invalida el análisis, pero editar un fichero dentro de
+    `src/` no.
+    """
+    project_root = Path(project_root)
+    manifests = {}
+    for name in MANIFEST_FILES:
+        try:
+            stat = os.stat(project_root / name)
+            manifests[name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            continue
+
+    top_level = {}
+    try:
+        entries = list(os.scandir(project_root))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        if entry.name in IGNORED_TOP_LEVEL:
+            continue
+        try:
+            top_level[entry.name] = entry.stat(follow_symlinks=False).st_mtime_ns if entry.is_dir() else 0
+        except OSError:
+            continue
+
+    payload = json.dumps({'manifests': manifests, 'top_level': top_level}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ProjectAnalysisCache:
+    """
+    Resultado de `detect_project` persistido y validado por huella.
+
+    Mantiene además una copia en memoria para que un injector longevo no
+    vuelva a leer el JSON en cada inyección.
+    """
+
+    def __init__(self, project_root: Path, enabled: bool = True):
+        self.project_root = Path(project_root)
+        self.analysis_path = self.project_root / ANALYSIS_FILE
+        self.enabled = enabled
+        self.stats = {'hits': 0, 'misses': 0, 'write_errors': 0}
+        self._memory: Optional[tuple] = None
+
+    def load(self, detect: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Devuelve el análisis del proyecto, ejecutando `detect` solo si la huella cambió.
+
+        Args:
+            detect: Función de detección (normalmente `detect_project`)
+
+        Returns:
+            Dict con el análisis del proyecto
+        """
+        if not self.enabled:
+            return detect(str(self.project_root))
+
+        fingerprint = project_fingerprint(self.project_root)
+        if self._memory and self._memory[0] == fingerprint:
+            self.stats['hits'] += 1
+            return self._memory[1]
+
+        persisted = self._read()
+        if persisted and persisted.get('fingerprint') == fingerprint:
+            self.stats['hits'] += 1
+            self._memory = (fingerprint, persisted['analysis'])
+            return persisted['analysis']
+
+        self.stats['misses'] += 1
+        analysis = detect(str(self.project_root))
+        self._memory = (fingerprint, analysis)
+        self._write(fingerprint, analysis)
+        return analysis
+
+    def _read(self) -> Optional[Dict]:
+        try:
+            with open(self.analysis_path, 'r', encoding='utf-8') as f:
+                persisted = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(persisted, dict) or persisted.get('version') != ANALYSIS_FORMAT_VERSION:
+            return None
+        return persisted
+
+    def _write(self, fingerprint: str, analysis: Dict[str, Any]) -> None:
+        document = {
+            'version': ANALYSIS_FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'generated_at': datetime.now().isoformat(),
+            'analysis': analysis
+        }
+        try:
+            atomic_write_text(str(self.analysis_path),
+                              json.dumps(document, indent=2, ensure_ascii=False, default=str))
+        except (OSError, TypeError, ValueError):
+            # La caché es una optimización: sin permisos de escritura se detecta en cada inyección
+            self.stats['write_errors'] += 1
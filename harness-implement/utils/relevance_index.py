@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Relevance Index para el Context Injector
+
+Índice BM25 local sobre las unidades de la arquitectura: endpoints de
+api_contracts, tablas de database_schema, apartados de coding_standards y
+componentes de cada feature. Se persiste en
+`.harness/.cache/relevance_index.json` junto a la huella de sus YAML de
+origen y se reconstruye solo cuando alguno cambia. Con él, el injector
+ordena las unidades por relevancia para el texto del task (título,
+descripción, criterios de aceptación) y deja en el contexto solo las
+mejores de cada colección.
+"""
+
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .file_io import atomic_write_text, stat_signature
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_text, stat_signature
+
+INDEX_FORMAT_VERSION = 1
+
+# Parámetros estándar de BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Colecciones indexadas: tipo de unidad -> ruta de la colección en el contexto inyectado
+COLLECTIONS = {
+    'endpoints': ('global_architecture', 'api_contracts', 'endpoints'),
+    'tables': ('global_architecture', 'database_schema', 'tables'),
+    'standards': ('global_architecture', 'coding_standards'),
+    'components': ('feature_architecture', 'components', 'components')
+}
+
+# Campos del task que forman la consulta
+TASK_TEXT_FIELDS = ('title', 'name', 'description', 'acceptance_criteria', 'steps', 'category')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in is it of on or the to with that this into when should must
+el la los las un una unos unas y o de del al en con por para que se su sus es son como cuando debe
+""".split())
+
+_CAMEL_RE = re.compile(r'([a-z0-9])([A-Z])')
+_TOKEN_RE = re.compile(r'[a-z0-9áéíóúñü]+')
+
+UnitId = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Términos normalizados: camelCase y snake_case separados, minúsculas, sin stopwords y sin plural."""
+    terms = []
+    for token in _TOKEN_RE.findall(_CAMEL_RE.sub(r'\1 \2', text).lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        # Stemming mínimo: users/user, usuarios/usuario, orders/order
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def flatten_text(value: Any) -> str:
+    """Texto de una unidad: claves y valores escalares de toda la estructura."""
+    if isinstance(value, dict):
+        return ' '.join(f"{key} {flatten_text(child)}" for key, child in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(flatten_text(item) for item in value)
+    return '' if value is None else str(value)
+
+
+def item_key(item: Any, position: int) -> str:
+    """Clave estable de un elemento de una colección en forma de lista."""
+    if isinstance(item, dict):
+        if 'path' in item:
+            return f"{item.get('method', '')} {item['path']}".strip()
+        if 'name' in item:
+            return str(item['name'])
+        return f"#{position}"
+    if isinstance(item, (str, int, float)):
+        return str(item)
+    return f"#{position}"
+
+
+def collection_units(collection: Any) -> List[Tuple[str, Any]]:
+    """(clave, valor) de cada unidad de una colección (mapping o lista)."""
+    if isinstance(collection, dict):
+        return [(str(key), {key: value}) for key, value in collection.items()]
+    if isinstance(collection, (list, tuple)):
+        return [(item_key(item, position), item) for position, item in enumerate(collection)]
+    return []
+
+
+def task_query(task: Dict[str, Any]) -> str:
+    """Texto de consulta de un task a partir de sus campos descriptivos."""
+    return ' '.join(flatten_text(task.get(field)) for field in TASK_TEXT_FIELDS if task.get(field))
+
+
+class RelevanceIndex:
+    """Índice BM25 persistido de las unidades de arquitectura."""
+
+    def __init__(self, index_path: Path, enabled: bool = True):
+        self.index_path = Path(index_path)
+        self.enabled = enabled
+        self.stats = {'builds': 0, 'disk_loads': 0, 'queries': 0}
+        self._data: Optional[Dict[str, Any]] = None
+
+    def refresh(self, sources: List[Path], load_collections) -> None:
+        """
+        Asegura que el índice corresponde a los YAML de origen actuales.
+
+        Args:
+            sources: Ficheros de los que sale el índice (existan o no)
+            load_collections: Función sin argumentos que devuelve
+                (tipo de unidad, colección) con las colecciones a indexar
+        """
+        fingerprint = hashlib.sha256(json.dumps(
+            [[str(path), stat_signature(path)] for path in sources]).encode('utf-8')).hexdigest()
+        if self._data is not None and self._data['fingerprint'] == fingerprint:
+            return
+
+        persisted = self._read()
+        if persisted is not None and persisted['fingerprint'] == fingerprint:
+            self.stats['disk_loads'] += 1
+            self._data = persisted
+            return
+
+        self.stats['builds'] += 1
+        self._data = self._build(fingerprint, load_collections())
+        self._write()
+
+    def score(self, query: str) -> Dict[UnitId, float]:
+        """Puntuación BM25 de cada unidad con algún término de la consulta."""
+        self.stats['queries'] += 1
+        data = self._data or {}
+        postings = data.get('postings', {})
+        units = data.get('units', [])
+        if not units:
+            return {}
+
+        total = len(units)
+        average_length = data['average_length'] or 1.0
+        scores: Dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            unit_postings = postings.get(term)
+            if not unit_postings:
+                continue
+            idf = math.log(1 + (total - len(unit_postings) + 0.5) / (len(unit_postings) + 0.5))
+            for unit, frequency in unit_postings:
+                length = units[unit][2]
+                normalization = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[unit] = scores.get(unit, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + normalization)
+
+        # Dos features pueden tener un componente con el mismo nombre: cuenta el más relevante
+        by_id: Dict[UnitId, float] = {}
+        for unit, value in scores.items():
+            unit_id = (units[unit][0], units[unit][1])
+            by_id[unit_id] = max(value, by_id.get(unit_id, 0.0))
+        return by_id
+
+    @staticmethod
+    def _build(fingerprint: str, collections: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+        units, postings = [], {}
+        for kind, collection in collections:
+            for key, value in collection_units(collection):
+                terms = Counter(tokenize(f"{key} {flatten_text(value)}"))
+                for term, frequency in terms.items():
+                    postings.setdefault(term, []).append([len(units), frequency])
+                units.append([kind, key, sum(terms.values())])
+
+        return {
+            'version': INDEX_FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'units': units,
+            'average_length': sum(unit[2] for unit in units) / len(units) if units else 0.0,
+            'postings': postings
+        }
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != INDEX_FORMAT_VERSION:
+            return None
+        return data
+
+    def _write(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            atomic_write_text(str(self.index_path), json.dumps(self._data, ensure_ascii=False, separators=(',', ':')))
+        except (OSError, TypeError, ValueError):
+            # Sin índice en disco el siguiente proceso lo reconstruye
+            pass
+
+
+def _get_path(context: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    value = context
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _replace_path(context: Dict[str, Any], path: Tuple[str, ...], new_value: Any) -> Dict[str, Any]:
+    """Copia los dicts del camino (los del bundle son compartidos) y sustituye la hoja."""
+    if len(path) == 1:
+        return dict(context, **{path[0]: new_value})
+    return dict(context, **{path[0]: _replace_path(context[path[0]], path[1:], new_value)})
+
+
+def select_relevant(context: Dict[str, Any], scores: Dict[UnitId, float],
+                    top_k: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Deja en cada colección del contexto sus `top_k` unidades más relevantes.
+
+    Una colección sin ninguna unidad relevante se deja completa: mejor
+    contexto de más que un agente sin el contrato que necesita.
+
+    Returns:
+        (nuevo contexto, informe {'selected': tipo -> claves, 'omitted': tipo -> nº})
+    """
+    report = {'selected': {}, 'omitted': {}, 'unmatched': []}
+    for kind, path in COLLECTIONS.items():
+        collection = _get_path(context, path)
+        units = collection_units(collection)
+        if not units:
+            continue
+
+        ranked = sorted(
+            ((scores.get((kind, key), 0.0), position) for position, (key, _) in enumerate(units)),
+            key=lambda entry: (-entry[0], entry[1]))
+        keep = sorted(position for score, position in ranked[:top_k] if score > 0)
+        if not keep:
+            report['unmatched'].append(kind)
+            continue
+
+        if isinstance(collection, dict):
+            keys = list(collection)
+            selected = {keys[position]: collection[keys[position]] for position in keep}
+        else:
+            selected = [collection[position] for position in keep]
+        context = _replace_path(context, path, selected)
+        report['selected'][kind] = [units[position][0] for position in keep]
+        report['omitted'][kind] = len(units) - len(keep)
+
+    return context, report
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Sized LRU para el Context Injector
+
+Caché LRU con tope de memoria aproximada y de número de entradas: cada
+entrada se contabiliza por el tamaño de su estructura (sys.getsizeof
+recursivo sobre dicts, listas y escalares) y al superar cualquiera de los
+topes se expulsan las menos usadas. Es segura entre threads, porque el
+prefetch de features la llena desde el pool en segundo plano mientras el
+dispatcher lee.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def approximate_size(value: Any) -> int:
+    """Bytes aproximados de una estructura de dicts/listas/escalares (los objetos compartidos cuentan una vez)."""
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+class SizedLRUCache:
+    """LRU acotada en bytes aproximados y entradas con contadores de hits, misses y expulsiones."""
+
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+                 extra_stats: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            max_bytes: Tope de memoria aproximada del conjunto de entradas
+            max_entries: Tope de entradas (sin tope si es None)
+            on_evict: Llamada (clave, valor) por cada entrada expulsada
+            extra_stats: Contadores del llamador que se publican junto a los de la caché
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0, 'entries': 0, 'bytes': 0,
+                      'max_bytes': max_bytes, 'max_entries': max_entries, **(extra_stats or {})}
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, is_valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Valor de `key` (None si no está); lo marca como el más reciente.
+
+        Con `is_valid`, un valor que ya no vale (p.ej. firmas de ficheros
+        distintas) cuenta como miss y `stale` y devuelve None; el llamador lo
+        sustituye con `put`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if is_valid is not None and not is_valid(entry[0]):
+                self.stats['misses'] += 1
+                self.stats['stale'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """Guarda `value` y expulsa las entradas menos usadas hasta volver bajo el tope."""
+        size = approximate_size(value) if size is None else size
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.stats['bytes'] -= previous[1]
+            self._entries[key] = (value, size)
+            self.stats['bytes'] += size
+            # Una entrada mayor que el tope tampoco se queda: se expulsa ella misma
+            evicted = []
+            while self._entries and (self.stats['bytes'] > self.max_bytes or
+                                     (self.max_entries is not None and len(self._entries) > self.max_entries)):
+                evicted_key, (evicted_value, evicted_size) = self._entries.popitem(last=False)
+                self.stats['bytes'] -= evicted_size
+                self.stats['evictions'] += 1
+                evicted.append((evicted_key, evicted_value))
+            self.stats['entries'] = len(self._entries)
+
+        # Fuera del lock: el callback puede tocar otras cachés
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable) -> Any:
+        """Quita `key` sin contarlo como expulsión (None si no estaba)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self.stats['bytes'] -= entry[1]
+            self.stats['entries'] = len(self._entries)
+            return entry[0]
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Suma `amount` a un contador de `extra_stats` bajo el mismo lock que los de la caché."""
+        with self._lock:
+            self.stats[name] += amount
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
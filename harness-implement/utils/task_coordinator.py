@@ -9,9 +9,49 @@ y optimizando para implementación incremental.
 import os
 import sys
 import json
+import time
+import functools
 from datetime import datetime
+from fnmatch import fnmatch
 from typing import Dict, List, Optional, Set, Tuple
 
+try:
+    from .coordinator_metrics import CoordinatorMetrics
+    from .feature_store import open_feature_store, write_sharded
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from coordinator_metrics import CoordinatorMetrics
+    from feature_store import open_feature_store, write_sharded
+
+# Caracteres que convierten un segmento de ruta en patrón glob
+GLOB_CHARS = set('*?[')
+
+# Variable de entorno con la ruta del fichero textfile de Prometheus
+METRICS_PATH_ENV = "HARNESS_METRICS_PATH"
+
+def instrumented(flush: bool = False):
+    """
+    Decorador que cuenta y mide la latencia de una operación del coordinador.
+
+    Args:
+        flush: Persistir las métricas al terminar (operaciones que escriben)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                labels = {'operation': method.__name__}
+                self.metrics.inc('harness_coordinator_operations_total', labels)
+                self.metrics.observe('harness_coordinator_operation_duration_seconds',
+                                     time.perf_counter() - start, labels)
+                if flush:
+                    self.flush_metrics()
+        return wrapper
+    return decorator
+
 class TaskCoordinator:
     """
     Coordinador de tasks para implementación paralela con dependencias.
@@ -20,35 +60,86 @@ class TaskCoordinator:
     para long-running agents.
     """
 
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", metrics_path: Optional[str] = None):
         self.project_root = project_root
         self.feature_list_path = os.path.join(project_root, ".claude", "feature_list.json")
+        # Fichero único o layout sharded (.claude/features/) según exista el manifest
+        self.store = open_feature_store(project_root)
+        self.metrics = CoordinatorMetrics(metrics_path or os.environ.get(METRICS_PATH_ENV))
+
+    def flush_metrics(self) -> bool:
+        """Escribe las métricas acumuladas si hay un textfile configurado."""
+        try:
+            return self.metrics.flush()
+        except OSError as e:
+            print(f"⚠️ Warning: Could not write metrics: {e}", file=sys.stderr)
+            return False
 
     def load_feature_list(self) -> Dict:
-        """Carga la lista de features/tasks del proyecto."""
-        if not os.path.exists(self.feature_list_path):
+        """Carga la lista de features/tasks del proyecto (fusionando shards si aplica)."""
+        if not self.store.exists():
             raise FileNotFoundError("feature_list.json not found. Run /harness-plan first.")
 
-        with open(self.feature_list_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self.store.load()
 
     def save_feature_list(self, feature_list: Dict) -> None:
         """Guarda la lista de features/tasks actualizada."""
-        with open(self.feature_list_path, 'w', encoding='utf-8') as f:
-            json.dump(feature_list, f, indent=2, ensure_ascii=False)
+        self.store.save(feature_list)
+
+    def shard_feature_list(self, shard_key: str = 'category') -> Dict:
+        """
+        Convierte el feature_list.json único al layout sharded (.claude/features/).
+
+        El fichero original se renombra a feature_list.json.pre-shard para que
+        ningún lector siga usando una copia obsoleta.
 
+        Args:
+            shard_key: Campo por el que repartir los tasks ('category' o 'feature')
+
+        Returns:
+            Manifest generado
+        """
+        manifest = write_sharded(os.path.join(self.project_root, ".claude", "features"),
+                                 self.load_feature_list(), shard_key)
+        if os.path.exists(self.feature_list_path):
+            os.replace(self.feature_list_path, f"{self.feature_list_path}.pre-shard")
+        self.store = open_feature_store(self.project_root)
+        return manifest
+
+    @instrumented()
     def get_available_tasks(self) -> List[Dict]:
         """
         Obtiene tasks que están listos para ejecutar (dependencias satisfechas).
 
+        Respeta las restricciones declaradas en la sección `scheduling` de
+        feature_list.json (capacidad por agente, recursos exclusivos y
+        footprints de ficheros), por lo que el resultado puede lanzarse
+        completo en paralelo sin conflictos.
+
         Returns:
             Lista de tasks que pueden ejecutarse en paralelo
         """
         feature_list = self.load_feature_list()
-        tasks = feature_list.get('features', [])
+        admitted, _ = self._compute_schedule(feature_list)
+        return admitted
+
+    @instrumented()
+    def get_deferred_tasks(self) -> List[Dict]:
+        """
+        Obtiene tasks con dependencias satisfechas que las restricciones de
+        scheduling obligan a esperar.
 
-        available_tasks = []
+        Returns:
+            Lista de tasks diferidos con los motivos de la espera
+        """
+        feature_list = self.load_feature_list()
+        _, deferred = self._compute_schedule(feature_list)
+        return deferred
+
+    def _get_ready_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Tasks pendientes cuyas dependencias están completadas."""
         completed_task_ids = {task['id'] for task in tasks if task.get('passes', False)}
+        ready_tasks = []
 
         for task in tasks:
             # Skip si ya está completado
@@ -61,13 +152,108 @@ class TaskCoordinator:
 
             # Verificar dependencias
             dependencies = task.get('dependencies', [])
-            dependencies_satisfied = all(dep_id in completed_task_ids for dep_id in dependencies)
+            if all(dep_id in completed_task_ids for dep_id in dependencies):
+                ready_tasks.append(task)
+
+        return ready_tasks
+
+    def _compute_schedule(self, feature_list: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Calcula el conjunto de tasks admitidos respetando las restricciones.
+
+        Los candidatos se admiten por orden de prioridad: cada task admitido
+        consume un slot de su agente, bloquea sus recursos exclusivos y
+        reserva su footprint de ficheros, igual que los tasks in_progress.
+
+        Returns:
+            Tupla (tasks admitidos en el orden original, tasks diferidos con motivos)
+        """
+        tasks = feature_list.get('features', [])
+        ready_tasks = self._get_ready_tasks(tasks)
 
-            if dependencies_satisfied:
-                available_tasks.append(task)
+        scheduling = feature_list.get('scheduling', {})
 
-        return available_tasks
+        uses_constraints = scheduling.get('agent_concurrency') or scheduling.get('default_agent_concurrency') is not None or any(
+            task.get('exclusive_resources') or task.get('file_footprint') for task in tasks
+        )
+        if not uses_constraints:
+            self._record_queue_gauges(tasks, ready_tasks)
+            return ready_tasks, []
 
+        # Estado ocupado por los tasks en vuelo
+        running_per_agent: Dict[str, int] = {}
+        held_resources: Dict[str, str] = {}
+        held_footprints: List[Tuple[str, str]] = []
+        for task in tasks:
+            if task.get('status') == 'in_progress' and not task.get('passes', False):
+                self._reserve(task, running_per_agent, held_resources, held_footprints)
+
+        admitted_ids = set()
+        deferred = []
+        for task in sorted(ready_tasks, key=self._priority_key):
+            agent = task.get('agent_assigned', 'general')
+            reasons = []
+
+            limit = self._agent_limit(scheduling, agent)
+            if limit is not None and running_per_agent.get(agent, 0) >= limit:
+                reasons.append(f"agent '{agent}' at capacity ({limit})")
+
+            for resource in task.get('exclusive_resources', []):
+                if resource in held_resources:
+                    reasons.append(f"resource '{resource}' held by {held_resources[resource]}")
+
+            for pattern in task.get('file_footprint', []):
+                for held_pattern, holder in held_footprints:
+                    if paths_overlap(pattern, held_pattern):
+                        reasons.append(f"files '{pattern}' overlap {holder} ('{held_pattern}')")
+                        break
+
+            if reasons:
+                deferred.append({'task': task, 'reasons': reasons})
+            else:
+                admitted_ids.add(task['id'])
+                self._reserve(task, running_per_agent, held_resources, held_footprints)
+
+        admitted = [task for task in ready_tasks if task['id'] in admitted_ids]
+        self._record_queue_gauges(tasks, admitted)
+        return admitted, deferred
+
+    def _record_queue_gauges(self, tasks: List[Dict], admitted: List[Dict]) -> None:
+        """Actualiza los gauges de cola lista y tasks en vuelo por agente."""
+        queue_depth = {task.get('agent_assigned', 'general'): 0 for task in tasks}
+        in_progress = dict(queue_depth)
+        for task in admitted:
+            queue_depth[task.get('agent_assigned', 'general')] += 1
+        for task in tasks:
+            if task.get('status') == 'in_progress' and not task.get('passes', False):
+                in_progress[task.get('agent_assigned', 'general')] += 1
+
+        for agent in queue_depth:
+            self.metrics.set_gauge('harness_coordinator_queue_depth', {'agent': agent}, queue_depth[agent])
+            self.metrics.set_gauge('harness_coordinator_tasks_in_progress', {'agent': agent}, in_progress[agent])
+
+    @staticmethod
+    def _agent_limit(scheduling: Dict, agent: str) -> Optional[int]:
+        """Capacidad de un agente: la declarada, o la por defecto (None = sin límite)."""
+        return scheduling.get('agent_concurrency', {}).get(agent, scheduling.get('default_agent_concurrency'))
+
+    @staticmethod
+    def _reserve(task: Dict, running_per_agent: Dict[str, int],
+                 held_resources: Dict[str, str], held_footprints: List[Tuple[str, str]]) -> None:
+        """Registra el slot, los recursos y el footprint que ocupa un task."""
+        agent = task.get('agent_assigned', 'general')
+        running_per_agent[agent] = running_per_agent.get(agent, 0) + 1
+        for resource in task.get('exclusive_resources', []):
+            held_resources.setdefault(resource, task['id'])
+        for pattern in task.get('file_footprint', []):
+            held_footprints.append((pattern, task['id']))
+
+    @staticmethod
+    def _priority_key(task: Dict) -> Tuple:
+        """Clave de ordenación por prioridad (menor número = mayor prioridad)."""
+        return (task.get('priority', 5), task.get('estimated_complexity', 'medium'))
+
+    @instrumented()
     def get_parallel_groups(self) -> List[Dict]:
         """
         Obtiene los grupos de tasks que pueden ejecutarse en paralelo.
@@ -78,6 +264,7 @@ class TaskCoordinator:
         feature_list = self.load_feature_list()
         return feature_list.get('parallel_execution', {}).get('groups', [])
 
+    @instrumented()
     def get_next_task_for_agent(self, agent_type: str) -> Optional[Dict]:
         """
         Obtiene el siguiente task más prioritario para un agente específico.
@@ -98,10 +285,11 @@ class TaskCoordinator:
             return None
 
         # Ordenar por prioridad (menor número = mayor prioridad)
-        agent_tasks.sort(key=lambda t: (t.get('priority', 5), t.get('estimated_complexity', 'medium')))
+        agent_tasks.sort(key=self._priority_key)
 
         return agent_tasks[0]
 
+    @instrumented()
     def get_next_available_task(self) -> Optional[Dict]:
         """
         Obtiene el siguiente task disponible de mayor prioridad (cualquier agente).
@@ -115,10 +303,11 @@ class TaskCoordinator:
             return None
 
         # Ordenar por prioridad
-        available_tasks.sort(key=lambda t: (t.get('priority', 5), t.get('estimated_complexity', 'medium')))
+        available_tasks.sort(key=self._priority_key)
 
         return available_tasks[0]
 
+    @instrumented(flush=True)
     def mark_task_in_progress(self, task_id: str) -> bool:
         """
         Marca un task como en progreso.
@@ -129,18 +318,23 @@ class TaskCoordinator:
         Returns:
             True si se marcó exitosamente
         """
-        feature_list = self.load_feature_list()
-        tasks = feature_list.get('features', [])
+        start = time.perf_counter()
 
-        for task in tasks:
-            if task.get('id') == task_id:
-                task['status'] = 'in_progress'
-                task['started_at'] = datetime.now().isoformat()
-                self.save_feature_list(feature_list)
-                return True
+        def claim(task: Dict) -> None:
+            task['status'] = 'in_progress'
+            task['started_at'] = datetime.now().isoformat()
 
-        return False
+        task = self.store.update_task(task_id, claim)
+        if task is None:
+            return False
 
+        labels = {'agent': task.get('agent_assigned', 'general')}
+        self.metrics.inc('harness_coordinator_tasks_claimed_total', labels)
+        self.metrics.observe('harness_coordinator_claim_duration_seconds',
+                             time.perf_counter() - start, labels)
+        return True
+
+    @instrumented(flush=True)
     def mark_task_completed(self, task_id: str, implementation_notes: Optional[str] = None) -> bool:
         """
         Marca un task como completado.
@@ -152,21 +346,22 @@ class TaskCoordinator:
         Returns:
             True si se marcó exitosamente
         """
-        feature_list = self.load_feature_list()
-        tasks = feature_list.get('features', [])
-
-        for task in tasks:
-            if task.get('id') == task_id:
-                task['passes'] = True
-                task['status'] = 'completed'
-                task['implemented_at'] = datetime.now().isoformat()
-                if implementation_notes:
-                    task['implementation_notes'] = implementation_notes
-                self.save_feature_list(feature_list)
-                return True
-
-        return False
-
+        def complete(task: Dict) -> None:
+            task['passes'] = True
+            task['status'] = 'completed'
+            task['implemented_at'] = datetime.now().isoformat()
+            if implementation_notes:
+                task['implementation_notes'] = implementation_notes
+
+        task = self.store.update_task(task_id, complete)
+        if task is None:
+            return False
+
+        self.metrics.inc('harness_coordinator_tasks_completed_total',
+                         {'agent': task.get('agent_assigned', 'general')})
+        return True
+
+    @instrumented(flush=True)
     def mark_task_failed(self, task_id: str, error_message: str) -> bool:
         """
         Marca un task como fallido.
@@ -178,19 +373,20 @@ class TaskCoordinator:
         Returns:
             True si se marcó exitosamente
         """
-        feature_list = self.load_feature_list()
-        tasks = feature_list.get('features', [])
+        def fail(task: Dict) -> None:
+            task['status'] = 'failed'
+            task['error_message'] = error_message
+            task['failed_at'] = datetime.now().isoformat()
 
-        for task in tasks:
-            if task.get('id') == task_id:
-                task['status'] = 'failed'
-                task['error_message'] = error_message
-                task['failed_at'] = datetime.now().isoformat()
-                self.save_feature_list(feature_list)
-                return True
+        task = self.store.update_task(task_id, fail)
+        if task is None:
+            return False
 
-        return False
+        self.metrics.inc('harness_coordinator_tasks_failed_total',
+                         {'agent': task.get('agent_assigned', 'general')})
+        return True
 
+    @instrumented()
     def get_project_progress(self) -> Dict:
         """
         Obtiene el progreso general del proyecto.
@@ -240,14 +436,18 @@ class TaskCoordinator:
             'project_ready': progress_percentage >= 80  # 80% completion threshold
         }
 
+    @instrumented()
     def can_execute_parallel_tasks(self) -> bool:
         """
         Verifica si hay tasks que pueden ejecutarse en paralelo.
 
         Returns:
-            True si hay múltiples tasks disponibles para diferentes agentes
+            True si hay tasks admitidos para al menos dos agentes diferentes,
+            o varios tasks de un agente cuya capacidad (declarada o por defecto) es mayor que 1 o ilimitada
         """
-        available_tasks = self.get_available_tasks()
+        feature_list = self.load_feature_list()
+        available_tasks, _ = self._compute_schedule(feature_list)
+        scheduling = feature_list.get('scheduling', {})
 
         # Agrupar por agente
         agent_tasks = {}
@@ -258,8 +458,17 @@ class TaskCoordinator:
             agent_tasks[agent].append(task)
 
         # Si hay tasks para al menos 2 agentes diferentes, pueden ejecutarse en paralelo
-        return len([agent for agent, tasks in agent_tasks.items() if len(tasks) > 0]) >= 2
+        if len([agent for agent, tasks in agent_tasks.items() if len(tasks) > 0]) >= 2:
+            return True
+
+        # Un mismo tipo de agente puede escalar si su capacidad lo permite
+        def scales(agent: str) -> bool:
+            limit = self._agent_limit(scheduling, agent)
+            return limit is None or limit > 1
+
+        return any(len(tasks) >= 2 and scales(agent) for agent, tasks in agent_tasks.items())
 
+    @instrumented()
     def get_blocked_tasks(self) -> List[Dict]:
         """
         Obtiene tasks que están bloqueados por dependencias no satisfechas.
@@ -288,6 +497,7 @@ class TaskCoordinator:
 
         return blocked_tasks
 
+    @instrumented()
     def suggest_next_actions(self) -> Dict:
         """
         Sugiere las próximas acciones basadas en el estado actual.
@@ -298,6 +508,7 @@ class TaskCoordinator:
         available_tasks = self.get_available_tasks()
         progress = self.get_project_progress()
         blocked_tasks = self.get_blocked_tasks()
+        deferred_tasks = self.get_deferred_tasks()
 
         suggestions = {
             'can_continue': len(available_tasks) > 0,
@@ -305,12 +516,15 @@ class TaskCoordinator:
             'recommended_action': '',
             'available_tasks': len(available_tasks),
             'blocked_tasks': len(blocked_tasks),
+            'deferred_tasks': len(deferred_tasks),
             'progress_percentage': progress['progress_percentage']
         }
 
         if len(available_tasks) == 0:
             if progress['progress_percentage'] >= 100:
                 suggestions['recommended_action'] = 'project_complete'
+            elif len(deferred_tasks) > 0:
+                suggestions['recommended_action'] = 'wait_for_running_tasks'
             elif len(blocked_tasks) > 0:
                 suggestions['recommended_action'] = 'resolve_dependencies'
             else:
@@ -322,6 +536,38 @@ class TaskCoordinator:
 
         return suggestions
 
+def _static_prefix(pattern: str) -> List[str]:
+    """Segmentos de ruta anteriores al primer segmento con comodines."""
+    prefix = []
+    for part in pattern.strip('/').split('/'):
+        if GLOB_CHARS & set(part):
+            break
+        prefix.append(part)
+    return prefix
+
+def paths_overlap(pattern_a: str, pattern_b: str) -> bool:
+    """
+    Determina de forma conservadora si dos footprints de ficheros se solapan.
+
+    Un directorio solapa con todo lo que contiene, y dos patrones glob se
+    consideran solapados si uno encaja con el otro o si comparten la parte
+    fija de la ruta.
+
+    Args:
+        pattern_a: Ruta o patrón glob (p.ej. "src/db/migrations/**")
+        pattern_b: Ruta o patrón glob
+
+    Returns:
+        True si ambos footprints pueden tocar los mismos ficheros
+    """
+    a, b = pattern_a.strip('/'), pattern_b.strip('/')
+    if a == b or fnmatch(a, b) or fnmatch(b, a):
+        return True
+
+    # Si la parte fija de una ruta contiene a la otra, pueden tocar los mismos ficheros
+    shorter, longer = sorted((_static_prefix(a), _static_prefix(b)), key=len)
+    return longer[:len(shorter)] == shorter
+
 # Funciones utilitarias para uso desde skills
 def get_next_task(agent_type: Optional[str] = None, project_root: str = ".") -> Optional[Dict]:
     """
@@ -337,9 +583,12 @@ def get_next_task(agent_type: Optional[str] = None, project_root: str = ".") ->
     coordinator = TaskCoordinator(project_root)
 
     if agent_type:
-        return coordinator.get_next_task_for_agent(agent_type)
+        task = coordinator.get_next_task_for_agent(agent_type)
     else:
-        return coordinator.get_next_available_task()
+        task = coordinator.get_next_available_task()
+
+    coordinator.flush_metrics()
+    return task
 
 def update_task_status(task_id: str, status: str, notes: Optional[str] = None,
                       project_root: str = ".") -> bool:
@@ -376,6 +625,9 @@ def show_progress(project_root: str = ".") -> None:
     print(f"   🔄 En progreso: {progress['in_progress_tasks']}")
     print(f"   ❌ Fallidas: {progress['failed_tasks']}")
     print(f"   ⏳ Pendientes: {progress['pending_tasks']}")
+    deferred_tasks = coordinator.get_deferred_tasks()
+    if deferred_tasks:
+        print(f"   ⏸️  Esperando recursos: {len(deferred_tasks)}")
     print()
 
     if progress['categories']:
@@ -391,6 +643,24 @@ def show_progress(project_root: str = ".") -> None:
             percentage = (stats['completed'] / stats['total'] * 100) if stats['total'] > 0 else 0
             print(f"   {agent}: {stats['completed']}/{stats['total']} ({percentage:.0f}%)")
 
+    coordinator.flush_metrics()
+
+def dump_metrics(metrics_path: Optional[str] = None, project_root: str = ".") -> None:
+    """
+    Imprime las métricas del coordinador en formato Prometheus.
+
+    Refresca los gauges de cola con el estado actual del feature_list.json y,
+    si hay un textfile configurado, lo reescribe de forma atómica.
+
+    Args:
+        metrics_path: Ruta del fichero .prom (por defecto $HARNESS_METRICS_PATH)
+        project_root: Directorio raíz del proyecto
+    """
+    coordinator = TaskCoordinator(project_root, metrics_path)
+    coordinator.get_available_tasks()
+    print(coordinator.metrics.render(), end="")
+    coordinator.flush_metrics()
+
 if __name__ == "__main__":
     # CLI interface para testing
     if len(sys.argv) > 1:
@@ -407,6 +677,19 @@ if __name__ == "__main__":
         elif command == "progress":
             show_progress()
 
+        elif command == "metrics":
+            dump_metrics(sys.argv[2] if len(sys.argv) > 2 else None)
+
+        elif command == "shard":
+            shard_key = sys.argv[2] if len(sys.argv) > 2 else 'category'
+            manifest = TaskCoordinator().shard_feature_list(shard_key)
+            print(f"✅ {len(manifest['shards'])} shards written to .claude/features/ "
+                  f"({len(manifest['cross_shard_dependencies'])} tasks with cross-shard dependencies)")
+
+        elif command == "watch":
+            from progress_watch import watch_progress
+            watch_progress(poll_interval=float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
+
         elif command == "update":
             if len(sys.argv) < 4:
                 print("Usage: task-coordinator.py update TASK_ID STATUS [NOTES]")
@@ -418,6 +701,6 @@ if __name__ == "__main__":
             print(f"Task {task_id} -> {status}: {'✅' if success else '❌'}")
 
         else:
-            print("Available commands: next, progress, update")
+            print("Available commands: next, progress, update, metrics, watch, shard")
     else:
         show_progress()
\ No newline at end of file
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+YAML Cache para el Context Injector
+
+Carga de YAML con el loader C de libyaml cuando PyYAML se compiló con él
+(fallback transparente al loader puro Python) y caché persistente de
+documentos ya parseados en `.harness/.cache/yaml/`.
+Cada entrada se guarda con marshal (binario, rápido de cargar) y se valida
+por ruta, mtime_ns y tamaño; si el stat no coincide se compara el hash del
+contenido antes de volver a parsear, así un `touch` o un checkout que no
+cambia el fichero no invalida la entrada.
+
+No se usa pickle: la caché vive en el proyecto y un fichero commiteado,
+compartido o plantado ejecutaría código al deserializarse. marshal solo
+reconstruye contenedores y escalares; las fechas de YAML se guardan como
+tuplas etiquetadas (SafeLoader nunca produce tuplas).
+"""
+
+import os
+import marshal
+import hashlib
+import datetime
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import yaml
+
+# libyaml es entre 5x y 10x más rápido; SafeLoader puro Python como fallback
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+    YAML_LOADER_NAME = 'CSafeLoader'
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+    YAML_LOADER_NAME = 'SafeLoader'
+
+try:
+    from .file_io import atomic_write_bytes
+except ImportError:
+    # Fallback para cuando se ejecute directamente
+    from file_io import atomic_write_bytes
+
+# Subir la versión invalida todas las entradas existentes (cambio de formato)
+CACHE_FORMAT_VERSION = 2
+
+# marshal.load de un fichero truncado o manipulado
+_MARSHAL_ERRORS = (OSError, EOFError, ValueError, TypeError)
+
+# Tipos de SafeLoader que marshal no admite: se guardan como (etiqueta, isoformat)
+_DATETIME_TAG = '$datetime'
+_DATE_TAG = '$date'
+
+
+def parse_yaml(content, loader=None) -> Any:
+    """
+    Parsea YAML de forma segura con el loader más rápido disponible.
+
+    Args:
+        content: Texto, bytes o stream con el documento
+        loader: Clase Loader explícita (por defecto CSafeLoader si existe)
+
+    Returns:
+        Estructura parseada
+    """
+    return yaml.load(content, Loader=loader or YamlSafeLoader)
+
+
+def to_marshal(value: Any) -> Any:
+    """
+    Copia de `value` que marshal puede guardar: contenedores exactos (sin
+    subclases como FrozenDict) y las fechas como tuplas etiquetadas.
+    """
+    if isinstance(value, dict):
+        return {to_marshal(key): to_marshal(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [to_marshal(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(to_marshal(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return (frozenset if isinstance(value, frozenset) else set)(to_marshal(item) for item in value)
+    # datetime es subclase de date: comprobarlo primero
+    if isinstance(value, datetime.datetime):
+        return (_DATETIME_TAG, value.isoformat())
+    if isinstance(value, datetime.date):
+        return (_DATE_TAG, value.isoformat())
+    return value
+
+
+def from_marshal(value: Any) -> Any:
+    """Inversa de `to_marshal`: restaura las fechas etiquetadas."""
+    if isinstance(value, dict):
+        return {from_marshal(key): from_marshal(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [from_marshal(item) for item in value]
+    if isinstance(value, tuple):
+        if len(value) == 2 and value[0] == _DATETIME_TAG:
+            return datetime.datetime.fromisoformat(value[1])
+        if len(value) == 2 and value[0] == _DATE_TAG:
+            return datetime.date.fromisoformat(value[1])
+        return tuple(from_marshal(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value)(from_marshal(item) for item in value)
+    return value
+
+
+def has_dates(value: Any) -> bool:
+    """Si la estructura contiene fechas (solo entonces hace falta `from_marshal` al leer)."""
+    if isinstance(value, dict):
+        return any(has_dates(key) or has_dates(child) for key, child in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return any(has_dates(item) for item in value)
+    return isinstance(value, datetime.date)
+
+
+class YamlDocumentCache:
+    """
+    Caché en disco de YAML parseados.
+
+    El fichero de cada entrada contiene dos objetos marshal consecutivos: una cabecera
+    pequeña (ruta, stat y hash) y los datos, de modo que validar una entrada
+    obsoleta no exige deserializar el documento completo.
+    """
+
+    def __init__(self, cache_dir: Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.stats = {'hits': 0, 'rehashed_hits': 0, 'misses': 0, 'write_errors': 0}
+        # load() se llama desde varios threads del context injector
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def load(self, file_path: Path, parse: Callable[[bytes], Any]) -> Any:
+        """
+        Devuelve el documento parseado de `file_path`, usando la caché si es válida.
+
+        Args:
+            file_path: Fichero YAML a cargar
+            parse: Función que parsea el contenido en bruto
+
+        Returns:
+            Estructura parseada del YAML
+        """
+        if not self.enabled:
+            return parse(Path(file_path).read_bytes())
+
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        entry_path = self._entry_path(file_path)
+        header = self._read_header(entry_path)
+
+        if header and header['mtime_ns'] == stat.st_mtime_ns and header['size'] == stat.st_size:
+            data = self._read_data(entry_path)
+            if data is not None:
+                self._count('hits')
+                return data[0]
+
+        raw = file_path.read_bytes()
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        if header and header['sha256'] == content_hash:
+            data = self._read_data(entry_path)
+            if data is not None:
+                # Mismo contenido con otro stat: solo refrescar la cabecera
+                self._count('rehashed_hits')
+                self._write(entry_path, file_path, stat, content_hash, data[0])
+                return data[0]
+
+        self._count('misses')
+        document = parse(raw)
+        self._write(entry_path, file_path, stat, content_hash, document)
+        return document
+
+    def _entry_path(self, file_path: Path) -> Path:
+        key = hashlib.sha1(str(file_path).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.marshal"
+
+    def _read_header(self, entry_path: Path) -> Optional[Dict]:
+        try:
+            with open(entry_path, 'rb') as f:
+                header = marshal.load(f)
+        except _MARSHAL_ERRORS:
+            return None
+        if not isinstance(header, dict) or header.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        return header
+
+    def _read_data(self, entry_path: Path) -> Optional[tuple]:
+        try:
+            with open(entry_path, 'rb') as f:
+                header = marshal.load(f)
+                data = marshal.load(f)
+        except _MARSHAL_ERRORS:
+            return None
+        # Solo los documentos con fechas pagan el recorrido de decodificación
+        return (from_marshal(data) if header.get('dates') else data,)
+
+    def _write(self, entry_path: Path, file_path: Path, stat: os.stat_result,
+               content_hash: str, document: Any) -> None:
+        header = {
+            'version': CACHE_FORMAT_VERSION,
+            'path': str(file_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': content_hash,
+            'dates': has_dates(document)
+        }
+        try:
+            data = to_marshal(document) if header['dates'] else document
+            atomic_write_bytes(str(entry_path), marshal.dumps(header) + marshal.dumps(data))
+        except (OSError, ValueError):
+            # ValueError: un tipo que marshal no admite (no lo produce SafeLoader)
+            # La caché es una optimización: un directorio de solo lectura no debe romper la inyección
+            self._count('write_errors')